@@ -0,0 +1,65 @@
+"""Coverage-check time on a synthetic town.
+
+The generated town's ranges are contiguous; ``--defects`` of the range
+boundaries are moved to leave a seeded overlap or gap.
+
+    python benchmarks/bench_coverage.py --routes 100000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+
+from synthetic import database, town
+
+from town_collection_cal.common.db_model import Database
+from town_collection_cal.updater.coverage import analyze_coverage
+
+
+def _synthetic_db(route_count: int, defects: float, seed: int) -> Database:
+    routes, _ = town(route_count, seed)
+    rng = random.Random(seed)
+    for route in routes:
+        for constraint in route.constraints:
+            low = constraint.range_min
+            # Only boundaries between ranges: a street's first range starts at 1 or 2.
+            if low is not None and low > 2 and rng.random() < defects:
+                constraint.range_min = max(1, low + rng.choice([-10, 12]))
+    return database(routes)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routes", type=int, default=100_000)
+    parser.add_argument("--defects", type=float, default=0.02, help="Share of bad split points")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    db = _synthetic_db(args.routes, args.defects, args.seed)
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        report = analyze_coverage(db)
+        best = min(best, time.perf_counter() - start)
+    print(
+        json.dumps(
+            {
+                "routes": report.routes_checked,
+                "streets": report.streets_checked,
+                "seconds": round(best, 3),
+                "routes_per_second": round(report.routes_checked / best),
+                "overlaps": len(report.overlaps),
+                "gaps": len(report.gaps),
+                "unreachable": len(report.unreachable),
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
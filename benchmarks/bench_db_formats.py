@@ -0,0 +1,72 @@
+"""On-disk size and load time of a DB per output format.
+
+    python benchmarks/bench_db_formats.py --routes 50000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from synthetic import database, town
+
+from town_collection_cal.common.db_file import load_db, write_db_file
+from town_collection_cal.common.db_model import Database
+from town_collection_cal.common.snapshot import write_snapshot
+
+FORMATS = [".json", ".json.gz", ".json.zst", ".snap"]
+
+
+def _write(db: Database, path: Path) -> None:
+    if path.suffix == ".snap":
+        write_snapshot(db, path)
+    else:
+        write_db_file(db, path)
+
+
+def _best_of(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 1)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routes", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    db = database(town(args.routes, args.seed)[0])
+    results: dict[str, dict[str, float | int | str]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for suffix in FORMATS:
+            path = Path(tmp) / f"db{suffix}"
+            try:
+                write_ms = _best_of(lambda path=path: _write(db, path), 1)
+            except RuntimeError as exc:  # zstandard not installed
+                results[suffix] = {"skipped": str(exc)}
+                continue
+            results[suffix] = {
+                "bytes": path.stat().st_size,
+                "write_ms": write_ms,
+                "load_ms": _best_of(lambda path=path: load_db(path), args.repeat),
+            }
+        # The pre-compression loader: decode to str, json.loads, then validate.
+        plain = Path(tmp) / "db.json"
+        results[".json"]["legacy_load_ms"] = _best_of(
+            lambda: Database.model_validate(json.loads(plain.read_text(encoding="utf-8"))),
+            args.repeat,
+        )
+    print(json.dumps({"routes": args.routes, "formats": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
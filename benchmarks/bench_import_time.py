@@ -0,0 +1,60 @@
+"""Import-time cost of the service entry point (``python -X importtime``).
+
+Reports the cumulative import time of a module and its slowest dependencies,
+taking the median over several fresh interpreters. With ``--max-ms`` it exits
+non-zero when the median exceeds the budget, so it can gate CI.
+
+    python benchmarks/bench_import_time.py --max-ms 800
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+
+def _import_times(module: str) -> dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = line.split("|")
+        times[name.strip()] = int(cumulative_us)
+    return times
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="town_collection_cal.service.app")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    runs = [_import_times(args.module) for _ in range(args.runs)]
+    total_ms = statistics.median(run[args.module] for run in runs) / 1000
+    slowest = sorted(runs[-1].items(), key=lambda item: item[1], reverse=True)
+    report = {
+        "module": args.module,
+        "median_ms": round(total_ms, 1),
+        "top_cumulative_ms": {
+            name: round(us / 1000, 1) for name, us in slowest[: args.top] if name != args.module
+        },
+    }
+    print(json.dumps(report, indent=2))
+    if args.max_ms is not None and total_ms > args.max_ms:
+        print(f"import time {total_ms:.1f}ms exceeds budget {args.max_ms}ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
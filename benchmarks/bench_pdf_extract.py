@@ -0,0 +1,56 @@
+"""PDF text extraction time by worker count on a synthetic route book.
+
+    python benchmarks/bench_pdf_extract.py --pages 300 --workers 1 2 4
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import book_lines
+
+from town_collection_cal.common import pdf_text
+from town_collection_cal.common.pdf_writer import lines_per_page, paginate, write_pdf
+
+
+def _synthetic_pages(page_count: int, seed: int) -> list[list[str]]:
+    return paginate(book_lines(page_count * lines_per_page(), seed))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "routes.pdf"
+        write_pdf(source, _synthetic_pages(args.pages, args.seed))
+
+        seconds: dict[str, float] = {}
+        reference: list[str] | None = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            pages = list(pdf_text._iter_pages_uncached(source, workers))
+            seconds[str(workers)] = round(time.perf_counter() - start, 3)
+            if reference is None:
+                reference = pages
+            elif pages != reference:
+                raise SystemExit(f"workers={workers} produced different text")
+
+    baseline = seconds[str(args.workers[0])]
+    results = {
+        "pages": args.pages,
+        "seconds": seconds,
+        "speedup": {key: round(baseline / value, 2) for key, value in seconds.items()},
+    }
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,67 @@
+"""Route-override application time at town scale.
+
+    python benchmarks/bench_route_overrides.py --routes 50000 --overrides 500
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+from synthetic import WEEKDAYS, town
+
+from town_collection_cal.updater.overrides import apply_route_overrides
+
+
+def _overrides(streets: list[str], override_count: int, seed: int) -> dict[str, list[dict]]:
+    rng = random.Random(seed)
+    third = override_count // 3
+    return {
+        "delete": [{"street": rng.choice(streets), "parity": "odd"} for _ in range(third)],
+        "patch": [{"street": rng.choice(streets), "no_collection": False} for _ in range(third)],
+        "add": [
+            {"street": f"Added {idx} Way", "weekday": rng.choice(WEEKDAYS)}
+            for idx in range(override_count - 2 * third)
+        ],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routes", type=int, default=50_000)
+    parser.add_argument("--overrides", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    routes, streets = town(args.routes, args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "route_overrides.yaml"
+        path.write_text(
+            yaml.safe_dump(_overrides(streets, args.overrides, args.seed)), encoding="utf-8"
+        )
+        start = time.perf_counter()
+        result = apply_route_overrides(routes, path)
+        seconds = time.perf_counter() - start
+
+    print(
+        json.dumps(
+            {
+                "routes": args.routes,
+                "overrides": args.overrides,
+                "routes_after": len(result),
+                "seconds": round(seconds, 4),
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
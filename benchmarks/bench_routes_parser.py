@@ -0,0 +1,42 @@
+"""Routes line-parser throughput on a synthetic route book.
+
+    python benchmarks/bench_routes_parser.py --lines 100000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from synthetic import book_lines
+
+from town_collection_cal.updater.parsers.westford_routes import iter_routes
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    lines = book_lines(args.lines, args.seed)
+    best = float("inf")
+    route_count = 0
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        route_count = sum(1 for _ in iter_routes(lines))
+        best = min(best, time.perf_counter() - start)
+
+    results = {
+        "lines": args.lines,
+        "routes": route_count,
+        "best_seconds": round(best, 3),
+        "lines_per_second": round(args.lines / best),
+    }
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
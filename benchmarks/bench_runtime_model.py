@@ -0,0 +1,109 @@
+"""Memory per route and resolve latency: pydantic routes vs the runtime model.
+
+    python benchmarks/bench_runtime_model.py --routes 50000
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from synthetic import database, misspell, town
+
+from town_collection_cal.common.db_model import Database, RouteEntry
+from town_collection_cal.common.normalize import normalize_street_name
+from town_collection_cal.common.runtime import RuntimeDb
+from town_collection_cal.service.resolver import (
+    _collect_suggestions,
+    _matches_constraints,
+    resolve_route,
+)
+
+
+def _synthetic_json(route_count: int, seed: int) -> tuple[str, list[str]]:
+    routes, streets = town(route_count, seed)
+    return database(routes).model_dump_json(), streets
+
+
+def _measure(build: Callable[[], Any]) -> tuple[Any, int]:
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+def _pydantic_resolve(db: Database, street: str, number: int) -> RouteEntry | None:
+    """The pre-runtime resolver path, kept here as the comparison baseline."""
+    normalized = normalize_street_name(street)
+    canonical = db.aliases.get(normalized, normalized)
+    if db.street_index and canonical in db.street_index:
+        candidates = [db.routes[idx] for idx in db.street_index[canonical]]
+    else:
+        candidates = []
+    if not candidates:
+        _collect_suggestions(street, sorted({r.street for r in db.routes}), 10, 85)
+        return None
+    matches = [r for r in candidates if _matches_constraints(r, number)]  # type: ignore[arg-type]
+    return matches[0] if matches else None
+
+
+def _time_per_call(func: Callable[[], Any], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return round((time.perf_counter() - start) / repeat * 1e6, 2)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routes", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=2_000)
+    args = parser.parse_args()
+
+    payload, streets = _synthetic_json(args.routes, args.seed)
+    # The runtime model interns strings it takes from the pydantic DB; measure
+    # it with that DB built and freed inside the measurement, so the strings
+    # it keeps are counted. Its own strings are not shared with the later DB.
+    runtime, runtime_bytes = _measure(
+        lambda: RuntimeDb.from_database(Database.model_validate_json(payload))
+    )
+    db, pydantic_bytes = _measure(lambda: Database.model_validate_json(payload))
+
+    hit = streets[len(streets) // 2]
+    miss = misspell(random.Random(args.seed), hit)
+    results = {
+        "routes": args.routes,
+        "bytes_per_route": {
+            "pydantic": round(pydantic_bytes / args.routes, 1),
+            "runtime": round(runtime_bytes / args.routes, 1),
+        },
+        "resolve_hit_us": {
+            "pydantic": _time_per_call(lambda: _pydantic_resolve(db, hit, 3), args.repeat),
+            "runtime": _time_per_call(
+                lambda: resolve_route(runtime, hit, 3, suggestion_limit=10, fuzzy_threshold=85),
+                args.repeat,
+            ),
+        },
+        "resolve_miss_us": {
+            "pydantic": _time_per_call(lambda: _pydantic_resolve(db, miss, 3), 20),
+            "runtime": _time_per_call(
+                lambda: resolve_route(runtime, miss, 3, suggestion_limit=10, fuzzy_threshold=85),
+                20,
+            ),
+        },
+    }
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
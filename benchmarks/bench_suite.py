@@ -0,0 +1,381 @@
+"""Microbenchmarks of the hot paths on fixed-seed synthetic data.
+
+Each case times a batch of calls, calibrating the loop count until a sample
+takes ``--min-time``, and reports the per-call min and median over
+``--repeat`` samples. ``--compare`` checks the medians against a results file
+saved earlier with ``--out`` on the same machine. It exits 1 when a case is
+slower than the baseline by more than ``--threshold``.
+
+    python benchmarks/bench_suite.py --out baseline.json
+    python benchmarks/bench_suite.py --compare baseline.json --threshold 0.2
+    python benchmarks/bench_suite.py --only 'resolve_route.*' --repeat 9
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import fnmatch
+import gc
+import importlib.util
+import json
+import logging
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import UTC, date, datetime
+from pathlib import Path
+from typing import Any
+
+import yaml
+from synthetic import WEEKDAYS, book_lines, database, misspell, street_names, town
+
+from town_collection_cal.common.address import parse_address
+from town_collection_cal.common.db_file import load_db, write_db_file
+from town_collection_cal.common.db_model import Database, RouteConstraint, RouteEntry
+from town_collection_cal.common.holidays import compile_holiday_policy
+from town_collection_cal.common.ics import IcsEvent, build_ics
+from town_collection_cal.common.normalize import normalize_street_name
+from town_collection_cal.common.runtime import RuntimeDb
+from town_collection_cal.common.snapshot import write_snapshot
+from town_collection_cal.service.resolver import resolve_route
+from town_collection_cal.service.schedule import generate_schedule
+from town_collection_cal.updater.overrides import apply_route_overrides
+from town_collection_cal.updater.parsers.westford_routes import parse_routes
+
+# Bumped when case inputs change; older baselines then time different work.
+RESULTS_VERSION = 2
+TOWN_ROUTES = 20_000
+
+# name -> builder(seed) returning (operation, calls per operation)
+Case = Callable[[int], tuple[Callable[[], object], int]]
+CASES: dict[str, Case] = {}
+_cleanup = contextlib.ExitStack()
+
+
+def case(name: str) -> Callable[[Case], Case]:
+    def register(builder: Case) -> Case:
+        CASES[name] = builder
+        return builder
+
+    return register
+
+
+def _route(street: str, weekday: str, color: str, **constraint: Any) -> RouteEntry:
+    return RouteEntry(
+        street=street,
+        street_normalized=normalize_street_name(street),
+        weekday=weekday,
+        recycling_color=color,
+        constraints=[RouteConstraint(**constraint)] if constraint else [],
+    )
+
+
+def _town(seed: int, route_count: int = TOWN_ROUTES) -> tuple[Database, list[str]]:
+    """A generated town's DB and street names."""
+    routes, streets = town(route_count, seed)
+    return database(routes), streets
+
+
+def _tmp_dir() -> Path:
+    return Path(_cleanup.enter_context(tempfile.TemporaryDirectory()))
+
+
+@case("normalize_street_name")
+def _normalize(seed: int) -> tuple[Callable[[], object], int]:
+    rng = random.Random(seed)
+    raws = [name + rng.choice(["", ",", " #2"]) for name in street_names(1000, seed)]
+    return lambda: [normalize_street_name(raw) for raw in raws], len(raws)
+
+
+@case("parse_address")
+def _parse_address(seed: int) -> tuple[Callable[[], object], int]:
+    rng = random.Random(seed)
+    raws = [
+        f"{rng.randint(1, 999)} {name}, Westford, MA 01886" for name in street_names(500, seed)
+    ]
+    return lambda: [parse_address(raw) for raw in raws], len(raws)
+
+
+@case("resolve_route.hit")
+def _resolve_hit(seed: int) -> tuple[Callable[[], object], int]:
+    db, streets = _town(seed)
+    runtime = RuntimeDb.from_database(db)
+    rng = random.Random(seed)
+    queries = [(rng.choice(streets), rng.randint(1, 300)) for _ in range(1000)]
+    return (
+        lambda: [
+            resolve_route(runtime, street, number, suggestion_limit=5, fuzzy_threshold=80)
+            for street, number in queries
+        ],
+        len(queries),
+    )
+
+
+@case("resolve_route.miss_fuzzy")
+def _resolve_miss(seed: int) -> tuple[Callable[[], object], int]:
+    db, streets = _town(seed)
+    runtime = RuntimeDb.from_database(db)
+    runtime.street_names()
+    rng = random.Random(seed)
+    queries = [misspell(rng, rng.choice(streets)) for _ in range(20)]
+    return (
+        lambda: [
+            resolve_route(runtime, street, 10, suggestion_limit=5, fuzzy_threshold=80)
+            for street in queries
+        ],
+        len(queries),
+    )
+
+
+@case("resolve_route.constraint_heavy")
+def _resolve_constraints(seed: int) -> tuple[Callable[[], object], int]:
+    rng = random.Random(seed)
+    routes: list[RouteEntry] = []
+    streets = street_names(200, seed)
+    for street in streets:
+        # 40 consecutive ranges per side; a lookup scans a long candidate list.
+        for parity, first in (("odd", 1), ("even", 2)):
+            for block in range(40):
+                low = first + block * 50
+                routes.append(
+                    _route(
+                        street,
+                        rng.choice(WEEKDAYS),
+                        "BLUE",
+                        parity=parity,
+                        range_min=low,
+                        range_max=low + 48,
+                    )
+                )
+    runtime = RuntimeDb.from_database(database(routes))
+    queries = [(rng.choice(streets), rng.randint(1, 2000)) for _ in range(1000)]
+    return (
+        lambda: [
+            resolve_route(runtime, street, number, suggestion_limit=5, fuzzy_threshold=80)
+            for street, number in queries
+        ],
+        len(queries),
+    )
+
+
+def _year_schedule(db: Database, weekday: str) -> list[Any]:
+    return generate_schedule(
+        start_date=date(2025, 1, 1),
+        days=365,
+        trash_weekday=weekday,
+        recycling_color="BLUE",
+        calendar_policy=db.calendar_policy,
+        holiday_policy=compile_holiday_policy(db.holiday_policy),
+    )
+
+
+@case("generate_schedule")
+def _schedule(seed: int) -> tuple[Callable[[], object], int]:
+    db = database([])
+    holidays = compile_holiday_policy(db.holiday_policy)
+    weekdays = [random.Random(seed).choice(WEEKDAYS) for _ in range(20)]
+    return (
+        lambda: [
+            generate_schedule(
+                start_date=date(2025, 1, 1),
+                days=365,
+                trash_weekday=weekday,
+                recycling_color="BLUE",
+                calendar_policy=db.calendar_policy,
+                holiday_policy=holidays,
+            )
+            for weekday in weekdays
+        ],
+        len(weekdays),
+    )
+
+
+@case("build_ics")
+def _ics(seed: int) -> tuple[Callable[[], object], int]:
+    db = database([])
+    events = [
+        IcsEvent(
+            date=event.date,
+            summary="Bench Trash",
+            uid_seed=f"bench|{'+'.join(sorted(event.types))}|{event.date.isoformat()}",
+        )
+        for event in _year_schedule(db, random.Random(seed).choice(WEEKDAYS))
+    ]
+    return lambda: build_ics("Bench", events, "-//bench//EN"), 1
+
+
+def _load_case(suffix: str) -> Case:
+    def build(seed: int) -> tuple[Callable[[], object], int]:
+        db, _ = _town(seed)
+        path = _tmp_dir() / f"db{suffix}"
+        if suffix == ".snap":
+            write_snapshot(db, path)
+        else:
+            write_db_file(db, path)
+        return lambda: load_db(path), 1
+
+    return build
+
+
+for _suffix in (".json", ".json.gz", ".snap"):
+    case(f"load_db{_suffix}")(_load_case(_suffix))
+
+
+@case("parse_routes")
+def _parse_routes(seed: int) -> tuple[Callable[[], object], int]:
+    lines = book_lines(3000, seed)
+    path = _tmp_dir() / "routes.txt"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return lambda: parse_routes(path, "bench://routes"), 1
+
+
+@case("apply_route_overrides")
+def _overrides(seed: int) -> tuple[Callable[[], object], int]:
+    db, streets = _town(seed)
+    rng = random.Random(seed)
+    overrides = {
+        "delete": [{"street": rng.choice(streets), "parity": "odd"} for _ in range(100)],
+        "patch": [{"street": rng.choice(streets), "weekday": "Monday"} for _ in range(100)],
+        "add": [{"street": f"Added {idx} Way", "weekday": "Friday"} for idx in range(100)],
+    }
+    path = _tmp_dir() / "route_overrides.yaml"
+    path.write_text(yaml.safe_dump(overrides), encoding="utf-8")
+    routes = db.routes
+    return lambda: apply_route_overrides(routes, path), 1
+
+
+def _sample(operation: Callable[[], object], loops: int) -> float:
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(loops):
+            operation()
+        return time.perf_counter() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def run_case(name: str, seed: int, repeat: int, min_time: float) -> dict[str, Any]:
+    operation, batch = CASES[name](seed)
+    operation()  # warm caches and lazy imports
+    loops = 1
+    while (elapsed := _sample(operation, loops)) < min_time:
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9) * 1.2))
+    samples = [_sample(operation, loops) / (loops * batch) for _ in range(repeat)]
+    return {
+        "calls": loops * batch,
+        "min_us": round(min(samples) * 1e6, 3),
+        "median_us": round(statistics.median(samples) * 1e6, 3),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(names: list[str], seed: int, repeat: int, min_time: float) -> dict[str, Any]:
+    results = {}
+    for name in names:
+        results[name] = run_case(name, seed, repeat, min_time)
+        print(f"{name:<32} {results[name]['median_us']:>12.3f} us/call", file=sys.stderr)
+    return {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "created_at": datetime.now(UTC).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "seed": seed,
+            "repeat": repeat,
+            # parse_address falls back to a naive split without it.
+            "usaddress": importlib.util.find_spec("usaddress") is not None,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold: float) -> dict[str, Any]:
+    """Median ratio (current / baseline) per case present in both runs."""
+    cases = {}
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        ratio = result["median_us"] / base["median_us"]
+        status = "ok"
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improvement"
+        cases[name] = {
+            "baseline_us": base["median_us"],
+            "current_us": result["median_us"],
+            "ratio": round(ratio, 3),
+            "status": status,
+        }
+    if baseline.get("version") != current["version"]:
+        print("warning: baseline is from another suite version; re-record it", file=sys.stderr)
+    for key in ("seed", "usaddress", "python"):
+        if baseline["meta"].get(key) != current["meta"].get(key):
+            print(f"warning: baseline {key} differs from this run", file=sys.stderr)
+    return {"threshold": threshold, "cases": cases}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--repeat", type=int, default=5, help="Samples per case")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per sample")
+    parser.add_argument(
+        "--only", action="append", default=None, help="Case name glob (repeatable)"
+    )
+    parser.add_argument("--list", action="store_true", help="List case names and exit")
+    parser.add_argument("--out", default=None, help="Write results JSON here")
+    parser.add_argument("--compare", default=None, help="Baseline results JSON to compare with")
+    parser.add_argument(
+        "--results", default=None, help="Compare this saved results JSON instead of running"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="Allowed slowdown, as a fraction"
+    )
+    args = parser.parse_args()
+
+    if args.list:
+        print("\n".join(CASES))
+        return 0
+    logging.disable(logging.WARNING)
+    if args.results:
+        current = json.loads(Path(args.results).read_text(encoding="utf-8"))
+    else:
+        patterns = args.only or ["*"]
+        names = [n for n in CASES if any(fnmatch.fnmatch(n, p) for p in patterns)]
+        if not names:
+            parser.error(f"No cases match {patterns}")
+        with _cleanup:
+            current = run_suite(names, args.seed, args.repeat, args.min_time)
+        if args.out:
+            Path(args.out).write_text(json.dumps(current, indent=2) + "\n", encoding="utf-8")
+
+    if not args.compare:
+        print(json.dumps(current, indent=2))
+        return 0
+    baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+    report = compare(baseline, current, args.threshold)
+    print(json.dumps(report, indent=2))
+    return 1 if any(c["status"] == "regression" for c in report["cases"].values()) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
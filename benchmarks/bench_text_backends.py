@@ -0,0 +1,87 @@
+"""PDF text-extraction backends: speed and parse-equivalence on generated PDFs.
+
+Renders the Westford fixtures (the routes book repeated to ``--pages``) into
+PDFs, extracts them with every backend (uncached, one process) and checks that
+both parsers produce the same result as with pdfplumber.
+
+    python benchmarks/bench_text_backends.py --pages 200
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from town_collection_cal.common import pdf_text
+from town_collection_cal.common.pdf_writer import lines_per_page, paginate, write_pdf
+from town_collection_cal.updater.parsers.westford_guide import parse_schedule
+from town_collection_cal.updater.parsers.westford_routes import parse_routes
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+
+def _fixture_lines(name: str) -> list[str]:
+    return (FIXTURES / name).read_text(encoding="utf-8").splitlines()
+
+
+def _parsed(routes_pdf: Path, guide_pdf: Path, backend: str) -> dict[str, object]:
+    with pdf_text.use_text_backend(backend):
+        routes = parse_routes(routes_pdf, "bench://routes")
+        schedule = parse_schedule(guide_pdf, "bench://guide")
+    return {
+        "routes": [route.model_dump(mode="json") for route in routes.routes],
+        "calendar_policy": schedule.calendar_policy.model_dump(mode="json"),
+        "holiday_policy": schedule.holiday_policy.model_dump(mode="json"),
+        "errors": routes.errors + schedule.errors,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument(
+        "--backends", nargs="+", default=sorted(pdf_text.TEXT_BACKENDS), help="Backends to run"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    routes_lines = _fixture_lines("westford_routes.txt")
+    copies = max(1, -(-args.pages * lines_per_page() // len(routes_lines)))
+    with tempfile.TemporaryDirectory() as tmp:
+        routes_pdf = Path(tmp) / "routes.pdf"
+        guide_pdf = Path(tmp) / "guide.pdf"
+        write_pdf(routes_pdf, paginate(routes_lines * copies)[: args.pages])
+        write_pdf(guide_pdf, paginate(_fixture_lines("westford_guide.txt")))
+
+        reference = None
+        results: dict[str, dict[str, object]] = {}
+        for backend in args.backends:
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                pages = list(
+                    pdf_text._iter_pages_uncached(
+                        routes_pdf, 1, pdf_text.get_text_backend(backend)
+                    )
+                )
+                best = min(best, time.perf_counter() - start)
+            parsed = _parsed(routes_pdf, guide_pdf, backend)
+            if reference is None:
+                reference = parsed
+            results[backend] = {
+                "seconds": round(best, 3),
+                "pages_per_second": round(len(pages) / best, 1),
+                "parse_equivalent": parsed == reference,
+            }
+
+    baseline = results[args.backends[0]]["seconds"]
+    for result in results.values():
+        result["speedup"] = round(baseline / result["seconds"], 2)  # type: ignore[operator]
+    print(json.dumps({"pages": args.pages, "reference": args.backends[0], **results}, indent=2))
+    return 0 if all(result["parse_equivalent"] for result in results.values()) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,84 @@
+"""Per-worker memory for JSON-loaded vs memory-mapped DBs.
+
+Forks N workers (like gunicorn) that each load the same DB and resolve a few
+streets, then reports the private and proportional memory each worker added.
+Linux only (reads /proc/self/smaps_rollup).
+
+    python benchmarks/bench_worker_rss.py --routes 50000 --workers 1,2,4,8
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import tempfile
+from pathlib import Path
+
+from synthetic import database, town
+
+from town_collection_cal.common.snapshot import write_snapshot
+from town_collection_cal.service.db import DbLoader
+from town_collection_cal.service.resolver import resolve_route
+
+
+def _memory_kb() -> dict[str, int]:
+    values: dict[str, int] = {}
+    for line in Path("/proc/self/smaps_rollup").read_text().splitlines()[1:]:
+        key, _, rest = line.partition(":")
+        values[key] = int(rest.split()[0])
+    return {
+        "pss": values["Pss"],
+        "private": values["Private_Clean"] + values["Private_Dirty"],
+    }
+
+
+def _worker(path: str, queries: list[str], out: mp.Queue) -> None:
+    before = _memory_kb()
+    db = DbLoader(Path(path), reload_interval_seconds=10).get_db()
+    for street in queries:
+        resolve_route(db, street, 1, suggestion_limit=10, fuzzy_threshold=85)
+    after = _memory_kb()
+    out.put({key: after[key] - before[key] for key in after})
+
+
+def _run(path: Path, workers: int, queries: list[str]) -> dict[str, float]:
+    ctx = mp.get_context("fork")
+    out: mp.Queue = ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(str(path), queries, out)) for _ in range(workers)]
+    for proc in procs:
+        proc.start()
+    results = [out.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+    return {
+        "per_worker_private_kb": sum(r["private"] for r in results) / workers,
+        "per_worker_pss_kb": sum(r["pss"] for r in results) / workers,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routes", type=int, default=50_000)
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    routes, streets = town(args.routes, args.seed)
+    db = database(routes)
+    queries = streets[:: max(1, len(streets) // 20)]
+    results: dict[str, dict[str, dict[str, float]]] = {"json": {}, "snapshot": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "bench.json"
+        json_path.write_text(db.model_dump_json(), encoding="utf-8")
+        snap_path = Path(tmp) / "bench.snap"
+        write_snapshot(db, snap_path)
+        for count in (int(w) for w in args.workers.split(",")):
+            results["json"][str(count)] = _run(json_path, count, queries)
+            results["snapshot"][str(count)] = _run(snap_path, count, queries)
+
+    print(json.dumps({"routes": args.routes, "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
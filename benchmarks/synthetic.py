@@ -0,0 +1,75 @@
+"""Seeded synthetic data shared by the benchmarks.
+
+Built on ``town_collection_cal.updater.synth_town``, so benchmarks see the same
+street names and route shapes (single routes, house-number ranges, odd/even
+splits) as a generated town. Scripts import it as ``from synthetic import ...``;
+running ``python benchmarks/<script>.py`` puts this directory on ``sys.path``.
+"""
+from __future__ import annotations
+
+import random
+from datetime import UTC, date, datetime
+
+from town_collection_cal.common.db_model import (
+    CalendarPolicy,
+    Database,
+    HolidayPolicy,
+    MetaInfo,
+    RouteEntry,
+)
+from town_collection_cal.updater.synth_town import (
+    WEEKDAYS,
+    route_book,
+    route_entries,
+    street_name,
+)
+
+__all__ = ["WEEKDAYS", "book_lines", "database", "misspell", "street_names", "town"]
+
+
+def town(route_count: int, seed: int) -> tuple[list[RouteEntry], list[str]]:
+    """Exactly ``route_count`` routes in book order, and the town's street names."""
+    _, streets = route_book(route_count, seed)
+    return route_entries(streets), [street.name for street in streets]
+
+
+def book_lines(line_count: int, seed: int) -> list[str]:
+    """The first ``line_count`` lines of a generated route book."""
+    # Every route takes at least one line, so this book is long enough.
+    lines, _ = route_book(line_count, seed)
+    return lines[:line_count]
+
+
+def street_names(count: int, seed: int) -> list[str]:
+    """``count`` distinct street names as a route book prints them."""
+    rng = random.Random(seed)
+    return [street_name(rng, idx, seed) for idx in range(count)]
+
+
+def misspell(rng: random.Random, street: str) -> str:
+    """Swap two adjacent letters and append one, so exact lookups miss."""
+    chars = list(street)
+    pos = rng.randrange(len(chars) - 1)
+    chars[pos], chars[pos + 1] = chars[pos + 1], chars[pos]
+    return "".join(chars) + "x"
+
+
+def database(routes: list[RouteEntry], town_id: str = "bench") -> Database:
+    """A DB of ``routes`` with a street index and fixed policies and timestamp."""
+    db = Database(
+        meta=MetaInfo(generated_at=datetime(2025, 1, 1, tzinfo=UTC), town_id=town_id, sources={}),
+        calendar_policy=CalendarPolicy(
+            recycling_mode="alternating_week",
+            anchor_week_sunday=date(2025, 1, 5),
+            anchor_color="BLUE",
+        ),
+        holiday_policy=HolidayPolicy(
+            shift_holidays=[date(2025, 1, 1), date(2025, 5, 26), date(2025, 7, 4)],
+            no_collection_dates=[date(2025, 12, 25)],
+        ),
+        routes=routes,
+    )
+    db.street_index = {}
+    for idx, route in enumerate(routes):
+        db.street_index.setdefault(route.street_normalized, []).append(idx)
+    return db
@@ -6,7 +6,15 @@ TOWN_CONFIG_PATH="${TOWN_CONFIG_PATH:-$(pwd)/towns/${TOWN_ID}/town.yaml}"
 OUT_PATH="${OUT_PATH:-$(pwd)/data/generated/${TOWN_ID}.json}"
 CACHE_DIR="${CACHE_DIR:-$(pwd)/data/cache}"
 
+# Exit status 3 means the inputs were unchanged and the DB was left untouched.
+status=0
 python -m town_collection_cal.updater build-db \
   --town "${TOWN_CONFIG_PATH}" \
   --out "${OUT_PATH}" \
-  --cache-dir "${CACHE_DIR}"
+  --cache-dir "${CACHE_DIR}" \
+  --exit-code || status=$?
+if [[ "$status" -eq 3 ]]; then
+  echo "DB unchanged: ${OUT_PATH}"
+  exit 0
+fi
+exit "$status"
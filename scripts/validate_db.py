@@ -4,17 +4,32 @@ import argparse
 import json
 from pathlib import Path
 
+from town_collection_cal.common.db_file import read_db_bytes
+from town_collection_cal.common.db_model import Database
+from town_collection_cal.common.snapshot import is_snapshot, open_snapshot
+from town_collection_cal.updater.coverage import analyze_coverage
+
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Validate generated DB")
-    parser.add_argument("--db", required=True, help="Path to DB JSON")
+    parser.add_argument(
+        "--db", required=True, help="Path to DB JSON (optionally .gz/.zst) or .snap snapshot"
+    )
+    parser.add_argument(
+        "--strict-coverage",
+        action="store_true",
+        help="Fail on conflicting overlaps or unreachable routes",
+    )
     args = parser.parse_args()
 
     path = Path(args.db)
     if not path.exists():
         raise SystemExit(f"DB not found: {path}")
 
-    data = json.loads(path.read_text(encoding="utf-8"))
+    if is_snapshot(path):
+        data = open_snapshot(path).to_database().model_dump(mode="json")
+    else:
+        data = json.loads(read_db_bytes(path))
     routes = data.get("routes", [])
     if not routes:
         raise SystemExit("DB has no routes")
@@ -28,6 +43,11 @@ def main() -> int:
     if not any("boston" in s.lower() for s in street_names):
         raise SystemExit("Expected to find a Boston street in routes")
 
+    coverage = analyze_coverage(Database.model_validate(data))
+    print(f"Coverage: {coverage.summary()}")
+    if args.strict_coverage and coverage.has_problems:
+        raise SystemExit("Route coverage problems; see check-coverage for details")
+
     print("DB sanity check OK")
     return 0
 
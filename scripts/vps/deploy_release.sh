@@ -20,6 +20,8 @@ SERVICE_NAME="${SERVICE_NAME:-town-collection-cal.service}"
 DB_UPDATE_SERVICE_NAME="${DB_UPDATE_SERVICE_NAME:-town-collection-cal-update.service}"
 DB_UPDATE_TIMER_NAME="${DB_UPDATE_TIMER_NAME:-town-collection-cal-update.timer}"
 PORT_MAP="${PORT_MAP:-8080:5000}"
+READY_URL="${READY_URL:-http://127.0.0.1:${PORT_MAP%%:*}/readyz}"
+READY_TIMEOUT_SECONDS="${READY_TIMEOUT_SECONDS:-60}"
 
 HOST_TOWNS_DIR="${HOST_TOWNS_DIR:-/opt/town-collection-cal/towns}"
 HOST_DATA_DIR="${HOST_DATA_DIR:-/opt/town-collection-cal/data}"
@@ -73,6 +75,20 @@ echo "Starting systemd service: $SERVICE_NAME"
 sudo systemctl start "$SERVICE_NAME"
 sudo systemctl status "$SERVICE_NAME" --no-pager --lines=10
 
+echo "Waiting for readiness: $READY_URL"
+ready=0
+for ((i = 0; i < READY_TIMEOUT_SECONDS; i++)); do
+  if curl -fsS "$READY_URL" >/dev/null 2>&1; then
+    ready=1
+    break
+  fi
+  sleep 1
+done
+if ((ready == 0)); then
+  echo "error: service not ready after ${READY_TIMEOUT_SECONDS}s: $READY_URL" >&2
+  exit 1
+fi
+
 if ! sudo systemctl list-unit-files --type=service --no-legend "$DB_UPDATE_SERVICE_NAME" | grep -q "^${DB_UPDATE_SERVICE_NAME}[[:space:]]"; then
   echo "error: required systemd unit not found: $DB_UPDATE_SERVICE_NAME" >&2
   exit 1
@@ -22,11 +22,17 @@ TOWN_ID="${TOWN_ID:-westford_ma}"
 TOWN_CONFIG_PATH="${TOWN_CONFIG_PATH:-/app/towns/westford_ma/town.yaml}"
 OUT_PATH="${OUT_PATH:-/app/data/generated/westford_ma.json}"
 CACHE_DIR="${CACHE_DIR:-/app/data/cache}"
+# Source cache budget; least recently used documents are evicted past it.
+CACHE_MAX_MB="${CACHE_MAX_MB:-256}"
+# Published DB versions kept for `updater rollback` (0 writes OUT_PATH directly).
+KEEP_DB_VERSIONS="${KEEP_DB_VERSIONS:-5}"
 
 UID_GID="${UID_GID:-$(id -u):$(id -g)}"
 
 echo "Updating DB with image: $IMAGE"
 
+# Exit status 3 means the inputs were unchanged and the DB was left untouched.
+status=0
 docker run --rm \
   --user "$UID_GID" \
   -e TOWN_ID="$TOWN_ID" \
@@ -39,4 +45,13 @@ docker run --rm \
   python -m town_collection_cal.updater build-db \
     --town "$TOWN_CONFIG_PATH" \
     --out "$OUT_PATH" \
-    --cache-dir "$CACHE_DIR"
+    --cache-dir "$CACHE_DIR" \
+    --cache-max-mb "$CACHE_MAX_MB" \
+    --keep-versions "$KEEP_DB_VERSIONS" \
+    --exit-code || status=$?
+
+if [[ "$status" -eq 3 ]]; then
+  echo "DB unchanged; nothing to reload"
+  exit 0
+fi
+exit "$status"
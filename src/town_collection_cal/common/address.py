@@ -4,13 +4,22 @@ import logging
 from dataclasses import dataclass
 from typing import Any
 
-try:
-    import usaddress  # type: ignore
-except Exception:  # pragma: no cover - fallback when dependency missing
-    usaddress = None
-
 logger = logging.getLogger(__name__)
 _warned_fallback = False
+_UNLOADED: Any = object()
+# Imported on first use; loading the usaddress CRF model is slow at startup.
+usaddress: Any = _UNLOADED
+
+
+def _load_usaddress() -> Any:
+    global usaddress
+    if usaddress is _UNLOADED:
+        try:
+            import usaddress as module  # type: ignore
+        except Exception:  # pragma: no cover - fallback when dependency missing
+            module = None
+        usaddress = module
+    return usaddress
 
 
 @dataclass(frozen=True)
@@ -25,10 +34,11 @@ def parse_address(raw: str) -> ParsedAddress:
     raw = raw.strip()
     if not raw:
         return ParsedAddress(None, None, raw, {})
-    if usaddress:
+    tagger = _load_usaddress()
+    if tagger:
         try:
-            parsed, _ = usaddress.tag(raw)
-        except usaddress.RepeatedLabelError as exc:  # type: ignore[attr-defined]
+            parsed, _ = tagger.tag(raw)
+        except tagger.RepeatedLabelError as exc:  # type: ignore[attr-defined]
             parsed = exc.parsed_string or {}
         house_number = parsed.get("AddressNumber")
         street_name = parsed.get("StreetName")
@@ -0,0 +1,277 @@
+"""Size-bounded, content-addressed store for downloaded sources.
+
+Layout under the cache root::
+
+    blobs/<sha256><suffix>   one file per distinct document
+    blobs/text/              text extracted from those blobs (see pdf_text)
+    partial/                 interrupted downloads, keyed by URL
+    locks/                   per-URL download locks
+    index.json               per-URL validators and per-blob size/last use
+
+Identical documents fetched from different URLs (or for different towns) are
+stored once. The index records each blob's sha256, so nothing is re-hashed
+to look it up. After every store the least recently used blobs are evicted
+until the total fits ``max_bytes``; blobs this instance has served are never
+evicted by it, so a build's own sources stay in place while it runs.
+"""
+from __future__ import annotations
+
+import argparse
+import fcntl
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+BLOBS_DIRNAME = "blobs"
+PARTIAL_DIRNAME = "partial"
+LOCKS_DIRNAME = "locks"
+INDEX_FILENAME = "index.json"
+DEFAULT_MAX_MB = 256
+DEFAULT_MAX_BYTES = DEFAULT_MAX_MB * 1024 * 1024
+
+_BLOB_NAME = re.compile(r"^([0-9a-f]{64})(\.[A-Za-z0-9]+)?$")
+# POSIX locks don't exclude threads of one process, so each URL lock file
+# also gets a thread lock, shared by every BlobCache instance.
+_URL_THREAD_LOCKS: dict[str, threading.Lock] = {}
+_URL_THREAD_LOCKS_GUARD = threading.Lock()
+
+
+@dataclass
+class UrlEntry:
+    blob: str
+    sha256: str
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+
+@dataclass
+class BlobEntry:
+    size: int
+    last_used: float
+
+
+@dataclass
+class _Index:
+    urls: dict[str, UrlEntry]
+    blobs: dict[str, BlobEntry]
+
+    @classmethod
+    def load(cls, path: Path) -> _Index:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return cls({}, {})
+        except (OSError, ValueError) as exc:
+            logger.warning("Rebuilding unreadable cache index %s: %s", path, exc)
+            return cls({}, {})
+        return cls(
+            urls={url: UrlEntry(**entry) for url, entry in data.get("urls", {}).items()},
+            blobs={name: BlobEntry(**entry) for name, entry in data.get("blobs", {}).items()},
+        )
+
+    def save(self, path: Path) -> None:
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(asdict(self), indent=2, sort_keys=True), encoding="utf-8")
+        tmp_path.replace(path)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(entry.size for entry in self.blobs.values())
+
+
+def blob_sha256(path: Path) -> str | None:
+    """The content hash encoded in a blob's file name, or None for other files."""
+    match = _BLOB_NAME.match(path.name)
+    if match is None or path.parent.name != BLOBS_DIRNAME:
+        return None
+    return match.group(1)
+
+
+def max_bytes_from_mb(mb: int) -> int | None:
+    """Budget for a ``--cache-max-mb`` value; 0 or less means unbounded."""
+    return mb * 1024 * 1024 if mb > 0 else None
+
+
+class BlobCache:
+    """Shared by threads of one process; other processes are serialized by a lock file."""
+
+    def __init__(self, root: Path, max_bytes: int | None = DEFAULT_MAX_BYTES) -> None:
+        self.root = Path(root)
+        # None: no budget, nothing is evicted.
+        self.max_bytes = max_bytes
+        self.blobs_dir = self.root / BLOBS_DIRNAME
+        self.partial_dir = self.root / PARTIAL_DIRNAME
+        self._index_path = self.root / INDEX_FILENAME
+        self._lock = threading.Lock()
+        self._pinned: set[str] = set()
+
+    @contextmanager
+    def _index(self, write: bool = True) -> Iterator[_Index]:
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock, (self.root / ".lock").open("a") as lock_file:
+            # A POSIX lock, unlike flock(), is not shared with processes
+            # forked while it is held (build_all's parse pool).
+            fcntl.lockf(lock_file, fcntl.LOCK_EX)
+            index = _Index.load(self._index_path)
+            yield index
+            if write:
+                index.save(self._index_path)
+
+    def blob_path(self, blob: str) -> Path:
+        return self.blobs_dir / blob
+
+    def partial_paths(self, url: str) -> tuple[Path, Path]:
+        """Download target and its validator record for an interrupted fetch of ``url``."""
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        return self.partial_dir / key, self.partial_dir / f"{key}.json"
+
+    @contextmanager
+    def url_lock(self, url: str) -> Iterator[None]:
+        """Hold ``url``'s partial download exclusively (threads and processes)."""
+        tmp_path, _ = self.partial_paths(url)
+        lock_path = self.root / LOCKS_DIRNAME / f"{tmp_path.name}.lock"
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with _URL_THREAD_LOCKS_GUARD:
+            thread_lock = _URL_THREAD_LOCKS.setdefault(str(lock_path), threading.Lock())
+        with thread_lock, lock_path.open("a") as lock_file:
+            fcntl.lockf(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def lookup(self, url: str) -> UrlEntry | None:
+        """The cached entry for ``url`` if its blob is still on disk."""
+        with self._index(write=False) as index:
+            entry = index.urls.get(url)
+            if entry is None or not self.blob_path(entry.blob).exists():
+                return None
+            # Kept from here on, so a revalidation can still serve it.
+            self._pinned.add(entry.blob)
+        return entry
+
+    def touch(self, url: str, entry: UrlEntry) -> Path:
+        """Mark ``entry``'s blob as just used by ``url`` and return its path."""
+        path = self.blob_path(entry.blob)
+        with self._index() as index:
+            index.urls[url] = entry
+            blob = index.blobs.get(entry.blob)
+            if blob is None:
+                blob = index.blobs[entry.blob] = BlobEntry(size=path.stat().st_size, last_used=0)
+            blob.last_used = time.time()
+        return path
+
+    def put(
+        self,
+        url: str,
+        src: Path,
+        *,
+        sha256: str,
+        suffix: str,
+        etag: str | None,
+        last_modified: str | None,
+    ) -> Path:
+        """Move the downloaded ``src`` into the store and record it for ``url``."""
+        name = f"{sha256}{suffix}"
+        target = self.blob_path(name)
+        with self._index() as index:
+            if target.exists():
+                src.unlink()
+                logger.debug("Deduplicated %s into existing blob %s", url, name)
+            else:
+                src.replace(target)
+            now = time.time()
+            index.blobs[name] = BlobEntry(size=target.stat().st_size, last_used=now)
+            index.urls[url] = UrlEntry(
+                blob=name,
+                sha256=sha256,
+                etag=etag,
+                last_modified=last_modified,
+                fetched_at=now,
+            )
+            self._pinned.add(name)
+            self._evict(index)
+        return target
+
+    def evict(self, max_bytes: int | None = None) -> list[str]:
+        """Evict LRU blobs down to ``max_bytes`` (default: the store's budget)."""
+        with self._index() as index:
+            return self._evict(index, max_bytes)
+
+    def _evict(self, index: _Index, max_bytes: int | None = None) -> list[str]:
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        if budget is None:
+            return []
+        total = index.total_bytes
+        evicted: list[str] = []
+        for name, entry in sorted(index.blobs.items(), key=lambda item: item[1].last_used):
+            if total <= budget:
+                break
+            if name in self._pinned:
+                continue
+            self._remove_blob(index, name)
+            total -= entry.size
+            evicted.append(name)
+        if evicted:
+            logger.info(
+                "Evicted %s cached blobs; %s bytes remain (budget %s)",
+                len(evicted),
+                total,
+                budget,
+            )
+        return evicted
+
+    def _remove_blob(self, index: _Index, name: str) -> None:
+        del index.blobs[name]
+        self.blob_path(name).unlink(missing_ok=True)
+        sha256 = name[:64]
+        # Derived caches (extracted text) live in subdirectories as "<sha256>-...".
+        for derived in self.blobs_dir.glob(f"*/{sha256}-*"):
+            derived.unlink(missing_ok=True)
+        # Without the blob the validators are useless: refetch in full.
+        for url in [url for url, entry in index.urls.items() if entry.blob == name]:
+            del index.urls[url]
+
+    def entries(self) -> list[dict[str, Any]]:
+        with self._index(write=False) as index:
+            blobs = dict(index.blobs)
+            urls = dict(index.urls)
+        by_blob: dict[str, list[str]] = {}
+        for url, entry in urls.items():
+            by_blob.setdefault(entry.blob, []).append(url)
+        return [
+            {"blob": name, **asdict(entry), "urls": sorted(by_blob.get(name, []))}
+            for name, entry in sorted(blobs.items(), key=lambda item: -item[1].last_used)
+        ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="List or trim the source cache")
+    parser.add_argument("--cache-dir", default="data/cache", help="Cache directory")
+    parser.add_argument(
+        "--evict-to-mb",
+        type=int,
+        default=None,
+        help="Evict least recently used blobs until the cache fits this size",
+    )
+    args = parser.parse_args(argv)
+
+    cache = BlobCache(Path(args.cache_dir), max_bytes=None)
+    if args.evict_to_mb is not None:
+        evicted = cache.evict(args.evict_to_mb * 1024 * 1024)
+        print(f"Evicted {len(evicted)} blobs")
+    total = 0
+    for entry in cache.entries():
+        total += entry["size"]
+        used = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["last_used"]))
+        print(f"{entry['blob'][:16]}  {entry['size']:>10}  {used}  {', '.join(entry['urls'])}")
+    print(f"total {total} bytes in {cache.blobs_dir}")
+    return 0
@@ -0,0 +1,93 @@
+"""JSON DB files, optionally gzip or zstd compressed.
+
+The codec follows the extension: ``.json.gz`` is gzip, ``.json.zst`` is zstd
+(needs the ``compression`` extra). Compressed DBs hold compact JSON; plain
+``.json`` stays indented so it remains readable in reviews and diffs.
+:func:`load_db` also opens ``.snap`` snapshots, for callers taking any format.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from pydantic import ValidationError
+
+from town_collection_cal.common.db_model import Database
+from town_collection_cal.common.snapshot import MappedDatabase, is_snapshot, open_snapshot
+
+GZIP_SUFFIX = ".gz"
+ZSTD_SUFFIX = ".zst"
+ZSTD_LEVEL = 10
+_READ_CHUNK = 1 << 20
+
+
+def compression_for(path: Path) -> str | None:
+    """``"gzip"``, ``"zstd"`` or None for an uncompressed DB path."""
+    return {GZIP_SUFFIX: "gzip", ZSTD_SUFFIX: "zstd"}.get(path.suffix)
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except ImportError as exc:
+        raise RuntimeError(
+            "zstd DBs need the zstandard package: pip install 'town-collection-cal[compression]'"
+        ) from exc
+    return zstandard
+
+
+def read_db_bytes(path: Path) -> bytes:
+    """Raw (decompressed) JSON bytes of a DB file.
+
+    Compressed files are decoded chunk by chunk from the file stream into a
+    single bytes buffer, which pydantic parses directly; no intermediate str or
+    dict of the whole DB is built.
+    """
+    codec = compression_for(path)
+    if codec is None:
+        return path.read_bytes()
+    if codec == "gzip":
+        import gzip
+
+        with gzip.open(path, "rb") as f:
+            return f.read()
+    buf = bytearray()
+    with path.open("rb") as raw, _zstandard().ZstdDecompressor().stream_reader(raw) as reader:
+        while chunk := reader.read(_READ_CHUNK):
+            buf += chunk
+    return bytes(buf)
+
+
+def read_db_file(path: Path) -> Database:
+    return Database.model_validate_json(read_db_bytes(path))
+
+
+def load_db(path: Path) -> Database | MappedDatabase:
+    """Open a DB in any format: a ``.snap`` snapshot or (compressed) JSON."""
+    if not path.exists():
+        raise FileNotFoundError(f"DB file not found: {path}")
+    if is_snapshot(path):
+        return open_snapshot(path)
+    try:
+        return read_db_file(path)
+    except ValidationError as exc:
+        raise ValueError(f"Invalid DB format: {exc}") from exc
+
+
+def write_db_file(db: Database, path: Path) -> None:
+    """Write ``db`` atomically, compressed according to the extension."""
+    codec = compression_for(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    if codec is None:
+        tmp_path.write_text(db.model_dump_json(indent=2), encoding="utf-8")
+    else:
+        payload = db.model_dump_json().encode("utf-8")
+        if codec == "gzip":
+            import gzip
+
+            # mtime=0 keeps identical content byte-identical (cheap rsync).
+            data = gzip.compress(payload, mtime=0)
+        else:
+            data = _zstandard().ZstdCompressor(level=ZSTD_LEVEL).compress(payload)
+        tmp_path.write_bytes(data)
+    tmp_path.replace(path)
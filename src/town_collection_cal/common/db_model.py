@@ -15,11 +15,20 @@ class SourceMeta(BaseModel):
     last_modified: str | None = None
 
 
+class StageStats(BaseModel):
+    wall_seconds: float
+    cpu_seconds: float
+    # Process high-water mark when the stage finished (not a per-stage delta).
+    peak_rss_mb: float | None = None
+
+
 class MetaInfo(BaseModel):
     generated_at: datetime
     town_id: str
     sources: dict[str, SourceMeta]
     git_commit: str | None = None
+    build_fingerprint: str | None = None
+    build_stats: dict[str, StageStats] | None = None
 
 
 class CalendarPolicy(BaseModel):
@@ -32,6 +41,16 @@ class HolidayPolicy(BaseModel):
     no_collection_dates: list[date] = Field(default_factory=list)
     shift_holidays: list[date] = Field(default_factory=list)
     shift_by_one_day: bool = True
+    shift_days: int = Field(default=1, ge=1)
+    shift_days_by_date: dict[date, int] = Field(default_factory=dict)
+    cascade_within_week: bool = False
+
+    @field_validator("shift_days_by_date")
+    @classmethod
+    def _positive_shift_days(cls, v: dict[date, int]) -> dict[date, int]:
+        if any(days < 1 for days in v.values()):
+            raise ValueError("shift_days_by_date values must be >= 1")
+        return v
 
 
 class RouteConstraint(BaseModel):
@@ -0,0 +1,57 @@
+"""Holiday policy compiled into ordinal lookups.
+
+``HolidayPolicy`` is the DB schema; ``CompiledHolidayPolicy`` is built once per
+loaded DB so schedule generation does set/dict lookups instead of regrouping
+holidays by week on every request.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+
+from town_collection_cal.common.db_model import HolidayPolicy
+
+
+def week_sunday_ordinal(some_day: date) -> int:
+    return some_day.toordinal() - (some_day.weekday() + 1) % 7
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledHolidayPolicy:
+    no_collection: frozenset[int]
+    # week Sunday ordinal -> ((holiday ordinal, shift days), ...) sorted by date
+    shifts_by_week: dict[int, tuple[tuple[int, int], ...]]
+
+    def adjust(self, base_date: date) -> date | None:
+        """Return the pickup date for ``base_date``, or None when skipped."""
+        ordinal = base_date.toordinal()
+        if ordinal in self.no_collection:
+            return None
+        week = week_sunday_ordinal(base_date)
+        shifts = self.shifts_by_week.get(week)
+        if not shifts:
+            return base_date
+        days = sum(shift for holiday, shift in shifts if ordinal >= holiday)
+        if not days:
+            return base_date
+        # Shifts stop at the holiday week's Saturday: carried into the next week
+        # a pickup could land on that week's own pickup day.
+        return date.fromordinal(min(ordinal + days, week + 6))
+
+
+def compile_holiday_policy(policy: HolidayPolicy) -> CompiledHolidayPolicy:
+    by_week: dict[int, list[tuple[int, int]]] = {}
+    if policy.shift_by_one_day:
+        for holiday in sorted(set(policy.shift_holidays)):
+            days = policy.shift_days_by_date.get(holiday, policy.shift_days)
+            by_week.setdefault(week_sunday_ordinal(holiday), []).append(
+                (holiday.toordinal(), days)
+            )
+    shifts_by_week: dict[int, tuple[tuple[int, int], ...]] = {}
+    for week, entries in by_week.items():
+        # Default: the earliest holiday of the week sets the cutoff (no cascading).
+        shifts_by_week[week] = tuple(entries) if policy.cascade_within_week else (entries[0],)
+    return CompiledHolidayPolicy(
+        no_collection=frozenset(d.toordinal() for d in policy.no_collection_dates),
+        shifts_by_week=shifts_by_week,
+    )
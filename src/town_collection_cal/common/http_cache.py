@@ -3,14 +3,26 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from town_collection_cal.common.blob_cache import BlobCache, UrlEntry
 
 logger = logging.getLogger(__name__)
 
+CHUNK_SIZE = 1024 * 1024
+CONTENT_RANGE_PATTERN = re.compile(r"bytes (\d+)-")
+
+
 @dataclass(frozen=True)
 class CacheResult:
     path: Path
@@ -20,98 +32,269 @@ class CacheResult:
     url: str
     etag: str | None
     last_modified: str | None
+    elapsed_seconds: float = 0.0
+    # CPU time of the fetching thread (hashing, TLS, file writes).
+    cpu_seconds: float = 0.0
+
+
+@dataclass(frozen=True)
+class FetchRequest:
+    name: str
+    url: str
+    # Suffix of the stored blob; parsers pick text vs PDF extraction by it.
+    suffix: str = ".pdf"
+
+
+def _read_meta(path: Path) -> dict[str, Any]:
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return {}
+
 
+def _content_range_start(response: requests.Response) -> int | None:
+    match = CONTENT_RANGE_PATTERN.match(response.headers.get("Content-Range", ""))
+    return int(match.group(1)) if match else None
 
-def _sha256_bytes(data: bytes) -> str:
-    return hashlib.sha256(data).hexdigest()
 
+def _stream_to_file(response: requests.Response, tmp_path: Path, resume_from: int) -> str:
+    """Write the body to ``tmp_path`` chunk by chunk and return its sha256.
 
-def _sha256_file(path: Path) -> str:
+    When resuming, the bytes already on disk are hashed first and the new
+    chunks are appended.
+    """
     h = hashlib.sha256()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+    if resume_from:
+        with tmp_path.open("rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                h.update(chunk)
+    with tmp_path.open("ab" if resume_from else "wb") as f:
+        for chunk in response.iter_content(CHUNK_SIZE):
+            f.write(chunk)
             h.update(chunk)
     return h.hexdigest()
 
 
 def fetch_with_cache(
     url: str,
-    cache_dir: Path,
-    filename: str,
+    cache: BlobCache,
     *,
+    suffix: str = ".pdf",
     force_refresh: bool = False,
     timeout: int = 30,
+    session: requests.Session | None = None,
 ) -> CacheResult:
-    url_str = str(url)
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    content_path = cache_dir / filename
-    meta_path = cache_dir / f"{filename}.meta.json"
-
-    meta: dict[str, Any] = {}
-    if meta_path.exists():
-        try:
-            meta = json.loads(meta_path.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
-            meta = {}
+    # Fetches of one URL (two towns sharing a source) take turns, so they never
+    # write, resume or store the same partial file at once. The later one then
+    # finds the earlier one's entry and only revalidates it.
+    with cache.url_lock(str(url)):
+        return _fetch_locked(
+            str(url),
+            cache,
+            suffix=suffix,
+            force_refresh=force_refresh,
+            timeout=timeout,
+            session=session,
+        )
 
-    headers: dict[str, str] = {}
-    if not force_refresh:
-        if etag := meta.get("etag"):
-            headers["If-None-Match"] = etag
-        if last_modified := meta.get("last_modified"):
-            headers["If-Modified-Since"] = last_modified
 
-    try:
-        response = requests.get(url_str, headers=headers, timeout=timeout)
-    except requests.RequestException as exc:
-        if content_path.exists():
-            sha = meta.get("sha256") or _sha256_file(content_path)
-            logger.warning("Fetch failed for %s, using cached file: %s", url_str, exc)
-            return CacheResult(
-                path=content_path,
-                sha256=sha,
-                updated=False,
-                status_code=0,
-                url=url_str,
-                etag=meta.get("etag"),
-                last_modified=meta.get("last_modified"),
-            )
-        raise
+def _fetch_locked(
+    url_str: str,
+    cache: BlobCache,
+    *,
+    suffix: str,
+    force_refresh: bool,
+    timeout: int,
+    session: requests.Session | None,
+) -> CacheResult:
+    started = time.perf_counter()
+    cpu_started = time.thread_time()
+    tmp_path, partial_meta_path = cache.partial_paths(url_str)
+    tmp_path.parent.mkdir(parents=True, exist_ok=True)
+
+    entry = cache.lookup(url_str)
 
-    if response.status_code == 304 and content_path.exists():
-        sha = meta.get("sha256") or _sha256_file(content_path)
+    def cached(status_code: int, entry: UrlEntry) -> CacheResult:
         return CacheResult(
-            path=content_path,
-            sha256=sha,
+            path=cache.touch(url_str, entry),
+            sha256=entry.sha256,
             updated=False,
-            status_code=304,
+            status_code=status_code,
             url=url_str,
-            etag=meta.get("etag"),
-            last_modified=meta.get("last_modified"),
+            etag=entry.etag,
+            last_modified=entry.last_modified,
+            elapsed_seconds=time.perf_counter() - started,
+            cpu_seconds=time.thread_time() - cpu_started,
         )
 
-    response.raise_for_status()
-    data = response.content
-    sha = _sha256_bytes(data)
+    headers: dict[str, str] = {}
+    if entry is not None and not force_refresh:
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
 
-    tmp_path = content_path.with_suffix(content_path.suffix + ".tmp")
-    tmp_path.write_bytes(data)
-    tmp_path.replace(content_path)
+    # A previous download was interrupted: ask for the rest if the server
+    # still has the same version (If-Range), otherwise it sends it all again.
+    partial = _read_meta(partial_meta_path)
+    validator = partial.get("etag") or partial.get("last_modified")
+    resume_from = 0
+    if tmp_path.exists() and validator and partial.get("url") == url_str:
+        resume_from = tmp_path.stat().st_size
+        if resume_from:
+            headers["Range"] = f"bytes={resume_from}-"
+            headers["If-Range"] = validator
 
-    new_meta = {
-        "etag": response.headers.get("ETag"),
-        "last_modified": response.headers.get("Last-Modified"),
-        "sha256": sha,
-        "url": url_str,
-    }
-    meta_path.write_text(json.dumps(new_meta, indent=2, sort_keys=True), encoding="utf-8")
+    try:
+        with (session or requests).get(
+            url_str, headers=headers, timeout=timeout, stream=True
+        ) as response:
+            if response.status_code == 304 and entry is not None:
+                return cached(304, entry)
+            # A 206 that is not the rest of our partial file would be stored as
+            # a truncated document with a valid hash.
+            misplaced = (
+                response.status_code == 206 and _content_range_start(response) != resume_from
+            )
+            if misplaced and not resume_from:
+                raise requests.HTTPError(
+                    f"Unrequested partial response for {url_str}", response=response
+                )
+            if resume_from and (misplaced or response.status_code == 416):
+                logger.info(
+                    "Discarding unusable partial download for %s (status %s)",
+                    url_str,
+                    response.status_code,
+                )
+                tmp_path.unlink(missing_ok=True)
+                partial_meta_path.unlink(missing_ok=True)
+                return _fetch_locked(
+                    url_str,
+                    cache,
+                    suffix=suffix,
+                    force_refresh=force_refresh,
+                    timeout=timeout,
+                    session=session,
+                )
+            response.raise_for_status()
+
+            if response.status_code == 206:
+                logger.info("Resuming %s from byte %s", url_str, resume_from)
+                etag = response.headers.get("ETag") or partial.get("etag")
+                last_modified = response.headers.get("Last-Modified") or partial.get(
+                    "last_modified"
+                )
+            else:
+                resume_from = 0
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                partial_meta_path.write_text(
+                    json.dumps(
+                        {"etag": etag, "last_modified": last_modified, "url": url_str},
+                        indent=2,
+                        sort_keys=True,
+                    ),
+                    encoding="utf-8",
+                )
+            sha = _stream_to_file(response, tmp_path, resume_from)
+            status_code = response.status_code
+    except requests.RequestException as exc:
+        if entry is not None:
+            logger.warning("Fetch failed for %s, using cached file: %s", url_str, exc)
+            return cached(0, entry)
+        raise
+
+    path = cache.put(
+        url_str, tmp_path, sha256=sha, suffix=suffix, etag=etag, last_modified=last_modified
+    )
+    partial_meta_path.unlink(missing_ok=True)
 
     return CacheResult(
-        path=content_path,
+        path=path,
         sha256=sha,
         updated=True,
-        status_code=response.status_code,
+        status_code=status_code,
         url=url_str,
-        etag=new_meta.get("etag"),
-        last_modified=new_meta.get("last_modified"),
+        etag=etag,
+        last_modified=last_modified,
+        elapsed_seconds=time.perf_counter() - started,
+        cpu_seconds=time.thread_time() - cpu_started,
     )
+
+
+def create_session(pool_maxsize: int = 8) -> requests.Session:
+    """Session with a connection pool sized for concurrent fetches."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class HostLimiter:
+    """Caps concurrent requests per host; shareable across fetch_all calls."""
+
+    def __init__(self, per_host: int) -> None:
+        if per_host < 1:
+            raise ValueError("per_host must be >= 1")
+        self.per_host = per_host
+        self._lock = threading.Lock()
+        self._semaphores: dict[str, threading.Semaphore] = {}
+
+    def for_url(self, url: str) -> threading.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.Semaphore(self.per_host)
+            return self._semaphores[host]
+
+
+def fetch_all(
+    fetches: list[FetchRequest],
+    cache: BlobCache,
+    *,
+    force_refresh: bool = False,
+    timeout: int = 30,
+    session: requests.Session | None = None,
+    max_workers: int = 4,
+    per_host_limit: int = 2,
+    limiter: HostLimiter | None = None,
+) -> dict[str, CacheResult]:
+    """Fetch several sources concurrently over one pooled session.
+
+    Results are keyed by ``FetchRequest.name``. The first failure is raised
+    once every fetch has finished.
+    """
+    own_session = session is None
+    session = session or create_session(max(max_workers, per_host_limit))
+    limiter = limiter or HostLimiter(per_host_limit)
+
+    def _fetch(item: FetchRequest) -> CacheResult:
+        with limiter.for_url(item.url):
+            result = fetch_with_cache(
+                item.url,
+                cache,
+                suffix=item.suffix,
+                force_refresh=force_refresh,
+                timeout=timeout,
+                session=session,
+            )
+        logger.info(
+            "Fetched %s status=%s updated=%s in %.2fs (%s)",
+            item.name,
+            result.status_code,
+            result.updated,
+            result.elapsed_seconds,
+            result.url,
+        )
+        return result
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            futures = {item.name: pool.submit(_fetch, item) for item in fetches}
+        return {name: future.result() for name, future in futures.items()}
+    finally:
+        if own_session:
+            session.close()
@@ -0,0 +1,346 @@
+"""Shared PDF text extraction for parser plugins.
+
+Extracted per-page text is cached next to the source (``<dir>/text/``) as
+gzip-compressed JSON lines, keyed by the source sha256 and the extractor
+version, so unchanged sources skip PDF layout analysis entirely. Pages are
+produced lazily (``iter_pages``/``iter_lines``) so parsers can stream large
+route books instead of holding the whole document in memory.
+
+Large documents are split into page ranges extracted by a process pool
+(``PDF_EXTRACT_WORKERS``, default: CPU count); each worker opens the PDF
+itself and the text is reassembled in page order.
+
+The extraction backend is chosen per town (``parsers.text_backend``):
+``pdfplumber`` runs full layout analysis; ``pypdfium2`` reads the text layer
+directly and is much faster on plain line-oriented documents. Builds select
+it with ``use_text_backend`` so parser plugins need no extra argument; the
+backend version is part of the cache key.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+
+from town_collection_cal.common.blob_cache import blob_sha256
+from town_collection_cal.common.stats import add_stage_time
+
+logger = logging.getLogger(__name__)
+
+TEXT_CACHE_DIRNAME = "text"
+# Below this many pages the process pool costs more than it saves.
+MIN_PAGES_FOR_POOL = 16
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def resolve_workers(workers: int | None = None) -> int:
+    if workers is None:
+        raw = os.getenv("PDF_EXTRACT_WORKERS")
+        workers = int(raw) if raw else (os.cpu_count() or 1)
+    return max(1, workers)
+
+
+def _pdfplumber_page_count(path: str) -> int:
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        return len(pdf.pages)
+
+
+def _pdfplumber_page_range(path: str, start: int, end: int | None) -> Iterator[str]:
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages[start:end]:
+            yield page.extract_text() or ""
+            # Drop the page's parsed layout objects so memory stays flat.
+            page.close()
+
+
+def _pdfium_page_count(path: str) -> int:
+    import pypdfium2
+
+    pdf = pypdfium2.PdfDocument(path)
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def _pdfium_page_range(path: str, start: int, end: int | None) -> Iterator[str]:
+    import pypdfium2
+
+    pdf = pypdfium2.PdfDocument(path)
+    try:
+        for index in range(start, len(pdf) if end is None else min(end, len(pdf))):
+            page = pdf[index]
+            textpage = page.get_textpage()
+            try:
+                text = textpage.get_text_range()
+            finally:
+                textpage.close()
+                page.close()
+            # pdfium separates lines with CRLF; match pdfplumber's "\n".
+            yield text.replace("\r\n", "\n").replace("\r", "\n")
+    finally:
+        pdf.close()
+
+
+@dataclass(frozen=True)
+class TextBackend:
+    name: str
+    # Bump when extraction output can change for the same input bytes.
+    version: str
+    page_count: Callable[[str], int]
+    page_range: Callable[[str, int, int | None], Iterator[str]]
+
+
+TEXT_BACKENDS = {
+    "pdfplumber": TextBackend(
+        "pdfplumber", "pdfplumber-1", _pdfplumber_page_count, _pdfplumber_page_range
+    ),
+    "pypdfium2": TextBackend(
+        "pypdfium2", "pypdfium2-1", _pdfium_page_count, _pdfium_page_range
+    ),
+}
+DEFAULT_TEXT_BACKEND = "pdfplumber"
+# Version of the default backend (what builds used before backends existed).
+EXTRACTOR_VERSION = TEXT_BACKENDS[DEFAULT_TEXT_BACKEND].version
+
+_current_backend: ContextVar[str] = ContextVar("text_backend", default=DEFAULT_TEXT_BACKEND)
+
+
+def get_text_backend(name: str | None = None) -> TextBackend:
+    """Backend ``name``, or the one selected by ``use_text_backend``."""
+    name = name or _current_backend.get()
+    try:
+        return TEXT_BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown text backend {name!r}; expected one of {sorted(TEXT_BACKENDS)}"
+        ) from None
+
+
+@contextmanager
+def use_text_backend(name: str) -> Iterator[TextBackend]:
+    """Make ``name`` the default backend for extraction in this context."""
+    backend = get_text_backend(name)
+    token = _current_backend.set(backend.name)
+    try:
+        yield backend
+    finally:
+        _current_backend.reset(token)
+
+
+def _extract_page_range(job: tuple[str, str, int, int]) -> list[str]:
+    backend, path, start, end = job
+    return list(TEXT_BACKENDS[backend].page_range(path, start, end))
+
+
+def _page_ranges(page_count: int, workers: int) -> list[tuple[int, int]]:
+    # A few chunks per worker keeps the pool busy when pages differ in cost.
+    chunk = max(1, -(-page_count // (workers * 4)))
+    return [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+
+
+def _iter_pages_uncached(
+    path: Path, workers: int | None = None, backend: TextBackend | None = None
+) -> Iterator[str]:
+    backend = backend or get_text_backend()
+    workers = resolve_workers(workers)
+    page_count = backend.page_count(str(path)) if workers > 1 else 0
+    if workers <= 1 or page_count < MIN_PAGES_FOR_POOL:
+        yield from backend.page_range(str(path), 0, None)
+        return
+
+    jobs = [
+        (backend.name, str(path), start, end)
+        for start, end in _page_ranges(page_count, workers)
+    ]
+    logger.debug("Extracting %s pages of %s with %s workers", page_count, path, workers)
+    max_workers = min(workers, len(jobs))
+    pending = iter(jobs)
+    # Builds also run inside the threaded service (auto-update); forking there
+    # can copy locks other threads hold, so start workers from a forkserver.
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("forkserver")
+    ) as pool:
+        # pool.map would submit every chunk at once and hold finished chunks
+        # until the consumer reached them; keep a bounded window in flight
+        # instead, topped up as chunks are yielded in order.
+        window = deque(
+            pool.submit(_extract_page_range, job)
+            for job in islice(pending, max_workers * CHUNKS_IN_FLIGHT_PER_WORKER)
+        )
+        try:
+            while window:
+                chunk = window.popleft().result()
+                for job in islice(pending, 1):
+                    window.append(pool.submit(_extract_page_range, job))
+                yield from chunk
+        finally:
+            for future in window:
+                future.cancel()
+
+
+def _cache_path(cache_dir: Path, sha256: str, backend: TextBackend) -> Path:
+    return cache_dir / f"{sha256}-{backend.version}.jsonl.gz"
+
+
+def _iter_cache(path: Path) -> Iterator[str]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def _iter_extract_and_cache(
+    path: Path, cache_path: Path, workers: int | None, backend: TextBackend, skip: int = 0
+) -> Iterator[str]:
+    """Yield extracted pages after the first ``skip``, writing the cache as we go."""
+    tmp_path = cache_path.with_suffix(cache_path.suffix + ".tmp")
+    writer = None
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        writer = gzip.open(tmp_path, "wt", encoding="utf-8")
+    except OSError as exc:
+        logger.warning("Could not write text cache %s: %s", cache_path, exc)
+
+    complete = False
+    try:
+        for index, page in enumerate(_iter_pages_uncached(path, workers, backend)):
+            if writer is not None:
+                try:
+                    writer.write(json.dumps(page) + "\n")
+                except OSError as exc:
+                    logger.warning("Could not write text cache %s: %s", cache_path, exc)
+                    writer.close()
+                    writer = None
+            if index >= skip:
+                yield page
+        complete = True
+    finally:
+        if writer is not None:
+            try:
+                writer.close()
+                if complete:
+                    tmp_path.replace(cache_path)
+            except OSError as exc:
+                logger.warning("Could not write text cache %s: %s", cache_path, exc)
+            if not complete:
+                tmp_path.unlink(missing_ok=True)
+
+
+def _timed(pages: Iterator[str]) -> Iterator[str]:
+    # Only the time spent producing pages counts; the consumer's parsing
+    # between pages is excluded.
+    while True:
+        wall, cpu = time.perf_counter(), time.process_time()
+        page = next(pages, None)
+        add_stage_time("extract", time.perf_counter() - wall, time.process_time() - cpu)
+        if page is None:
+            return
+        yield page
+
+
+def iter_pages(
+    path: Path,
+    *,
+    cache_dir: Path | None = None,
+    workers: int | None = None,
+    backend: str | None = None,
+) -> Iterator[str]:
+    """Yield the text of each page of ``path`` (a ``.txt`` file is one page).
+
+    Pages stream from the text cache when present; otherwise they are
+    extracted and written to the cache as they are yielded. Time spent here
+    is recorded as the ``extract`` stage of an active build.
+    """
+    # Resolved now: the generator body runs later, possibly outside the
+    # caller's use_text_backend block.
+    return _timed(_iter_pages(Path(path), cache_dir, workers, get_text_backend(backend)))
+
+
+def _iter_pages(
+    path: Path, cache_dir: Path | None, workers: int | None, backend: TextBackend
+) -> Iterator[str]:
+    if path.suffix.lower() == ".txt":
+        yield path.read_text(encoding="utf-8")
+        return
+
+    # Cached sources are named by their hash; only other files are hashed here.
+    sha256 = blob_sha256(path) or _sha256_file(path)
+    cache_path = _cache_path(cache_dir or path.parent / TEXT_CACHE_DIRNAME, sha256, backend)
+    yielded = 0
+    try:
+        for page in _iter_cache(cache_path):
+            yield page
+            yielded += 1
+        logger.debug("Text cache hit for %s (%s)", path, cache_path.name)
+        return
+    except FileNotFoundError:
+        pass
+    except (OSError, EOFError, ValueError) as exc:
+        logger.warning("Ignoring unreadable text cache %s: %s", cache_path, exc)
+
+    # Re-extract, skipping any pages already served from a truncated cache.
+    yield from _iter_extract_and_cache(path, cache_path, workers, backend, skip=yielded)
+
+
+def iter_lines(
+    path: Path,
+    *,
+    cache_dir: Path | None = None,
+    workers: int | None = None,
+    backend: str | None = None,
+) -> Iterator[str]:
+    """Yield the text lines of ``path`` page by page, without joining pages."""
+    path = Path(path)
+    if path.suffix.lower() == ".txt":
+        with path.open(encoding="utf-8") as f:
+            for raw in f:
+                yield from raw.splitlines()
+        return
+    for page in iter_pages(path, cache_dir=cache_dir, workers=workers, backend=backend):
+        yield from page.splitlines()
+
+
+def extract_pages(
+    path: Path,
+    *,
+    cache_dir: Path | None = None,
+    workers: int | None = None,
+    backend: str | None = None,
+) -> list[str]:
+    return list(iter_pages(path, cache_dir=cache_dir, workers=workers, backend=backend))
+
+
+def extract_text(
+    path: Path,
+    *,
+    cache_dir: Path | None = None,
+    workers: int | None = None,
+    backend: str | None = None,
+) -> str:
+    return "\n".join(
+        extract_pages(path, cache_dir=cache_dir, workers=workers, backend=backend)
+    )
@@ -0,0 +1,90 @@
+"""Minimal text-only PDF writer for synthetic fixtures and benchmarks.
+
+Writes one Helvetica text line per input line using WinAnsi encoding, which
+is enough for the line-oriented documents towns publish.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+_PAGE_WIDTH = 612
+_PAGE_HEIGHT = 792
+_MARGIN = 50
+_FONT_SIZE = 10
+_LEADING = 12
+
+
+def _escape(line: str) -> bytes:
+    raw = line.encode("cp1252", errors="replace")
+    return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def _content_stream(lines: Sequence[str]) -> bytes:
+    parts = [
+        b"BT",
+        f"/F1 {_FONT_SIZE} Tf {_LEADING} TL {_MARGIN} {_PAGE_HEIGHT - _MARGIN} Td".encode(),
+    ]
+    for line in lines:
+        parts.append(b"(" + _escape(line) + b") Tj T*")
+    parts.append(b"ET")
+    return b"\n".join(parts)
+
+
+def lines_per_page() -> int:
+    return (_PAGE_HEIGHT - 2 * _MARGIN) // _LEADING
+
+
+def paginate(lines: Iterable[str], per_page: int | None = None) -> list[list[str]]:
+    per_page = per_page or lines_per_page()
+    pages: list[list[str]] = [[]]
+    for line in lines:
+        if len(pages[-1]) >= per_page:
+            pages.append([])
+        pages[-1].append(line)
+    return pages
+
+
+def render_pdf(pages: Sequence[Sequence[str]]) -> bytes:
+    """Render ``pages`` (each a list of text lines) into PDF bytes."""
+    pages = pages or [[]]
+    objects: list[bytes] = []
+    # 1: catalog, 2: page tree, 3: font, then (page, content) pairs.
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    objects.append(
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"
+    )
+    for page_id, lines in zip(page_ids, pages, strict=True):
+        objects.append(
+            (
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_PAGE_WIDTH} {_PAGE_HEIGHT}] "
+                f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>"
+            ).encode()
+        )
+        stream = _content_stream(lines)
+        objects.append(
+            f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream"
+        )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref_pos = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref_pos}\n%%EOF\n"
+    ).encode()
+    return bytes(out)
+
+
+def write_pdf(path: Path, pages: Sequence[Sequence[str]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(render_pdf(pages))
@@ -0,0 +1,164 @@
+"""Compact runtime view of a validated DB.
+
+The pydantic models in ``db_model`` remain the on-disk schema; the service
+converts them once per load into frozen ``__slots__`` records with interned
+weekday/color strings and a prebuilt street lookup.
+"""
+from __future__ import annotations
+
+import sys
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from town_collection_cal.common.db_model import (
+    CalendarPolicy,
+    Database,
+    HolidayPolicy,
+    MetaInfo,
+    RouteConstraint,
+    RouteEntry,
+)
+from town_collection_cal.common.holidays import CompiledHolidayPolicy, compile_holiday_policy
+
+
+def _intern(value: str | None) -> str | None:
+    return sys.intern(value) if value is not None else None
+
+
+@dataclass(frozen=True, slots=True)
+class RuntimeConstraint:
+    parity: str | None
+    range_min: int | None
+    range_max: int | None
+
+    @classmethod
+    def from_model(cls, constraint: RouteConstraint) -> RuntimeConstraint:
+        return cls(_intern(constraint.parity), constraint.range_min, constraint.range_max)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"parity": self.parity, "range_min": self.range_min, "range_max": self.range_max}
+
+
+@dataclass(frozen=True, slots=True)
+class RuntimeRoute:
+    street: str
+    street_normalized: str
+    weekday: str | None
+    recycling_color: str | None
+    no_collection: bool
+    constraints: tuple[RuntimeConstraint, ...]
+    notes: str | None
+
+    @classmethod
+    def from_model(cls, route: RouteEntry) -> RuntimeRoute:
+        return cls(
+            street=sys.intern(route.street),
+            street_normalized=sys.intern(route.street_normalized),
+            weekday=_intern(route.weekday),
+            recycling_color=_intern(route.recycling_color),
+            no_collection=route.no_collection,
+            constraints=tuple(RuntimeConstraint.from_model(c) for c in route.constraints),
+            notes=route.notes,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Same shape as ``RouteEntry.model_dump()``."""
+        return {
+            "street": self.street,
+            "street_normalized": self.street_normalized,
+            "weekday": self.weekday,
+            "recycling_color": self.recycling_color,
+            "no_collection": self.no_collection,
+            "constraints": [c.to_dict() for c in self.constraints],
+            "notes": self.notes,
+        }
+
+
+class ServingDb(Protocol):
+    """What the resolver and service read from a loaded DB."""
+
+    schema_version: int
+    meta: MetaInfo
+    calendar_policy: CalendarPolicy
+    holiday_policy: HolidayPolicy
+    compiled_holidays: CompiledHolidayPolicy
+    aliases: Mapping[str, str]
+
+    def candidates(self, street_normalized: str) -> Sequence[RuntimeRoute]: ...
+
+    def street_names(self) -> Sequence[str]: ...
+
+    def recycling_colors(self) -> Sequence[str]: ...
+
+    def street_count(self) -> int: ...
+
+
+class RuntimeDb:
+    __slots__ = (
+        "schema_version",
+        "meta",
+        "calendar_policy",
+        "holiday_policy",
+        "compiled_holidays",
+        "aliases",
+        "route_count",
+        "_by_street",
+        "_street_names",
+    )
+
+    def __init__(
+        self,
+        *,
+        schema_version: int,
+        meta: MetaInfo,
+        calendar_policy: CalendarPolicy,
+        holiday_policy: HolidayPolicy,
+        aliases: Mapping[str, str],
+        routes: Sequence[RuntimeRoute],
+    ) -> None:
+        self.schema_version = schema_version
+        self.meta = meta
+        self.calendar_policy = calendar_policy
+        self.holiday_policy = holiday_policy
+        self.compiled_holidays = compile_holiday_policy(holiday_policy)
+        self.aliases = dict(aliases)
+        self.route_count = len(routes)
+        grouped: dict[str, list[RuntimeRoute]] = {}
+        for route in routes:
+            grouped.setdefault(route.street_normalized, []).append(route)
+        self._by_street = {key: tuple(items) for key, items in grouped.items()}
+        self._street_names = tuple(sorted({route.street for route in routes}))
+
+    @classmethod
+    def from_database(cls, db: Database) -> RuntimeDb:
+        return cls(
+            schema_version=db.schema_version,
+            meta=db.meta,
+            calendar_policy=db.calendar_policy,
+            holiday_policy=db.holiday_policy,
+            aliases=db.aliases,
+            routes=[RuntimeRoute.from_model(route) for route in db.routes],
+        )
+
+    def candidates(self, street_normalized: str) -> tuple[RuntimeRoute, ...]:
+        return self._by_street.get(street_normalized, ())
+
+    def street_names(self) -> tuple[str, ...]:
+        return self._street_names
+
+    def recycling_colors(self) -> tuple[str, ...]:
+        """Distinct recycling colors of the routes, as stored."""
+        return tuple(
+            sorted(
+                {
+                    route.recycling_color
+                    for routes in self._by_street.values()
+                    for route in routes
+                    if route.recycling_color
+                }
+            )
+        )
+
+    def street_count(self) -> int:
+        return len(self._by_street)
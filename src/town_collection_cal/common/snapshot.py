@@ -0,0 +1,378 @@
+"""Flat, memory-mappable DB snapshot format.
+
+Layout (little endian):
+- fixed header: magic + section offsets/counts
+- JSON block: schema_version, meta, calendar_policy, holiday_policy, aliases
+- string table: u32 offsets (count + 1) followed by UTF-8 data
+- route records: fixed-width, strings referenced by string-table id
+- constraint records: fixed-width, referenced by (start, count) from routes
+- street keys: sorted by normalized street, each pointing into a u32 route-index list
+
+Every worker maps the same file read-only, so route data lives in the shared
+page cache instead of a per-worker Python object graph.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+from collections.abc import Iterator, Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+from town_collection_cal.common.db_model import (
+    CalendarPolicy,
+    Database,
+    HolidayPolicy,
+    MetaInfo,
+    RouteConstraint,
+    RouteEntry,
+)
+from town_collection_cal.common.holidays import compile_holiday_policy
+from town_collection_cal.common.runtime import RuntimeConstraint, RuntimeRoute
+
+MAGIC = b"TCCSNAP1"
+SNAPSHOT_SUFFIX = ".snap"
+_NONE = 0xFFFFFFFF
+
+# magic, json_off, json_len, str_count, str_offsets_off, str_data_off,
+# route_count, routes_off, constraint_count, constraints_off,
+# key_count, keys_off, index_list_off
+_HEADER = struct.Struct("<8s12Q")
+# street, street_normalized, weekday, recycling_color, notes, flags,
+# constraint_start, constraint_count
+_ROUTE = struct.Struct("<5IB3xII")
+# Byte offset of recycling_color's string id within a route record.
+_ROUTE_COLOR_OFFSET = 3 * 4
+# parity, range_min, range_max (-1 means None)
+_CONSTRAINT = struct.Struct("<B3xii")
+# street_normalized id, index list start, index list count
+_KEY = struct.Struct("<3I")
+_U32 = struct.Struct("<I")
+
+_FLAG_NO_COLLECTION = 1
+_PARITY_CODES = {None: 0, "odd": 1, "even": 2}
+_PARITY_NAMES = {code: name for name, code in _PARITY_CODES.items()}
+
+
+def is_snapshot(path: Path) -> bool:
+    if path.suffix == SNAPSHOT_SUFFIX:
+        return True
+    try:
+        with path.open("rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _align(buf: bytearray, boundary: int = 8) -> None:
+    buf.extend(b"\0" * (-len(buf) % boundary))
+
+
+def encode_snapshot(db: Database) -> bytes:
+    strings: list[str] = []
+    string_ids: dict[str, int] = {}
+
+    def sid(value: str | None) -> int:
+        if value is None:
+            return _NONE
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    route_records = bytearray()
+    constraint_records = bytearray()
+    constraint_count = 0
+    index: dict[str, list[int]] = {}
+    for idx, route in enumerate(db.routes):
+        route_records += _ROUTE.pack(
+            sid(route.street),
+            sid(route.street_normalized),
+            sid(route.weekday),
+            sid(route.recycling_color),
+            sid(route.notes),
+            _FLAG_NO_COLLECTION if route.no_collection else 0,
+            constraint_count,
+            len(route.constraints),
+        )
+        for constraint in route.constraints:
+            constraint_records += _CONSTRAINT.pack(
+                _PARITY_CODES[constraint.parity],
+                -1 if constraint.range_min is None else constraint.range_min,
+                -1 if constraint.range_max is None else constraint.range_max,
+            )
+            constraint_count += 1
+        index.setdefault(route.street_normalized, []).append(idx)
+
+    key_records = bytearray()
+    index_list = bytearray()
+    list_pos = 0
+    for key in sorted(index):
+        positions = index[key]
+        key_records += _KEY.pack(sid(key), list_pos, len(positions))
+        index_list += struct.pack(f"<{len(positions)}I", *positions)
+        list_pos += len(positions)
+
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = [0]
+    for item in encoded:
+        offsets.append(offsets[-1] + len(item))
+
+    header_json = json.dumps(
+        {
+            "schema_version": db.schema_version,
+            "meta": db.meta.model_dump(mode="json"),
+            "calendar_policy": db.calendar_policy.model_dump(mode="json"),
+            "holiday_policy": db.holiday_policy.model_dump(mode="json"),
+            "aliases": db.aliases,
+        },
+        sort_keys=True,
+    ).encode("utf-8")
+
+    body = bytearray(b"\0" * _HEADER.size)
+    json_off = len(body)
+    body += header_json
+    _align(body)
+    str_offsets_off = len(body)
+    body += struct.pack(f"<{len(offsets)}I", *offsets)
+    str_data_off = len(body)
+    body += b"".join(encoded)
+    _align(body)
+    routes_off = len(body)
+    body += route_records
+    _align(body)
+    constraints_off = len(body)
+    body += constraint_records
+    _align(body)
+    keys_off = len(body)
+    body += key_records
+    _align(body)
+    index_list_off = len(body)
+    body += index_list
+
+    body[: _HEADER.size] = _HEADER.pack(
+        MAGIC,
+        json_off,
+        len(header_json),
+        len(strings),
+        str_offsets_off,
+        str_data_off,
+        len(db.routes),
+        routes_off,
+        constraint_count,
+        constraints_off,
+        len(index),
+        keys_off,
+        index_list_off,
+    )
+    return bytes(body)
+
+
+def write_snapshot(db: Database, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_bytes(encode_snapshot(db))
+    tmp_path.replace(path)
+
+
+class _MappedRoutes(Sequence[RouteEntry]):
+    def __init__(self, snapshot: MappedDatabase) -> None:
+        self._snapshot = snapshot
+
+    def __len__(self) -> int:
+        return self._snapshot.route_count
+
+    def __getitem__(self, idx: Any) -> Any:
+        if isinstance(idx, slice):
+            return [self._snapshot.route(i) for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("route index out of range")
+        return self._snapshot.route(idx)
+
+    def __iter__(self) -> Iterator[RouteEntry]:
+        for idx in range(len(self)):
+            yield self._snapshot.route(idx)
+
+
+class _MappedStreetIndex(Mapping[str, list[int]]):
+    def __init__(self, snapshot: MappedDatabase) -> None:
+        self._snapshot = snapshot
+
+    def __getitem__(self, key: str) -> list[int]:
+        positions = self._snapshot.lookup(key)
+        if positions is None:
+            raise KeyError(key)
+        return positions
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._snapshot.lookup(key) is not None
+
+    def __len__(self) -> int:
+        return self._snapshot.key_count
+
+    def __iter__(self) -> Iterator[str]:
+        for pos in range(self._snapshot.key_count):
+            yield self._snapshot.key(pos)
+
+
+class MappedDatabase:
+    """Read-only view over a snapshot file.
+
+    Implements the ``ServingDb`` protocol directly against the mapping and
+    also exposes ``routes``/``street_index`` as lazy views decoded on access.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as f:
+            self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            json_off,
+            json_len,
+            self._str_count,
+            self._str_offsets_off,
+            self._str_data_off,
+            self.route_count,
+            self._routes_off,
+            _constraint_count,
+            self._constraints_off,
+            self.key_count,
+            self._keys_off,
+            self._index_list_off,
+        ) = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a DB snapshot: {path}")
+        header = json.loads(self._buf[json_off : json_off + json_len])
+        self.schema_version: int = header["schema_version"]
+        self.meta = MetaInfo.model_validate(header["meta"])
+        self.calendar_policy = CalendarPolicy.model_validate(header["calendar_policy"])
+        self.holiday_policy = HolidayPolicy.model_validate(header["holiday_policy"])
+        self.compiled_holidays = compile_holiday_policy(self.holiday_policy)
+        self.aliases: dict[str, str] = header["aliases"]
+        self.routes = _MappedRoutes(self)
+        self.street_index = _MappedStreetIndex(self)
+        self._street_names: tuple[str, ...] | None = None
+
+    def string(self, string_id: int) -> str | None:
+        if string_id == _NONE:
+            return None
+        start, end = struct.unpack_from("<2I", self._buf, self._str_offsets_off + 4 * string_id)
+        base = self._str_data_off
+        return self._buf[base + start : base + end].decode("utf-8")
+
+    def key(self, pos: int) -> str:
+        key_id, _, _ = _KEY.unpack_from(self._buf, self._keys_off + pos * _KEY.size)
+        return self.string(key_id) or ""
+
+    def lookup(self, street_normalized: str) -> list[int] | None:
+        lo, hi = 0, self.key_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key_id, start, count = _KEY.unpack_from(self._buf, self._keys_off + mid * _KEY.size)
+            key = self.string(key_id) or ""
+            if key == street_normalized:
+                return list(
+                    struct.unpack_from(f"<{count}I", self._buf, self._index_list_off + 4 * start)
+                )
+            if key < street_normalized:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def _constraints(self, start: int, count: int) -> list[tuple[Any, ...]]:
+        constraints = []
+        for pos in range(start, start + count):
+            parity, range_min, range_max = _CONSTRAINT.unpack_from(
+                self._buf, self._constraints_off + pos * _CONSTRAINT.size
+            )
+            constraints.append(
+                (
+                    _PARITY_NAMES[parity],
+                    None if range_min < 0 else range_min,
+                    None if range_max < 0 else range_max,
+                )
+            )
+        return constraints
+
+    def _route_fields(self, idx: int) -> dict[str, Any]:
+        (
+            street_id,
+            normalized_id,
+            weekday_id,
+            color_id,
+            notes_id,
+            flags,
+            c_start,
+            c_count,
+        ) = _ROUTE.unpack_from(self._buf, self._routes_off + idx * _ROUTE.size)
+        return {
+            "street": self.string(street_id) or "",
+            "street_normalized": self.string(normalized_id) or "",
+            "weekday": self.string(weekday_id),
+            "recycling_color": self.string(color_id),
+            "no_collection": bool(flags & _FLAG_NO_COLLECTION),
+            "constraints": self._constraints(c_start, c_count),
+            "notes": self.string(notes_id),
+        }
+
+    def route(self, idx: int) -> RouteEntry:
+        fields = self._route_fields(idx)
+        fields["constraints"] = [
+            RouteConstraint(parity=parity, range_min=range_min, range_max=range_max)
+            for parity, range_min, range_max in fields["constraints"]
+        ]
+        return RouteEntry(**fields)
+
+    def candidates(self, street_normalized: str) -> list[RuntimeRoute]:
+        routes = []
+        for idx in self.lookup(street_normalized) or []:
+            fields = self._route_fields(idx)
+            fields["constraints"] = tuple(
+                RuntimeConstraint(*constraint) for constraint in fields["constraints"]
+            )
+            routes.append(RuntimeRoute(**fields))
+        return routes
+
+    def street_names(self) -> tuple[str, ...]:
+        if self._street_names is None:
+            names = set()
+            for idx in range(self.route_count):
+                street_id = _U32.unpack_from(self._buf, self._routes_off + idx * _ROUTE.size)[0]
+                names.add(self.string(street_id) or "")
+            self._street_names = tuple(sorted(names))
+        return self._street_names
+
+    def recycling_colors(self) -> tuple[str, ...]:
+        """Distinct recycling colors of the routes, as stored."""
+        color_ids = {
+            _U32.unpack_from(
+                self._buf, self._routes_off + idx * _ROUTE.size + _ROUTE_COLOR_OFFSET
+            )[0]
+            for idx in range(self.route_count)
+        }
+        return tuple(sorted(filter(None, (self.string(color_id) for color_id in color_ids))))
+
+    def street_count(self) -> int:
+        return self.key_count
+
+    def to_database(self) -> Database:
+        return Database(
+            schema_version=self.schema_version,
+            meta=self.meta,
+            calendar_policy=self.calendar_policy,
+            holiday_policy=self.holiday_policy,
+            aliases=dict(self.aliases),
+            routes=list(self.routes),
+            street_index={key: self.street_index[key] for key in self.street_index},
+        )
+
+
+def open_snapshot(path: Path) -> MappedDatabase:
+    if not path.exists():
+        raise FileNotFoundError(f"DB snapshot not found: {path}")
+    return MappedDatabase(path)
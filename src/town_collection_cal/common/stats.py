@@ -0,0 +1,71 @@
+"""Per-stage wall time, CPU time and peak RSS for updater builds.
+
+``build_db`` activates a ``StageRecorder`` for the duration of a build; code
+deeper in the stack (e.g. PDF text extraction) adds to it through
+``add_stage_time`` without having the recorder passed down explicitly.
+"""
+from __future__ import annotations
+
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from town_collection_cal.common.db_model import StageStats
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+_current: ContextVar[StageRecorder | None] = ContextVar("stage_recorder", default=None)
+
+
+def peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+class StageRecorder:
+    def __init__(self) -> None:
+        self.stages: dict[str, StageStats] = {}
+
+    def add(self, name: str, wall_seconds: float, cpu_seconds: float) -> None:
+        """Record (or accumulate into) stage ``name``."""
+        previous = self.stages.get(name)
+        if previous is not None:
+            wall_seconds += previous.wall_seconds
+            cpu_seconds += previous.cpu_seconds
+        self.stages[name] = StageStats(
+            wall_seconds=round(wall_seconds, 4),
+            cpu_seconds=round(cpu_seconds, 4),
+            peak_rss_mb=peak_rss_mb(),
+        )
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - wall, time.process_time() - cpu)
+
+    @contextmanager
+    def activate(self) -> Iterator[StageRecorder]:
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+
+def add_stage_time(name: str, wall_seconds: float, cpu_seconds: float) -> None:
+    """Add to stage ``name`` of the active recorder, if any."""
+    recorder = _current.get()
+    if recorder is not None:
+        recorder.add(name, wall_seconds, cpu_seconds)
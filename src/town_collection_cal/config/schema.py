@@ -18,6 +18,18 @@ class HolidayPolicyMode(StrEnum):
     PARSER_EXTRACTED = "parser_extracted"
 
 
+class TextBackend(StrEnum):
+    # See common.pdf_text.TEXT_BACKENDS.
+    PDFPLUMBER = "pdfplumber"
+    PYPDFIUM2 = "pypdfium2"
+
+
+class ReloadMode(StrEnum):
+    # inotify on the DB directory where available, else stat() polling
+    AUTO = "auto"
+    POLL = "poll"
+
+
 class SourcesConfig(BaseModel):
     routes_pdf_url: HttpUrl
     schedule_pdf_url: HttpUrl
@@ -26,6 +38,8 @@ class SourcesConfig(BaseModel):
 class ParsersConfig(BaseModel):
     routes_parser: str
     schedule_parser: str
+    # PDF text extraction backend used by both parsers.
+    text_backend: TextBackend = TextBackend.PDFPLUMBER
 
 
 class IcsConfig(BaseModel):
@@ -69,6 +83,16 @@ class HolidayRulesConfig(BaseModel):
     no_collection_dates: list[date] = Field(default_factory=list)
     shift_holidays: list[date] = Field(default_factory=list)
     shift_by_one_day: bool = True
+    shift_days: int = Field(default=1, ge=1)
+    shift_days_by_date: dict[date, int] = Field(default_factory=dict)
+    cascade_within_week: bool = False
+
+    @field_validator("shift_days_by_date")
+    @classmethod
+    def _positive_shift_days(cls, v: dict[date, int]) -> dict[date, int]:
+        if any(days < 1 for days in v.values()):
+            raise ValueError("shift_days_by_date values must be >= 1")
+        return v
 
 
 class RulesConfig(BaseModel):
@@ -111,6 +135,8 @@ class ResolverConfig(BaseModel):
 class ServiceConfig(BaseModel):
     auto_update_on_missing_db: bool = False
     reload_interval_seconds: int = 10
+    reload_mode: ReloadMode = ReloadMode.AUTO
+    warm_up_on_start: bool = True
 
     @field_validator("reload_interval_seconds")
     @classmethod
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -10,27 +12,39 @@ from flask import Flask, Response, jsonify, request
 
 from town_collection_cal import __version__ as service_version
 from town_collection_cal.common.address import parse_address
-from town_collection_cal.common.db_model import Database
 from town_collection_cal.common.ics import IcsEvent, build_ics
+from town_collection_cal.common.runtime import ServingDb
 from town_collection_cal.config.loader import load_from_env
-from town_collection_cal.service.db import DbLoader
+from town_collection_cal.service.db import DbLoader, install_reload_signal
 from town_collection_cal.service.resolver import resolve_route
-from town_collection_cal.service.schedule import generate_schedule, local_today
-from town_collection_cal.updater.build_db import build_db
+from town_collection_cal.service.schedule import (
+    WEEKDAY_TO_OFFSET,
+    generate_schedule,
+    local_today,
+)
 
 logger = logging.getLogger(__name__)
 
+WARM_UP_RETRY_INITIAL_SECONDS = 1.0
+WARM_UP_RETRY_MAX_SECONDS = 60.0
+BYPASS_COLORS = ("BLUE", "GREEN")
+
 
 def create_app() -> Flask:
     logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
     config, town_dir, config_path = load_from_env()
     logger.info("Loaded config: %s (town_id=%s)", config_path, config.town_id)
 
-    db_path = Path(os.getenv("DB_PATH") or f"data/generated/{config.town_id}.json").resolve()
+    # absolute(), not resolve(): a versioned DB_PATH is a symlink the loader
+    # must keep following as the updater swaps it.
+    db_path = Path(os.getenv("DB_PATH") or f"data/generated/{config.town_id}.json").absolute()
     logger.info("Using DB path: %s", db_path)
     if not db_path.exists() or not db_path.is_file():
         if config.service.auto_update_on_missing_db:
             logger.info("DB missing; attempting auto-update")
+            # Imported lazily: the updater pulls in requests, pdf parsing and overrides.
+            from town_collection_cal.updater.build_db import build_db
+
             build_db(
                 town_config_path=town_dir / "town.yaml",
                 out_path=db_path,
@@ -43,12 +57,18 @@ def create_app() -> Flask:
                 f"DB file missing: {db_path} (run updater or set DB_PATH)"
             )
 
-    db_loader = DbLoader(db_path, config.service.reload_interval_seconds)
+    db_loader = DbLoader(
+        db_path, config.service.reload_interval_seconds, reload_mode=config.service.reload_mode
+    )
+    if install_reload_signal(db_loader):
+        logger.info("SIGHUP reloads the DB")
 
     app = Flask(__name__)
     app.config["TOWN_CONFIG"] = config
     app.config["DB_LOADER"] = db_loader
     app.config["CORS_ALLOWED_ORIGINS"] = _cors_allowed_origins_from_env()
+    app.config["READY_EVENT"] = threading.Event()
+    app.config["WARM_UP_STATUS"] = {}
     logger.info("CORS allowed origins: %s", sorted(app.config["CORS_ALLOWED_ORIGINS"]))
 
     @app.after_request
@@ -77,6 +97,11 @@ def create_app() -> Flask:
     def healthz() -> Any:
         return jsonify({"ok": True})
 
+    @app.get("/readyz")
+    def readyz() -> Any:
+        status = {"ready": app.config["READY_EVENT"].is_set(), **app.config["WARM_UP_STATUS"]}
+        return jsonify(status), 200 if status["ready"] else 503
+
     @app.get("/version")
     def version() -> Any:
         db = db_loader.get_db()
@@ -85,6 +110,7 @@ def create_app() -> Flask:
                 "service_version": service_version,
                 "schema_version": db.schema_version,
                 "meta": db.meta.model_dump(),
+                "reload": db_loader.status(),
             }
         )
 
@@ -93,8 +119,8 @@ def create_app() -> Flask:
         db = db_loader.get_db()
         full = request.args.get("full", "").lower() in {"1", "true", "yes"}
         if full:
-            return jsonify(sorted({r.street for r in db.routes}))
-        return jsonify({"count": len({r.street_normalized for r in db.routes})})
+            return jsonify(list(db.street_names()))
+        return jsonify({"count": db.street_count()})
 
     @app.get("/debug")
     def debug() -> Any:
@@ -131,10 +157,75 @@ def create_app() -> Flask:
         ics_text = build_ics(calendar_name, events, prodid)
         return app.response_class(ics_text, mimetype="text/calendar")
 
+    if config.service.warm_up_on_start:
+        threading.Thread(target=_warm_up, args=(app,), name="warm-up", daemon=True).start()
+    else:
+        app.config["READY_EVENT"].set()
+
     return app
 
 
-def _resolve_request(db: Database) -> dict[str, Any]:
+def _warm_up(app: Flask) -> None:
+    """Pay first-request costs before /readyz reports ready.
+
+    Failures (e.g. a DB the reloader has not picked up yet) are retried with
+    exponential backoff, so a recoverable error never leaves the worker unready.
+    """
+    status = app.config["WARM_UP_STATUS"]
+    started = time.monotonic()
+    delay = WARM_UP_RETRY_INITIAL_SECONDS
+    attempts = 0
+    while True:
+        attempts += 1
+        status["attempts"] = attempts
+        try:
+            feeds = _warm_up_once(app)
+            break
+        except Exception as exc:
+            logger.exception("Warm-up attempt %s failed; retrying in %.0fs", attempts, delay)
+            status["error"] = str(exc)
+        time.sleep(delay)
+        delay = min(delay * 2, WARM_UP_RETRY_MAX_SECONDS)
+    status.pop("error", None)
+    status["feeds_rendered"] = feeds
+    status["warm_up_seconds"] = round(time.monotonic() - started, 3)
+    app.config["READY_EVENT"].set()
+    logger.info("Warm-up complete in %.2fs (%s feeds)", status["warm_up_seconds"], feeds)
+
+
+def _warm_up_once(app: Flask) -> int:
+    """Load the DB (and its runtime indexes), import the address parser, build
+    the fuzzy-match path and render the bypass feed of every weekday and each
+    recycling color the DB's routes use.
+
+    Returns the number of feeds rendered.
+    """
+    config = app.config["TOWN_CONFIG"]
+    db = app.config["DB_LOADER"].get_db()
+    parse_address("1 Main Street, Springfield, MA 01101")
+    resolve_route(
+        db,
+        "warm up",
+        None,
+        suggestion_limit=config.resolver.suggestion_limit,
+        fuzzy_threshold=config.resolver.fuzzy_threshold,
+    )
+    # Render the colors this town's routes use; bypass feeds need one even
+    # when the town has no recycling colors.
+    used = {color.upper() for color in db.recycling_colors()}
+    colors = [color for color in BYPASS_COLORS if color in used] or [BYPASS_COLORS[0]]
+    client = app.test_client()
+    feeds = 0
+    for weekday in WEEKDAY_TO_OFFSET:
+        for color in colors:
+            response = client.get(f"/town.ics?weekday={weekday.title()}&color={color}")
+            if response.status_code != 200:
+                raise RuntimeError(f"warm-up feed {weekday}/{color}: {response.status_code}")
+            feeds += 1
+    return feeds
+
+
+def _resolve_request(db: ServingDb) -> dict[str, Any]:
     config = _get_config()
     try:
         days = _parse_days(config)
@@ -180,7 +271,7 @@ def _resolve_request(db: Database) -> dict[str, Any]:
     }
 
 
-def _resolve_input(db: Database) -> dict[str, Any]:
+def _resolve_input(db: ServingDb) -> dict[str, Any]:
     config = _get_config()
     mode_b = bool(request.args.get("weekday")) or bool(request.args.get("color"))
 
@@ -191,7 +282,7 @@ def _resolve_input(db: Database) -> dict[str, Any]:
             return {"error": "weekday and color are required for bypass mode"}
         if weekday.lower() not in {"monday", "tuesday", "wednesday", "thursday", "friday"}:
             return {"error": "weekday must be Monday-Friday"}
-        if color not in {"BLUE", "GREEN"}:
+        if color not in BYPASS_COLORS:
             return {"error": "color must be BLUE or GREEN"}
         return {
             "mode": "bypass",
@@ -233,12 +324,12 @@ def _resolve_input(db: Database) -> dict[str, Any]:
         "mode": "address",
         "street": street,
         "number": number_int,
-        "route": resolved.route.model_dump(),
+        "route": resolved.route.to_dict(),
     }
 
 
 def _build_schedule(
-    db: Database,
+    db: ServingDb,
     days: int,
     weekday: str | None,
     color: str | None,
@@ -253,7 +344,7 @@ def _build_schedule(
         trash_weekday=weekday,
         recycling_color=color if "recycling" in types else None,
         calendar_policy=db.calendar_policy,
-        holiday_policy=db.holiday_policy,
+        holiday_policy=db.compiled_holidays,
     )
     normalized = []
     for event in schedule:
@@ -270,7 +361,7 @@ def _build_schedule(
 
 
 def _events_to_ics(
-    db: Database, events: list[dict[str, Any]], town_name: str
+    db: ServingDb, events: list[dict[str, Any]], town_name: str
 ) -> list[IcsEvent]:
     ics_events: list[IcsEvent] = []
     for event in events:
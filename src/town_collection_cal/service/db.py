@@ -1,49 +1,151 @@
 from __future__ import annotations
 
-import json
+import logging
+import signal
+import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-from pydantic import ValidationError
-
+from town_collection_cal.common.db_file import load_db
 from town_collection_cal.common.db_model import Database
+from town_collection_cal.common.runtime import RuntimeDb, ServingDb
+
+if TYPE_CHECKING:
+    from town_collection_cal.service.watch import DirectoryWatch
+
+logger = logging.getLogger(__name__)
 
+# While inotify is watching, stat() still runs at least this rarely: the watch
+# misses some replacements, e.g. a symlinked DB directory being repointed.
+WATCH_BACKSTOP_SECONDS = 60.0
 
-def load_db(path: Path) -> Database:
-    if not path.exists():
-        raise FileNotFoundError(f"DB file not found: {path}")
-    data = json.loads(path.read_text(encoding="utf-8"))
-    try:
-        return Database.model_validate(data)
-    except ValidationError as exc:
-        raise ValueError(f"Invalid DB format: {exc}") from exc
+
+def _file_identity(path: Path) -> tuple[int, int, int]:
+    # An atomic replace always changes the inode, even within one mtime tick.
+    st = path.stat()
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
 
 
 @dataclass
 class DbLoader:
+    """Serves the current DB and reloads it when the file is replaced.
+
+    ``reload_mode="auto"`` watches the DB directory with inotify and marks the
+    DB stale on the publishing rename, with a slow ``stat()`` poll as a backstop;
+    without inotify (or once the watch is lost) it polls ``stat()`` every
+    ``reload_interval_seconds``. Either way the
+    reload itself happens on the next ``get_db`` call. ``request_reload`` (the
+    SIGHUP handler) forces one.
+    """
+
     path: Path
     reload_interval_seconds: int
-    _cached: Database | None = None
-    _cached_mtime: float | None = None
+    reload_mode: str = "poll"
+    generation: int = 0
+    last_reload_at: datetime | None = None
+    last_reload_reason: str | None = None
+    loaded_file: str | None = None
+    _cached: ServingDb | None = None
+    _identity: tuple[int, int, int] | None = None
     _last_check: float = 0.0
+    _pending_reason: str | None = None
+    _watch: DirectoryWatch | None = None
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def get_db(self) -> ServingDb:
+        if self._cached is None or self._stale():
+            with self._lock:
+                if self._cached is None:
+                    self._reload("initial")
+                    self._start_watch()
+                else:
+                    reason, self._pending_reason = self._pending_reason, None
+                    # A forced reload always runs; events and polls only on a new file
+                    # (and only once when several threads noticed it).
+                    if reason == "sighup" or _file_identity(self.path) != self._identity:
+                        self._reload(reason or "poll")
+        return self._cached  # type: ignore[return-value]
 
-    def get_db(self) -> Database:
+    def _stale(self) -> bool:
+        if self._pending_reason is not None:
+            return True
+        interval = float(self.reload_interval_seconds)
+        if self.watching:
+            interval = max(interval, WATCH_BACKSTOP_SECONDS)
         now = time.monotonic()
-        if self._cached is None:
-            self._reload()
-            return self._cached  # type: ignore[return-value]
+        if now - self._last_check < interval:
+            return False
+        self._last_check = now
+        return _file_identity(self.path) != self._identity
 
-        if now - self._last_check >= self.reload_interval_seconds:
-            self._last_check = now
-            mtime = self.path.stat().st_mtime
-            if self._cached_mtime is None or mtime > self._cached_mtime:
-                self._reload()
+    @property
+    def watching(self) -> bool:
+        return self._watch is not None and self._watch.active
 
-        return self._cached  # type: ignore[return-value]
+    def request_reload(self, reason: str = "sighup") -> None:
+        """Reload on the next ``get_db``; safe to call from a signal handler."""
+        self._pending_reason = reason
 
-    def _reload(self) -> None:
-        db = load_db(self.path)
-        self._cached = db
-        self._cached_mtime = self.path.stat().st_mtime
+    def status(self) -> dict[str, Any]:
+        return {
+            "mode": "inotify" if self.watching else "poll",
+            "generation": self.generation,
+            "last_reload_at": self.last_reload_at.isoformat() if self.last_reload_at else None,
+            "last_reload_reason": self.last_reload_reason,
+            "loaded_file": self.loaded_file,
+        }
+
+    def close(self) -> None:
+        if self._watch is not None:
+            self._watch.close()
+            self._watch = None
+
+    def _start_watch(self) -> None:
+        if self.reload_mode != "auto":
+            return
+        # Imported lazily: ctypes is only needed when watching.
+        from town_collection_cal.service.watch import start_watch
+
+        self._watch = start_watch(self.path, self._on_watch_event)
+        if self._watch is not None:
+            logger.info("Watching %s for DB changes (inotify)", self._watch.directory)
+
+    def _on_watch_event(self, reason: str) -> None:
+        if reason == "watch_lost":
+            # Polling takes over; check on the next request.
+            self._last_check = 0.0
+            return
+        self.request_reload(reason)
+
+    def _reload(self, reason: str) -> None:
+        # Stat before loading: a replace racing the load then costs one extra
+        # reload instead of leaving the newer file unnoticed.
+        # Resolve a versioned pointer once so identity and content match.
+        target = self.path.resolve()
+        identity = _file_identity(target)
+        db = load_db(target)
+        # Keep only the compact runtime view; the pydantic graph is dropped.
+        self._cached = RuntimeDb.from_database(db) if isinstance(db, Database) else db
+        self._identity = identity
         self._last_check = time.monotonic()
+        self.loaded_file = target.name
+        self.generation += 1
+        self.last_reload_at = datetime.now(UTC)
+        self.last_reload_reason = reason
+        if self.generation > 1:
+            logger.info("Reloaded DB %s (%s, generation %d)", self.path, reason, self.generation)
+
+
+def install_reload_signal(loader: DbLoader) -> bool:
+    """Reload ``loader`` on SIGHUP. Only possible from the main thread.
+
+    Under gunicorn each worker installs its own handler, so
+    ``pkill -HUP -P <master pid>`` reloads every worker in place.
+    """
+    if not hasattr(signal, "SIGHUP") or threading.current_thread() is not threading.main_thread():
+        return False
+    signal.signal(signal.SIGHUP, lambda signum, frame: loader.request_reload("sighup"))
+    return True
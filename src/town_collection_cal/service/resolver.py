@@ -1,22 +1,22 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 
-from rapidfuzz import process
-
-from town_collection_cal.common.db_model import Database, RouteEntry
+from town_collection_cal.common.db_model import Database
 from town_collection_cal.common.normalize import normalize_street_name
+from town_collection_cal.common.runtime import RuntimeDb, RuntimeRoute, ServingDb
 
 
 @dataclass
 class ResolutionResult:
-    route: RouteEntry | None
+    route: RuntimeRoute | None
     suggestions: list[str]
     requires_number: bool
     error: str | None = None
 
 
-def _matches_constraints(route: RouteEntry, number: int | None) -> bool:
+def _matches_constraints(route: RuntimeRoute, number: int | None) -> bool:
     if not route.constraints:
         return True
     if number is None:
@@ -35,10 +35,13 @@ def _matches_constraints(route: RouteEntry, number: int | None) -> bool:
 
 
 def _collect_suggestions(
-    query: str, streets: list[str], limit: int, score_cutoff: int
+    query: str, streets: Sequence[str], limit: int, score_cutoff: int
 ) -> list[str]:
     if not query:
         return []
+    # Imported lazily so the service starts without loading rapidfuzz.
+    from rapidfuzz import process
+
     results = process.extract(
         query,
         streets,
@@ -49,7 +52,7 @@ def _collect_suggestions(
 
 
 def resolve_route(
-    db: Database,
+    db: Database | ServingDb,
     street: str,
     number: int | None,
     *,
@@ -65,17 +68,15 @@ def resolve_route(
             error="Invalid street",
         )
 
+    if isinstance(db, Database):
+        db = RuntimeDb.from_database(db)
     canonical = db.aliases.get(normalized, normalized)
-    indexes = None
-    if db.street_index and canonical in db.street_index:
-        indexes = db.street_index[canonical]
-        candidates = [db.routes[idx] for idx in indexes]
-    else:
-        candidates = [r for r in db.routes if r.street_normalized == canonical]
+    candidates = db.candidates(canonical)
 
     if not candidates:
-        streets = sorted({r.street for r in db.routes})
-        suggestions = _collect_suggestions(street, streets, suggestion_limit, fuzzy_threshold)
+        suggestions = _collect_suggestions(
+            street, db.street_names(), suggestion_limit, fuzzy_threshold
+        )
         return ResolutionResult(
             route=None,
             suggestions=suggestions,
@@ -5,6 +5,7 @@ from datetime import date, datetime, timedelta
 from zoneinfo import ZoneInfo
 
 from town_collection_cal.common.db_model import CalendarPolicy, HolidayPolicy
+from town_collection_cal.common.holidays import CompiledHolidayPolicy, compile_holiday_policy
 
 WEEKDAY_TO_OFFSET = {
     "monday": 1,
@@ -45,7 +46,7 @@ def generate_schedule(
     trash_weekday: str,
     recycling_color: str | None,
     calendar_policy: CalendarPolicy,
-    holiday_policy: HolidayPolicy,
+    holiday_policy: HolidayPolicy | CompiledHolidayPolicy,
 ) -> list[ScheduleEvent]:
     end_date = start_date + timedelta(days=days)
     events: dict[date, set[str]] = {}
@@ -53,27 +54,18 @@ def generate_schedule(
     trash_offset = WEEKDAY_TO_OFFSET[trash_weekday.lower()]
     anchor_sunday = calendar_policy.anchor_week_sunday
     anchor_color = calendar_policy.anchor_color
-
-    shift_by_week: dict[date, list[date]] = {}
-    if holiday_policy.shift_by_one_day:
-        for holiday in holiday_policy.shift_holidays:
-            week = _week_sunday(holiday)
-            shift_by_week.setdefault(week, []).append(holiday)
+    holidays = (
+        holiday_policy
+        if isinstance(holiday_policy, CompiledHolidayPolicy)
+        else compile_holiday_policy(holiday_policy)
+    )
 
     week_start = _week_sunday(start_date)
     current = week_start
 
     while current <= end_date:
         base_trash_date = current + timedelta(days=trash_offset)
-        holiday_cutoff = None
-        if holiday_policy.shift_by_one_day:
-            dates = shift_by_week.get(current)
-            if dates:
-                holiday_cutoff = min(dates)
-
-        trash_date = _apply_holiday_shift(
-            base_trash_date, holiday_cutoff, holiday_policy.no_collection_dates
-        )
+        trash_date = holidays.adjust(base_trash_date)
         if trash_date and start_date <= trash_date <= end_date:
             events.setdefault(trash_date, set()).add("trash")
 
@@ -82,25 +74,10 @@ def generate_schedule(
                 raise ValueError("Missing recycling anchor data")
             week_color = _week_color(anchor_sunday, anchor_color, current)
             if week_color == recycling_color.upper():
-                base_recycling_date = current + timedelta(days=trash_offset)
-                recycling_date = _apply_holiday_shift(
-                    base_recycling_date, holiday_cutoff, holiday_policy.no_collection_dates
-                )
+                recycling_date = trash_date
                 if recycling_date and start_date <= recycling_date <= end_date:
                     events.setdefault(recycling_date, set()).add("recycling")
 
         current += timedelta(days=7)
 
     return [ScheduleEvent(date=d, types=types) for d, types in sorted(events.items())]
-
-
-def _apply_holiday_shift(
-    base_date: date, holiday_cutoff: date | None, no_collection_dates: list[date]
-) -> date | None:
-    if base_date in no_collection_dates:
-        return None
-    if not holiday_cutoff:
-        return base_date
-    if base_date < holiday_cutoff:
-        return base_date
-    return base_date + timedelta(days=1)
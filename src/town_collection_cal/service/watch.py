@@ -0,0 +1,121 @@
+"""inotify watch on the DB directory (Linux, via ctypes).
+
+Watching the directory rather than the file catches the atomic rename the
+updater uses to publish a DB: the new file arrives as ``IN_MOVED_TO`` under
+the DB's name. Where inotify is unavailable :func:`start_watch` returns None
+and the caller keeps polling.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_CLOEXEC = 0o2000000
+IN_NONBLOCK = 0o4000
+
+_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+_EVENT_HEADER = struct.Struct("iIII")
+_POLL_SECONDS = 1.0
+
+
+class DirectoryWatch:
+    """Calls ``on_change(reason)`` when ``name`` in ``directory`` is replaced.
+
+    Runs a daemon thread reading the inotify fd. If the directory itself goes
+    away the watch stops and ``on_change("watch_lost")`` lets the owner fall
+    back to polling.
+    """
+
+    def __init__(
+        self, fd: int, directory: Path, name: str, on_change: Callable[[str], None]
+    ) -> None:
+        self._fd = fd
+        self.directory = directory
+        self._name = os.fsencode(name)
+        self._on_change = on_change
+        self._stop = threading.Event()
+        self.active = True
+        self._thread = threading.Thread(target=self._run, name="db-watch", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=_POLL_SECONDS * 2)
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                ready, _, _ = select.select([self._fd], [], [], _POLL_SECONDS)
+                if not ready:
+                    continue
+                try:
+                    data = os.read(self._fd, 64 * 1024)
+                except BlockingIOError:
+                    continue
+                if not self._dispatch(data):
+                    break
+        finally:
+            self.active = False
+            os.close(self._fd)
+
+    def _dispatch(self, data: bytes) -> bool:
+        """Handle a batch of events; False once the watch is gone."""
+        changed = False
+        offset = 0
+        while offset < len(data):
+            _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                logger.warning("DB directory %s went away; falling back to polling", self.directory)
+                self._on_change("watch_lost")
+                return False
+            if mask & IN_Q_OVERFLOW or name == self._name:
+                changed = True
+        if changed:
+            self._on_change("inotify")
+        return True
+
+
+def start_watch(path: Path, on_change: Callable[[str], None]) -> DirectoryWatch | None:
+    """Watch ``path.parent`` for replacements of ``path``; None if unsupported."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(IN_CLOEXEC | IN_NONBLOCK)
+    except (OSError, AttributeError) as exc:
+        logger.warning("inotify unavailable (%s); polling DB for changes", exc)
+        return None
+    if fd < 0:
+        logger.warning("inotify_init1 failed: %s", os.strerror(ctypes.get_errno()))
+        return None
+    wd = libc.inotify_add_watch(fd, os.fsencode(path.parent), _WATCH_MASK)
+    if wd < 0:
+        logger.warning(
+            "inotify watch on %s failed (%s); polling DB for changes",
+            path.parent,
+            os.strerror(ctypes.get_errno()),
+        )
+        os.close(fd)
+        return None
+    return DirectoryWatch(fd, path.parent, path.name, on_change)
@@ -1,45 +1,50 @@
 from __future__ import annotations
 
 import argparse
+from collections.abc import Callable
 
+from town_collection_cal.common.blob_cache import main as cache_main
+from town_collection_cal.updater.build_all import main as build_all_main
 from town_collection_cal.updater.build_db import main as build_db_main
-
-
-def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+from town_collection_cal.updater.coverage import main as check_coverage_main
+from town_collection_cal.updater.diff_db import main as diff_db_main
+from town_collection_cal.updater.parsers.registry import main as list_parsers_main
+from town_collection_cal.updater.synth_town import main as synth_town_main
+from town_collection_cal.updater.versions import main as rollback_main
+
+# Each subcommand's options are declared once, by the module's own parser;
+# everything after the command name is handed to its main() unchanged.
+COMMANDS: dict[str, tuple[Callable[[list[str]], int], str]] = {
+    "build-db": (build_db_main, "Build town DB from sources"),
+    "diff-db": (diff_db_main, "Semantic diff of two DBs (exit 1 if differ)"),
+    "check-coverage": (
+        check_coverage_main,
+        "Report overlapping, gapped and unreachable routes (exit 1 on conflicts)",
+    ),
+    "build-all": (build_all_main, "Build DBs for every towns/*/town.yaml concurrently"),
+    "list-parsers": (list_parsers_main, "List registered parsers"),
+    "rollback": (rollback_main, "List or roll back versioned DBs (see build-db --keep-versions)"),
+    "cache": (cache_main, "List or trim the source cache"),
+    "synth-town": (
+        synth_town_main,
+        "Write a seeded synthetic town of any size for scale testing",
+    ),
+}
+
+
+def _parse_args(argv: list[str] | None = None) -> tuple[argparse.Namespace, list[str]]:
     parser = argparse.ArgumentParser(description="Town Collection updater")
     subparsers = parser.add_subparsers(dest="command", required=True)
-    build_db = subparsers.add_parser("build-db", help="Build town DB from sources")
-    build_db.add_argument("--town", required=True, help="Path to town.yaml")
-    build_db.add_argument("--out", required=True, help="Output DB JSON path")
-    build_db.add_argument("--cache-dir", default="data/cache", help="Cache directory")
-    build_db.add_argument("--force-refresh", action="store_true", help="Force re-download sources")
-    build_db.add_argument("--validate-only", action="store_true", help="Validate only, no output")
-    build_db.add_argument(
-        "--log-level",
-        default="INFO",
-        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
-        help="Logging level",
-    )
-    return parser.parse_args(argv)
+    for name, (_, help_text) in COMMANDS.items():
+        # No -h of its own: "<command> --help" reaches the module's parser.
+        subparsers.add_parser(name, help=help_text, add_help=False)
+    return parser.parse_known_args(argv)
 
 
 def main(argv: list[str] | None = None) -> int:
-    args = _parse_args(argv)
-    if args.command == "build-db":
-        return build_db_main(
-            [
-                "--town",
-                args.town,
-                "--out",
-                args.out,
-                "--cache-dir",
-                args.cache_dir,
-            ]
-            + (["--force-refresh"] if args.force_refresh else [])
-            + (["--validate-only"] if args.validate_only else [])
-            + (["--log-level", args.log_level] if args.log_level else [])
-        )
-    return 1
+    args, rest = _parse_args(argv)
+    command_main, _ = COMMANDS[args.command]
+    return command_main(rest)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,247 @@
+"""Build every town under a towns directory concurrently.
+
+Source fetches run in a thread pool over one shared HTTP session (with a
+global per-host limit); parsing and DB writing run in a process pool. A
+failing town is recorded in the summary without stopping the others.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from town_collection_cal.common.blob_cache import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_MB,
+    BlobCache,
+    max_bytes_from_mb,
+)
+from town_collection_cal.common.http_cache import CacheResult, HostLimiter, create_session
+from town_collection_cal.config.loader import load_town_config
+from town_collection_cal.updater.build_db import build_from_sources, fetch_sources
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_FILENAME = "build_summary.json"
+
+
+@dataclass
+class TownOutcome:
+    town_config: str
+    town_id: str | None = None
+    out_path: str | None = None
+    # "built", "unchanged" or "failed"
+    status: str = "failed"
+    fetch_seconds: float = 0.0
+    build_seconds: float = 0.0
+    route_count: int | None = None
+    error: str | None = None
+    # Per-stage wall/CPU/peak RSS, as in meta.build_stats.
+    stages: dict[str, dict[str, float | None]] | None = None
+
+
+def discover_towns(towns_dir: Path) -> list[Path]:
+    return sorted(towns_dir.glob("*/town.yaml"))
+
+
+def _init_build_worker() -> None:
+    # Towns already run in parallel; don't fan out PDF extraction per town too.
+    os.environ.setdefault("PDF_EXTRACT_WORKERS", "1")
+
+
+def _build_town(
+    town_config_path: Path,
+    out_path: Path,
+    fetched: dict[str, CacheResult],
+    force_refresh: bool,
+    keep_versions: int,
+) -> TownOutcome:
+    start = time.perf_counter()
+    result = build_from_sources(
+        town_config_path,
+        out_path,
+        fetched,
+        force_refresh=force_refresh,
+        keep_versions=keep_versions,
+    )
+    return TownOutcome(
+        town_config=str(town_config_path),
+        town_id=result.town_id,
+        out_path=str(out_path),
+        status="built" if result.published else "unchanged",
+        build_seconds=round(time.perf_counter() - start, 3),
+        route_count=len(result.db.routes) if result.db is not None else None,
+        stages={name: stats.model_dump() for name, stats in result.stats.items()},
+    )
+
+
+def build_all(
+    towns_dir: Path,
+    out_dir: Path,
+    cache_dir: Path,
+    *,
+    out_suffix: str = ".json",
+    force_refresh: bool = False,
+    fetch_workers: int = 8,
+    parse_workers: int | None = None,
+    per_host_limit: int = 2,
+    keep_versions: int = 0,
+    cache_max_bytes: int | None = DEFAULT_MAX_BYTES,
+) -> list[TownOutcome]:
+    town_paths = discover_towns(towns_dir)
+    outcomes = [TownOutcome(town_config=str(path)) for path in town_paths]
+    if not town_paths:
+        logger.warning("No towns found under %s", towns_dir)
+        return outcomes
+
+    session = create_session(max(fetch_workers, per_host_limit))
+    limiter = HostLimiter(per_host_limit)
+    # One store for all towns, so documents they share are kept once.
+    cache = BlobCache(cache_dir.resolve(), max_bytes=cache_max_bytes)
+
+    def _fetch(outcome: TownOutcome) -> tuple[Path, dict[str, CacheResult]]:
+        config, _ = load_town_config(Path(outcome.town_config))
+        out_path = out_dir / f"{config.town_id}{out_suffix}"
+        outcome.town_id = config.town_id
+        outcome.out_path = str(out_path)
+        start = time.perf_counter()
+        try:
+            fetched = fetch_sources(
+                config,
+                cache,
+                force_refresh=force_refresh,
+                session=session,
+                limiter=limiter,
+            )
+        finally:
+            outcome.fetch_seconds = round(time.perf_counter() - start, 3)
+        return out_path, fetched
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with (
+        ThreadPoolExecutor(max_workers=fetch_workers) as fetch_pool,
+        ProcessPoolExecutor(
+            max_workers=parse_workers,
+            initializer=_init_build_worker,
+            # Workers start while fetch threads hold sockets and locks; forking
+            # from a threaded parent can copy those locks held forever.
+            mp_context=multiprocessing.get_context("forkserver"),
+        ) as build_pool,
+    ):
+        fetches = {fetch_pool.submit(_fetch, outcome): outcome for outcome in outcomes}
+        builds: dict[Future[TownOutcome], TownOutcome] = {}
+        # Start parsing each town as soon as its own sources are in.
+        for future in as_completed(fetches):
+            outcome = fetches[future]
+            try:
+                out_path, fetched = future.result()
+            except Exception as exc:
+                logger.error("Fetch failed for %s: %s", outcome.town_config, exc)
+                outcome.error = f"fetch: {exc}"
+                continue
+            build = build_pool.submit(
+                _build_town,
+                Path(outcome.town_config),
+                out_path,
+                fetched,
+                force_refresh,
+                keep_versions,
+            )
+            builds[build] = outcome
+        for build, outcome in builds.items():
+            try:
+                built = build.result()
+            except Exception as exc:
+                logger.error("Build failed for %s: %s", outcome.town_id, exc)
+                outcome.error = f"build: {exc}"
+                continue
+            outcome.status = built.status
+            outcome.build_seconds = built.build_seconds
+            outcome.route_count = built.route_count
+            outcome.stages = built.stages
+    session.close()
+    return outcomes
+
+
+def _print_summary(outcomes: list[TownOutcome]) -> None:
+    for outcome in outcomes:
+        line = (
+            f"{outcome.town_id or outcome.town_config}: {outcome.status} "
+            f"fetch={outcome.fetch_seconds:.2f}s build={outcome.build_seconds:.2f}s"
+        )
+        if outcome.route_count is not None:
+            line += f" routes={outcome.route_count}"
+        if outcome.error:
+            line += f" error={outcome.error}"
+        print(line)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Build DBs for every town")
+    parser.add_argument("--towns-dir", default="towns", help="Directory of <town>/town.yaml")
+    parser.add_argument("--out-dir", default="data/generated", help="Output directory")
+    parser.add_argument("--cache-dir", default="data/cache", help="Source cache shared by towns")
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_MAX_MB,
+        help="Evict least recently used sources past this cache size (0: no limit)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "json.gz", "json.zst", "snap"],
+        default="json",
+        help="DB format",
+    )
+    parser.add_argument("--force-refresh", action="store_true", help="Force re-download sources")
+    parser.add_argument("--fetch-workers", type=int, default=8, help="Concurrent town fetches")
+    parser.add_argument(
+        "--parse-workers", type=int, default=None, help="Parse processes (default: CPU count)"
+    )
+    parser.add_argument("--per-host-limit", type=int, default=2, help="Concurrent requests/host")
+    parser.add_argument(
+        "--keep-versions", type=int, default=0, help="Versioned publish, keeping N DBs per town"
+    )
+    parser.add_argument(
+        "--summary-json", default=None, help=f"Summary path (default: <out-dir>/{SUMMARY_FILENAME})"
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Logging level",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level, format="%(levelname)s %(message)s")
+
+    out_dir = Path(args.out_dir)
+    start = time.perf_counter()
+    outcomes = build_all(
+        Path(args.towns_dir),
+        out_dir,
+        Path(args.cache_dir),
+        out_suffix=f".{args.format}",
+        force_refresh=args.force_refresh,
+        fetch_workers=args.fetch_workers,
+        parse_workers=args.parse_workers,
+        per_host_limit=args.per_host_limit,
+        keep_versions=args.keep_versions,
+        cache_max_bytes=max_bytes_from_mb(args.cache_max_mb),
+    )
+    _print_summary(outcomes)
+
+    summary_path = Path(args.summary_json) if args.summary_json else out_dir / SUMMARY_FILENAME
+    summary_path.parent.mkdir(parents=True, exist_ok=True)
+    summary = {
+        "total_seconds": round(time.perf_counter() - start, 3),
+        "towns": [asdict(outcome) for outcome in outcomes],
+    }
+    summary_path.write_text(json.dumps(summary, indent=2) + "\n", encoding="utf-8")
+    return 1 if any(outcome.status == "failed" for outcome in outcomes) else 0
@@ -1,15 +1,25 @@
 from __future__ import annotations
 
 import argparse
+import json
 import logging
 import os
 import subprocess
-from collections.abc import Callable
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
-from importlib import import_module
 from pathlib import Path
 from typing import Any
+from urllib.parse import urlsplit
 
+import requests
+
+from town_collection_cal.common.blob_cache import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_MB,
+    BlobCache,
+    max_bytes_from_mb,
+)
+from town_collection_cal.common.db_file import load_db, write_db_file
 from town_collection_cal.common.db_model import (
     SCHEMA_VERSION,
     CalendarPolicy,
@@ -18,29 +28,64 @@ from town_collection_cal.common.db_model import (
     MetaInfo,
     RouteEntry,
     SourceMeta,
+    StageStats,
+)
+from town_collection_cal.common.http_cache import (
+    CacheResult,
+    FetchRequest,
+    HostLimiter,
+    fetch_all,
 )
-from town_collection_cal.common.http_cache import fetch_with_cache
 from town_collection_cal.common.normalize import normalize_street_name
+from town_collection_cal.common.pdf_text import use_text_backend
+from town_collection_cal.common.snapshot import SNAPSHOT_SUFFIX, MappedDatabase, write_snapshot
+from town_collection_cal.common.stats import StageRecorder
 from town_collection_cal.config.loader import load_town_config
+from town_collection_cal.config.schema import TownConfig
+from town_collection_cal.updater.coverage import CoverageReport, analyze_coverage, log_report
+from town_collection_cal.updater.diff_db import DbDiff, diff_databases, write_diff_sidecar
+from town_collection_cal.updater.fingerprint import compute_build_fingerprint, is_up_to_date
 from town_collection_cal.updater.overrides import (
     apply_alias_overrides,
     apply_holiday_overrides,
     apply_route_overrides,
 )
+from town_collection_cal.updater.parsers.registry import load_parser
 from town_collection_cal.updater.parsers.types import RoutesParseResult, ScheduleParseResult
+from town_collection_cal.updater.versions import publish_version
 
 logger = logging.getLogger(__name__)
 
+# Sources stored under their own suffix instead of ".pdf".
+TEXT_SOURCE_SUFFIXES = {".txt"}
+
+# Exit status of ``build-db --exit-code`` when the inputs are unchanged.
+EXIT_UNCHANGED = 3
+
 
-def _load_callable(path: str) -> Callable[..., Any]:
-    if ":" not in path:
-        raise ValueError(f"Parser must be in module:function format: {path}")
-    module_name, func_name = path.split(":", 1)
-    module = import_module(module_name)
-    func = getattr(module, func_name)
-    if not callable(func):
-        raise ValueError(f"Parser target is not callable: {path}")
-    return func
+@dataclass
+class BuildResult:
+    town_id: str
+    fingerprint: str
+    # None when the build was skipped because the fingerprint matched.
+    db: Database | None = None
+    # False when skipped, validate-only, or the content did not change.
+    published: bool = False
+    # None when there was no previous DB to compare against.
+    diff: DbDiff | None = None
+    stats: dict[str, StageStats] = field(default_factory=dict)
+    # Only computed by validate-only builds.
+    coverage: CoverageReport | None = None
+
+    @property
+    def skipped(self) -> bool:
+        return self.db is None
+
+
+def _source_suffix(url: str) -> str:
+    # Plain-text sources keep their suffix so extraction skips PDF libraries.
+    suffix = Path(urlsplit(url).path).suffix.lower()
+    return suffix if suffix in TEXT_SOURCE_SUFFIXES else ".pdf"
 
 
 def _git_commit() -> str | None:
@@ -98,6 +143,9 @@ def _coerce_holiday_policy(
         no_collection_dates=no_collection,
         shift_holidays=shift_holidays,
         shift_by_one_day=holidays.shift_by_one_day,
+        shift_days=holidays.shift_days,
+        shift_days_by_date=dict(holidays.shift_days_by_date),
+        cascade_within_week=holidays.cascade_within_week,
     )
 
 
@@ -107,6 +155,30 @@ def _resolve_override_path(town_dir: Path, value: str | None) -> Path | None:
     return (town_dir / value).resolve()
 
 
+def fetch_sources(
+    config: TownConfig,
+    cache: BlobCache,
+    *,
+    force_refresh: bool = False,
+    session: requests.Session | None = None,
+    limiter: HostLimiter | None = None,
+) -> dict[str, CacheResult]:
+    """Download (or revalidate) a town's routes and schedule sources."""
+    return fetch_all(
+        [
+            FetchRequest(name, url, _source_suffix(url))
+            for name, url in (
+                ("routes", str(config.sources.routes_pdf_url)),
+                ("schedule", str(config.sources.schedule_pdf_url)),
+            )
+        ],
+        cache,
+        force_refresh=force_refresh,
+        session=session,
+        limiter=limiter,
+    )
+
+
 def build_db(
     town_config_path: Path,
     out_path: Path,
@@ -114,36 +186,80 @@ def build_db(
     *,
     force_refresh: bool = False,
     validate_only: bool = False,
-) -> Database:
-    config, town_dir = load_town_config(town_config_path)
-
-    cache_dir = cache_dir.resolve()
-    cache_dir.mkdir(parents=True, exist_ok=True)
-
-    routes_cache = fetch_with_cache(
-        config.sources.routes_pdf_url,
-        cache_dir,
-        "routes.pdf",
-        force_refresh=force_refresh,
-    )
-    schedule_cache = fetch_with_cache(
-        config.sources.schedule_pdf_url,
-        cache_dir,
-        "schedule.pdf",
+    keep_versions: int = 0,
+    cache_max_bytes: int | None = DEFAULT_MAX_BYTES,
+    session: requests.Session | None = None,
+) -> BuildResult:
+    """Fetch, parse and write the DB for one town.
+
+    Parsing and writing are skipped when ``out_path`` already records the
+    same build fingerprint, unless ``force_refresh`` or ``validate_only``.
+    With ``keep_versions`` the DB is published as a versioned snapshot behind
+    an ``out_path`` pointer (see :mod:`town_collection_cal.updater.versions`).
+    Sources are kept in a :class:`BlobCache` under ``cache_dir``, trimmed to
+    ``cache_max_bytes`` (None: unbounded).
+    """
+    config, _ = load_town_config(town_config_path)
+    cache = BlobCache(cache_dir.resolve(), max_bytes=cache_max_bytes)
+    fetched = fetch_sources(config, cache, force_refresh=force_refresh, session=session)
+    return build_from_sources(
+        town_config_path,
+        out_path,
+        fetched,
         force_refresh=force_refresh,
+        validate_only=validate_only,
+        keep_versions=keep_versions,
     )
 
-    routes_parser = _load_callable(config.parsers.routes_parser)
-    schedule_parser = _load_callable(config.parsers.schedule_parser)
 
-    routes_result: RoutesParseResult = routes_parser(routes_cache.path, routes_cache.url)
-    schedule_result: ScheduleParseResult = schedule_parser(schedule_cache.path, schedule_cache.url)
+def build_from_sources(
+    town_config_path: Path,
+    out_path: Path,
+    fetched: dict[str, CacheResult],
+    *,
+    force_refresh: bool = False,
+    validate_only: bool = False,
+    keep_versions: int = 0,
+) -> BuildResult:
+    """Parse already-fetched sources and write the DB (the CPU-bound stage).
+
+    Wall time, CPU time and peak RSS per stage are returned in
+    ``BuildResult.stats`` and, except for the write itself, recorded in
+    ``meta.build_stats``.
+    """
+    recorder = StageRecorder()
+    for name, cache in fetched.items():
+        recorder.add(f"fetch.{name}", cache.elapsed_seconds, cache.cpu_seconds)
+    with recorder.activate():
+        result = _build_from_sources(
+            town_config_path,
+            out_path,
+            fetched,
+            recorder,
+            force_refresh=force_refresh,
+            validate_only=validate_only,
+            keep_versions=keep_versions,
+        )
+    result.stats = dict(recorder.stages)
+    return result
 
-    parser_errors = list(routes_result.errors) + list(schedule_result.errors)
-    if parser_errors:
-        msg = "Parsing errors:\n" + "\n".join(f"- {e}" for e in parser_errors)
-        logger.error(msg)
-        raise ValueError(msg)
+
+def _build_from_sources(
+    town_config_path: Path,
+    out_path: Path,
+    fetched: dict[str, CacheResult],
+    recorder: StageRecorder,
+    *,
+    force_refresh: bool,
+    validate_only: bool,
+    keep_versions: int,
+) -> BuildResult:
+    config, town_dir = load_town_config(town_config_path)
+    routes_cache = fetched["routes"]
+    schedule_cache = fetched["schedule"]
+
+    routes_parser = load_parser(config.parsers.routes_parser)
+    schedule_parser = load_parser(config.parsers.schedule_parser)
 
     alias_path = _resolve_override_path(
         town_dir, config.overrides_paths.street_aliases_yaml
@@ -155,11 +271,49 @@ def build_db(
         town_dir, config.overrides_paths.route_overrides_yaml
     )
 
-    aliases = apply_alias_overrides({}, alias_path)
-    holiday_policy = _coerce_holiday_policy(config.rules, schedule_result)
-    holiday_policy = apply_holiday_overrides(holiday_policy, holiday_path)
+    with recorder.stage("fingerprint"):
+        fingerprint = compute_build_fingerprint(
+            town_config_path=town_config_path,
+            source_sha256={name: result.sha256 for name, result in fetched.items()},
+            override_paths={
+                "street_aliases": alias_path,
+                "holiday_rules": holiday_path,
+                "route_overrides": route_overrides_path,
+            },
+            parsers={"routes": routes_parser, "schedule": schedule_parser},
+            text_backend=config.parsers.text_backend,
+        )
+        unchanged = (
+            not force_refresh and not validate_only and is_up_to_date(out_path, fingerprint)
+        )
+    if unchanged:
+        logger.info(
+            "DB unchanged (fingerprint %s); skipping build of %s", fingerprint[:12], out_path
+        )
+        return BuildResult(town_id=config.town_id, fingerprint=fingerprint)
+
+    # parse.* includes text extraction, which is also broken out as "extract".
+    with use_text_backend(config.parsers.text_backend):
+        with recorder.stage("parse.routes"):
+            routes_result: RoutesParseResult = routes_parser(
+                routes_cache.path, routes_cache.url
+            )
+        with recorder.stage("parse.schedule"):
+            schedule_result: ScheduleParseResult = schedule_parser(
+                schedule_cache.path, schedule_cache.url
+            )
 
-    routes = apply_route_overrides(routes_result.routes, route_overrides_path)
+    parser_errors = list(routes_result.errors) + list(schedule_result.errors)
+    if parser_errors:
+        msg = "Parsing errors:\n" + "\n".join(f"- {e}" for e in parser_errors)
+        logger.error(msg)
+        raise ValueError(msg)
+
+    with recorder.stage("overrides"):
+        aliases = apply_alias_overrides({}, alias_path)
+        holiday_policy = _coerce_holiday_policy(config.rules, schedule_result)
+        holiday_policy = apply_holiday_overrides(holiday_policy, holiday_path)
+        routes = apply_route_overrides(routes_result.routes, route_overrides_path)
 
     calendar_policy = _coerce_calendar_policy(config.rules, schedule_result)
     if calendar_policy.recycling_mode == "alternating_week":
@@ -167,55 +321,154 @@ def build_db(
             raise ValueError("Missing anchor data for alternating_week recycling mode")
 
     # Ensure street_normalized is present and aligned
-    for route in routes:
-        route.street_normalized = normalize_street_name(route.street)
-
-    db = Database(
-        schema_version=SCHEMA_VERSION,
-        meta=MetaInfo(
-            generated_at=datetime.now(UTC),
-            town_id=config.town_id,
-            sources={
-                "routes": SourceMeta(
-                    url=routes_cache.url,
-                    sha256=routes_cache.sha256,
-                    etag=routes_cache.etag,
-                    last_modified=routes_cache.last_modified,
-                ),
-                "schedule": SourceMeta(
-                    url=schedule_cache.url,
-                    sha256=schedule_cache.sha256,
-                    etag=schedule_cache.etag,
-                    last_modified=schedule_cache.last_modified,
-                ),
-            },
-            git_commit=_git_commit(),
-        ),
-        calendar_policy=calendar_policy,
-        holiday_policy=holiday_policy,
-        aliases=aliases,
-        routes=routes,
-        street_index=_build_street_index(routes),
-    )
+    with recorder.stage("normalize"):
+        for route in routes:
+            route.street_normalized = normalize_street_name(route.street)
+
+    with recorder.stage("index"):
+        street_index = _build_street_index(routes)
+
+    with recorder.stage("model"):
+        db = Database(
+            schema_version=SCHEMA_VERSION,
+            meta=MetaInfo(
+                generated_at=datetime.now(UTC),
+                town_id=config.town_id,
+                sources={
+                    "routes": SourceMeta(
+                        url=routes_cache.url,
+                        sha256=routes_cache.sha256,
+                        etag=routes_cache.etag,
+                        last_modified=routes_cache.last_modified,
+                    ),
+                    "schedule": SourceMeta(
+                        url=schedule_cache.url,
+                        sha256=schedule_cache.sha256,
+                        etag=schedule_cache.etag,
+                        last_modified=schedule_cache.last_modified,
+                    ),
+                },
+                git_commit=_git_commit(),
+                build_fingerprint=fingerprint,
+            ),
+            calendar_policy=calendar_policy,
+            holiday_policy=holiday_policy,
+            aliases=aliases,
+            routes=routes,
+            street_index=street_index,
+        )
 
+    result = BuildResult(town_id=config.town_id, fingerprint=fingerprint, db=db)
     if validate_only:
-        return db
+        with recorder.stage("coverage"):
+            result.coverage = analyze_coverage(db)
+        log_report(result.coverage)
+        db.meta.build_stats = dict(recorder.stages)
+        return result
+
+    with recorder.stage("diff"):
+        previous = _load_previous_db(out_path)
+        result.diff = diff_databases(previous, db) if previous is not None else None
+    db.meta.build_stats = dict(recorder.stages)
+
+    # Publish only real content changes so readers don't reload (and feeds
+    # don't invalidate) when just timestamps would move.
+    result.published = result.diff is None or not result.diff.is_empty
+    if result.published:
+        logger.info(
+            "DB changes: %s", result.diff.summary() if result.diff else "no previous DB"
+        )
+        with recorder.stage("write"):
+            if keep_versions:
+                result.published = publish_version(
+                    out_path,
+                    lambda path: _write_db(db, path),
+                    fingerprint=fingerprint,
+                    route_count=len(db.routes),
+                    keep=keep_versions,
+                )
+            else:
+                _write_db(db, out_path)
+    else:
+        logger.info("DB content unchanged; keeping %s", out_path)
+    write_diff_sidecar(
+        out_path,
+        {
+            "fingerprint": fingerprint,
+            "db_fingerprint": (
+                fingerprint if result.published else previous and previous.meta.build_fingerprint
+            ),
+            "published": result.published,
+            "checked_at": datetime.now(UTC).isoformat(),
+            "summary": result.diff.summary() if result.diff else "no previous DB",
+            "diff": result.diff.to_dict() if result.diff else None,
+        },
+    )
+    return result
+
 
+def _load_previous_db(out_path: Path) -> Database | MappedDatabase | None:
+    if not out_path.exists():
+        return None
+    try:
+        return load_db(out_path)
+    except (OSError, ValueError) as exc:
+        logger.warning("Previous DB %s unreadable, publishing without diff: %s", out_path, exc)
+        return None
+
+
+def _write_db(db: Database, out_path: Path) -> None:
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    tmp_path = out_path.with_suffix(out_path.suffix + ".tmp")
-    tmp_path.write_text(db.model_dump_json(indent=2), encoding="utf-8")
-    tmp_path.replace(out_path)
+    if out_path.suffix == SNAPSHOT_SUFFIX:
+        write_snapshot(db, out_path)
+        logger.info("DB snapshot written to %s", out_path)
+        return
+    write_db_file(db, out_path)
     logger.info("DB written to %s", out_path)
-    return db
+
+
+def _write_stats_json(path: Path, result: BuildResult) -> None:
+    payload = {
+        "town_id": result.town_id,
+        "status": "built" if result.published else "unchanged",
+        "fingerprint": result.fingerprint,
+        "stages": {name: stats.model_dump() for name, stats in result.stats.items()},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
 
 
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Build town collection DB")
     parser.add_argument("--town", required=True, help="Path to town.yaml")
-    parser.add_argument("--out", required=True, help="Output DB JSON path")
+    parser.add_argument(
+        "--out", required=True, help="Output DB path (.json, .json.gz, .json.zst or .snap)"
+    )
     parser.add_argument("--cache-dir", default="data/cache", help="Cache directory")
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_MAX_MB,
+        help="Evict least recently used sources past this cache size (0: no limit)",
+    )
     parser.add_argument("--force-refresh", action="store_true", help="Force re-download sources")
-    parser.add_argument("--validate-only", action="store_true", help="Validate only, no output")
+    parser.add_argument(
+        "--validate-only",
+        action="store_true",
+        help="Validate and check route coverage only, no output",
+    )
+    parser.add_argument(
+        "--exit-code",
+        action="store_true",
+        help=f"Exit with {EXIT_UNCHANGED} when the DB was left unchanged (not rewritten)",
+    )
+    parser.add_argument("--stats-json", default=None, help="Write per-stage build stats here")
+    parser.add_argument(
+        "--keep-versions",
+        type=int,
+        default=0,
+        help="Publish through a versions/ pointer keeping the last N DBs (0: write --out)",
+    )
     parser.add_argument(
         "--log-level",
         default="INFO",
@@ -226,11 +479,17 @@ def main(argv: list[str] | None = None) -> int:
 
     logging.basicConfig(level=args.log_level, format="%(levelname)s %(message)s")
 
-    build_db(
+    result = build_db(
         Path(args.town),
         Path(args.out),
         Path(args.cache_dir),
         force_refresh=args.force_refresh,
         validate_only=args.validate_only,
+        keep_versions=args.keep_versions,
+        cache_max_bytes=max_bytes_from_mb(args.cache_max_mb),
     )
+    if args.stats_json:
+        _write_stats_json(Path(args.stats_json), result)
+    if args.exit_code and not args.validate_only and not result.published:
+        return EXIT_UNCHANGED
     return 0
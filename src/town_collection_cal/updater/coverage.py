@@ -0,0 +1,349 @@
+"""House-number coverage of each street's routes: overlaps, gaps, dead routes.
+
+The resolver takes the first of a street's routes (in ``street_index`` order)
+whose constraints match the house number. Per street and parity this module
+turns every constraint into an interval of odd or even numbers and sweeps
+them in sorted order, O(n log n) overall:
+
+- overlap: two routes claim the same numbers, so the later one silently
+  loses them. ``conflicting`` when the two routes differ in weekday, color
+  or ``no_collection``.
+- gap: numbers between two covered intervals that no route matches, or a
+  parity side that no route covers at all.
+- unreachable: every number the route matches is taken by earlier routes
+  (reported with just the routes that take them), its constraints match
+  nothing, or it follows an unconstrained route.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+from bisect import bisect_right
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from town_collection_cal.common.db_file import load_db
+from town_collection_cal.common.db_model import Database, RouteEntry
+from town_collection_cal.common.snapshot import MappedDatabase
+
+logger = logging.getLogger(__name__)
+
+# Open-ended upper bound; reported as None.
+_UNBOUNDED = 1 << 62
+_PARITIES = (("odd", 1), ("even", 0))
+
+# (first, last, route index), both bounds of the side's parity.
+_Segment = tuple[int, int, int]
+
+
+@dataclass
+class CoverageIssue:
+    street_normalized: str
+    # "odd" or "even"; None when the issue is not tied to one side.
+    parity: str | None
+    range_min: int | None
+    range_max: int | None
+    # Route indexes into ``db.routes``, the first-match winner first.
+    routes: list[int]
+    # Overlaps only: the routes disagree on the collection they assign.
+    conflicting: bool = False
+    reason: str | None = None
+
+    def describe(self) -> str:
+        side = f" {self.parity}" if self.parity else ""
+        if self.range_min is None and self.range_max is None:
+            numbers = ""
+        else:
+            high = "" if self.range_max is None else self.range_max
+            numbers = f" {self.range_min}-{high}"
+        routes = ", ".join(f"#{idx}" for idx in self.routes)
+        extra = f" ({self.reason})" if self.reason else ""
+        return f"{self.street_normalized}{side}{numbers}: routes {routes}{extra}"
+
+
+@dataclass
+class CoverageReport:
+    streets_checked: int = 0
+    routes_checked: int = 0
+    overlaps: list[CoverageIssue] = field(default_factory=list)
+    gaps: list[CoverageIssue] = field(default_factory=list)
+    unreachable: list[CoverageIssue] = field(default_factory=list)
+
+    @property
+    def conflicting_overlaps(self) -> list[CoverageIssue]:
+        return [issue for issue in self.overlaps if issue.conflicting]
+
+    @property
+    def has_problems(self) -> bool:
+        """True when some address resolves to a route it probably shouldn't."""
+        return bool(self.conflicting_overlaps or self.unreachable)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def summary(self) -> str:
+        return (
+            f"{self.streets_checked} streets, {self.routes_checked} routes: "
+            f"{len(self.overlaps)} overlaps ({len(self.conflicting_overlaps)} conflicting), "
+            f"{len(self.gaps)} gaps, {len(self.unreachable)} unreachable"
+        )
+
+    def issues(self) -> Iterable[tuple[str, CoverageIssue]]:
+        for issue in self.unreachable:
+            yield "unreachable", issue
+        for issue in self.overlaps:
+            yield "overlap" if issue.conflicting else "overlap (same collection)", issue
+        for issue in self.gaps:
+            yield "gap", issue
+
+
+def _assignment(route: RouteEntry) -> tuple[Any, ...]:
+    return (route.weekday, route.recycling_color, route.no_collection)
+
+
+def _segments(route: RouteEntry, idx: int) -> dict[str, list[_Segment]]:
+    sides: dict[str, list[_Segment]] = {"odd": [], "even": []}
+    for constraint in route.constraints:
+        low = constraint.range_min if constraint.range_min is not None else 0
+        high = constraint.range_max if constraint.range_max is not None else _UNBOUNDED
+        for parity, remainder in _PARITIES:
+            if constraint.parity not in (None, parity):
+                continue
+            first = low if low % 2 == remainder else low + 1
+            last = high if high == _UNBOUNDED or high % 2 == remainder else high - 1
+            if first <= last:
+                sides[parity].append((first, last, idx))
+    return sides
+
+
+def _bound(value: int) -> int | None:
+    return None if value == _UNBOUNDED else value
+
+
+def _sweep(
+    street: str,
+    parity: str,
+    segments: list[_Segment],
+    order: Mapping[int, int],
+    assignments: Mapping[int, tuple[Any, ...]],
+    report: CoverageReport,
+    *,
+    gaps: bool,
+) -> None:
+    segments.sort(key=lambda seg: (seg[0], order[seg[2]]))
+    reach_last, reach_idx = segments[0][1], segments[0][2]
+    for first, last, idx in segments[1:]:
+        if first <= reach_last and idx != reach_idx:
+            winner, loser = sorted((reach_idx, idx), key=order.__getitem__)
+            report.overlaps.append(
+                CoverageIssue(
+                    street_normalized=street,
+                    parity=parity,
+                    range_min=first,
+                    range_max=_bound(min(last, reach_last)),
+                    routes=[winner, loser],
+                    conflicting=assignments[winner] != assignments[loser],
+                )
+            )
+        elif gaps and first > reach_last + 2:
+            report.gaps.append(
+                CoverageIssue(
+                    street_normalized=street,
+                    parity=parity,
+                    range_min=reach_last + 2,
+                    range_max=first - 2,
+                    routes=[reach_idx, idx],
+                )
+            )
+        if last > reach_last:
+            reach_last, reach_idx = last, idx
+
+
+class _Covered:
+    """Disjoint, sorted intervals of one parity side, each owned by the route
+    that matches it first. Touching intervals of one route are merged.
+    """
+
+    def __init__(self) -> None:
+        self.firsts: list[int] = []
+        self.lasts: list[int] = []
+        self.owners: list[int] = []
+
+    def owners_of(self, first: int, last: int) -> list[int] | None:
+        """Routes that take ``first..last``; None if some of it is still free."""
+        start = bisect_right(self.firsts, first) - 1
+        if start < 0:
+            return None
+        owners: list[int] = []
+        expected = first
+        for pos in range(start, len(self.firsts)):
+            if self.firsts[pos] > expected or self.lasts[pos] < expected:
+                return None
+            owners.append(self.owners[pos])
+            if self.lasts[pos] >= last:
+                return owners
+            expected = self.lasts[pos] + 2
+        return None
+
+    def add(self, first: int, last: int, idx: int) -> None:
+        """Give route ``idx`` the numbers of ``first..last`` no earlier route took."""
+        # Intervals within one step (2) of the new one may merge with it. Each
+        # add fills the holes it spans, so pieces stay O(routes) in total.
+        lo = bisect_right(self.lasts, first - 3)
+        hi = bisect_right(self.firsts, last + 2)
+        pieces: list[tuple[int, int, int]] = []
+
+        def append(piece_first: int, piece_last: int, owner: int) -> None:
+            if pieces and pieces[-1][2] == owner and pieces[-1][1] + 2 >= piece_first:
+                pieces[-1] = (pieces[-1][0], max(pieces[-1][1], piece_last), owner)
+            else:
+                pieces.append((piece_first, piece_last, owner))
+
+        cursor = first
+        for pos in range(lo, hi):
+            piece_first, piece_last = self.firsts[pos], self.lasts[pos]
+            if cursor < piece_first and cursor <= last:
+                append(cursor, min(piece_first - 2, last), idx)
+            append(piece_first, piece_last, self.owners[pos])
+            cursor = max(cursor, piece_last + 2)
+        if cursor <= last:
+            append(cursor, last, idx)
+        self.firsts[lo:hi] = [piece[0] for piece in pieces]
+        self.lasts[lo:hi] = [piece[1] for piece in pieces]
+        self.owners[lo:hi] = [piece[2] for piece in pieces]
+
+
+def _shadowing(
+    sides: Mapping[str, list[_Segment]], covered: Mapping[str, _Covered]
+) -> set[int] | None:
+    """Routes that take all of ``sides``' numbers; None if some are still free."""
+    owners: set[int] = set()
+    for parity, side in sides.items():
+        for first, last, _ in side:
+            taken = covered[parity].owners_of(first, last)
+            if taken is None:
+                return None
+            owners.update(taken)
+    return owners
+
+
+def _route_issue(street: str, routes: list[int], reason: str) -> CoverageIssue:
+    return CoverageIssue(street, None, None, None, routes, reason=reason)
+
+
+def _check_street(
+    street: str, indexes: Sequence[int], routes: Sequence[RouteEntry], report: CoverageReport
+) -> None:
+    order = {idx: pos for pos, idx in enumerate(indexes)}
+    assignments: dict[int, tuple[Any, ...]] = {}
+    by_side: dict[str, list[_Segment]] = {"odd": [], "even": []}
+    covered = {"odd": _Covered(), "even": _Covered()}
+    catch_all: int | None = None
+    has_constraints = False
+
+    for idx in indexes:
+        route = routes[idx]
+        assignments[idx] = _assignment(route)
+        if catch_all is not None:
+            report.unreachable.append(
+                _route_issue(street, [catch_all, idx], "after unconstrained route")
+            )
+            continue
+        if not route.constraints:
+            # Matches every number, and also addresses given without one.
+            catch_all = idx
+            continue
+        sides = _segments(route, idx)
+        if not sides["odd"] and not sides["even"]:
+            report.unreachable.append(_route_issue(street, [idx], "constraints match nothing"))
+            continue
+        has_constraints = True
+        shadowing = _shadowing(sides, covered)
+        if shadowing is not None:
+            report.unreachable.append(
+                _route_issue(
+                    street,
+                    sorted(shadowing, key=order.__getitem__) + [idx],
+                    "shadowed by earlier routes",
+                )
+            )
+        for parity, side in sides.items():
+            for first, last, _ in side:
+                covered[parity].add(first, last, idx)
+            by_side[parity].extend(side)
+
+    if not has_constraints:
+        return
+    # Numbers no constrained route matches fall through to an unconstrained one.
+    gaps = catch_all is None
+    for parity, segments in by_side.items():
+        if segments:
+            _sweep(street, parity, segments, order, assignments, report, gaps=gaps)
+            continue
+        if not gaps:
+            continue
+        other = by_side["even" if parity == "odd" else "odd"]
+        report.gaps.append(
+            CoverageIssue(
+                street,
+                parity,
+                None,
+                None,
+                sorted({idx for _, _, idx in other}, key=order.get),
+                reason=f"no route covers {parity} numbers",
+            )
+        )
+
+
+def _street_index(db: Database | MappedDatabase) -> Mapping[str, Sequence[int]]:
+    if db.street_index is not None:
+        return db.street_index
+    index: dict[str, list[int]] = {}
+    for idx, route in enumerate(db.routes):
+        index.setdefault(route.street_normalized, []).append(idx)
+    return index
+
+
+def analyze_coverage(db: Database | MappedDatabase) -> CoverageReport:
+    routes = db.routes if isinstance(db, Database) else list(db.routes)
+    report = CoverageReport(routes_checked=len(routes))
+    for street, indexes in _street_index(db).items():
+        report.streets_checked += 1
+        _check_street(street, indexes, routes, report)
+    return report
+
+
+def log_report(report: CoverageReport, limit: int = 20) -> None:
+    level = logging.WARNING if report.has_problems else logging.INFO
+    logger.log(level, "Coverage: %s", report.summary())
+    for shown, (kind, issue) in enumerate(report.issues()):
+        if shown == limit:
+            logger.log(level, "... more coverage issues not shown")
+            break
+        logger.log(level, "  %s %s", kind, issue.describe())
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Check a DB for overlapping, gapped and unreachable routes"
+    )
+    parser.add_argument("--db", required=True, help="DB path (.json[.gz|.zst] or .snap)")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    parser.add_argument("--limit", type=int, default=50, help="Issues to list (text output)")
+    args = parser.parse_args(argv)
+
+    report = analyze_coverage(load_db(Path(args.db)))
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        print(report.summary())
+        for shown, (kind, issue) in enumerate(report.issues()):
+            if shown == args.limit:
+                print("...")
+                break
+            print(f"{kind:<26} {issue.describe()}")
+    # 1 when a conflicting overlap or an unreachable route was found.
+    return 1 if report.has_problems else 0
@@ -0,0 +1,193 @@
+"""Semantic comparison of two DBs.
+
+Routes are matched by ``(street_normalized, constraints)``; metadata such as
+``generated_at`` is ignored, so a rebuild that only moves timestamps yields an
+empty diff. Route order within a street is significant (the resolver takes the
+first match), so a reordered street is a change too.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from town_collection_cal.common.db_file import load_db
+from town_collection_cal.common.db_model import Database, RouteEntry
+from town_collection_cal.common.snapshot import MappedDatabase
+
+logger = logging.getLogger(__name__)
+
+DIFF_SIDECAR_SUFFIX = ".diff.json"
+
+
+@dataclass
+class DbDiff:
+    routes_added: list[dict[str, Any]] = field(default_factory=list)
+    routes_removed: list[dict[str, Any]] = field(default_factory=list)
+    # {"street_normalized", "constraints", "before": [...], "after": [...]}
+    routes_changed: list[dict[str, Any]] = field(default_factory=list)
+    # {"street_normalized", "before": [...], "after": [...]}: same routes, new order.
+    routes_reordered: list[dict[str, Any]] = field(default_factory=list)
+    aliases_added: dict[str, str] = field(default_factory=dict)
+    aliases_removed: dict[str, str] = field(default_factory=dict)
+    aliases_changed: dict[str, dict[str, str]] = field(default_factory=dict)
+    calendar_policy: dict[str, Any] | None = None
+    holiday_policy: dict[str, Any] | None = None
+    schema_version: dict[str, int] | None = None
+
+    @property
+    def is_empty(self) -> bool:
+        return not any(asdict(self).values())
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def summary(self) -> str:
+        if self.is_empty:
+            return "no changes"
+        parts = [
+            f"routes +{len(self.routes_added)} -{len(self.routes_removed)} "
+            f"~{len(self.routes_changed)}",
+            f"aliases +{len(self.aliases_added)} -{len(self.aliases_removed)} "
+            f"~{len(self.aliases_changed)}",
+        ]
+        if self.routes_reordered:
+            parts.append(f"{len(self.routes_reordered)} streets reordered")
+        if self.calendar_policy:
+            parts.append("calendar policy changed")
+        if self.holiday_policy:
+            parts.append("holiday policy changed")
+        if self.schema_version:
+            parts.append("schema version changed")
+        return ", ".join(parts)
+
+
+_RouteKey = tuple[str, str]
+# Per street, in DB order: (constraints as JSON, remaining route fields).
+_StreetRoutes = list[tuple[str, dict[str, Any]]]
+
+
+def _street_routes(routes: Iterable[RouteEntry]) -> dict[str, _StreetRoutes]:
+    by_street: dict[str, _StreetRoutes] = defaultdict(list)
+    for route in routes:
+        data = route.model_dump(mode="json")
+        constraints = json.dumps(data.pop("constraints"), sort_keys=True)
+        by_street[data.pop("street_normalized")].append((constraints, data))
+    return by_street
+
+
+def _group_routes(street: str, routes: _StreetRoutes) -> dict[_RouteKey, list[dict[str, Any]]]:
+    # Order is kept: routes sharing constraints resolve to the first of them.
+    grouped: dict[_RouteKey, list[dict[str, Any]]] = defaultdict(list)
+    for constraints, data in routes:
+        grouped[(street, constraints)].append(data)
+    return grouped
+
+
+def _route_record(key: _RouteKey, value: dict[str, Any]) -> dict[str, Any]:
+    return {"street_normalized": key[0], "constraints": json.loads(key[1]), **value}
+
+
+def _policy_change(old: Any, new: Any) -> dict[str, Any] | None:
+    before, after = old.model_dump(mode="json"), new.model_dump(mode="json")
+    return None if before == after else {"before": before, "after": after}
+
+
+def diff_databases(old: Database | MappedDatabase, new: Database | MappedDatabase) -> DbDiff:
+    diff = DbDiff()
+    old_streets = _street_routes(old.routes)
+    new_streets = _street_routes(new.routes)
+    for street in sorted(old_streets.keys() | new_streets.keys()):
+        old_street, new_street = old_streets.get(street, []), new_streets.get(street, [])
+        if old_street == new_street:
+            continue
+        old_routes = _group_routes(street, old_street)
+        new_routes = _group_routes(street, new_street)
+        if old_routes == new_routes:
+            diff.routes_reordered.append(
+                {
+                    "street_normalized": street,
+                    "before": [_route_record((street, key), value) for key, value in old_street],
+                    "after": [_route_record((street, key), value) for key, value in new_street],
+                }
+            )
+            continue
+        for key in sorted(old_routes.keys() | new_routes.keys()):
+            before, after = old_routes.get(key), new_routes.get(key)
+            if before == after:
+                continue
+            if before is None:
+                diff.routes_added.extend(_route_record(key, value) for value in after or [])
+            elif after is None:
+                diff.routes_removed.extend(_route_record(key, value) for value in before)
+            else:
+                diff.routes_changed.append(
+                    {
+                        "street_normalized": key[0],
+                        "constraints": json.loads(key[1]),
+                        "before": before,
+                        "after": after,
+                    }
+                )
+
+    old_aliases, new_aliases = dict(old.aliases), dict(new.aliases)
+    for alias in sorted(old_aliases.keys() | new_aliases.keys()):
+        if alias not in old_aliases:
+            diff.aliases_added[alias] = new_aliases[alias]
+        elif alias not in new_aliases:
+            diff.aliases_removed[alias] = old_aliases[alias]
+        elif old_aliases[alias] != new_aliases[alias]:
+            diff.aliases_changed[alias] = {
+                "before": old_aliases[alias],
+                "after": new_aliases[alias],
+            }
+
+    diff.calendar_policy = _policy_change(old.calendar_policy, new.calendar_policy)
+    diff.holiday_policy = _policy_change(old.holiday_policy, new.holiday_policy)
+    if old.schema_version != new.schema_version:
+        diff.schema_version = {"before": old.schema_version, "after": new.schema_version}
+    return diff
+
+
+def diff_sidecar_path(db_path: Path) -> Path:
+    return db_path.with_name(db_path.name + DIFF_SIDECAR_SUFFIX)
+
+
+def write_diff_sidecar(db_path: Path, record: dict[str, Any]) -> None:
+    path = diff_sidecar_path(db_path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(record, indent=2) + "\n", encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def read_diff_sidecar(db_path: Path) -> dict[str, Any] | None:
+    path = diff_sidecar_path(db_path)
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable diff sidecar %s: %s", path, exc)
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Semantic diff of two town DBs")
+    parser.add_argument("old", help="Old DB path (.json[.gz|.zst] or .snap)")
+    parser.add_argument("new", help="New DB path (.json[.gz|.zst] or .snap)")
+    parser.add_argument("--json", action="store_true", help="Print the full diff as JSON")
+    args = parser.parse_args(argv)
+
+    diff = diff_databases(load_db(Path(args.old)), load_db(Path(args.new)))
+    if args.json:
+        print(json.dumps(diff.to_dict(), indent=2))
+    else:
+        print(diff.summary())
+    # Like diff(1): 0 when equal, 1 when different.
+    return 0 if diff.is_empty else 1
@@ -0,0 +1,92 @@
+"""Build fingerprint: a hash of every input that can change the built DB.
+
+Covers source content hashes, town.yaml, the override files, the parser
+versions, the text extraction backend version and the DB schema version. When the
+fingerprint recorded in an existing DB matches, the build is a no-op.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from collections.abc import Callable, Mapping
+from importlib import import_module
+from pathlib import Path
+from typing import Any
+
+from town_collection_cal import __version__
+from town_collection_cal.common.db_file import read_db_bytes
+from town_collection_cal.common.db_model import SCHEMA_VERSION
+from town_collection_cal.common.pdf_text import DEFAULT_TEXT_BACKEND, get_text_backend
+from town_collection_cal.common.snapshot import is_snapshot, open_snapshot
+from town_collection_cal.updater.diff_db import read_diff_sidecar
+
+logger = logging.getLogger(__name__)
+
+
+def _file_sha256(path: Path | None) -> str | None:
+    if path is None or not path.exists():
+        return None
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def parser_version(func: Callable[..., Any]) -> str:
+    """``module:function@PARSER_VERSION`` for a loaded parser callable."""
+    module = import_module(func.__module__)
+    version = getattr(module, "PARSER_VERSION", "0")
+    return f"{func.__module__}:{func.__qualname__}@{version}"
+
+
+def compute_build_fingerprint(
+    *,
+    town_config_path: Path,
+    source_sha256: Mapping[str, str],
+    override_paths: Mapping[str, Path | None],
+    parsers: Mapping[str, Callable[..., Any]],
+    text_backend: str = DEFAULT_TEXT_BACKEND,
+) -> str:
+    inputs = {
+        "schema_version": SCHEMA_VERSION,
+        "package_version": __version__,
+        "extractor_version": get_text_backend(text_backend).version,
+        "town_config": _file_sha256(town_config_path),
+        "sources": dict(sorted(source_sha256.items())),
+        "overrides": {name: _file_sha256(path) for name, path in sorted(override_paths.items())},
+        "parsers": {name: parser_version(func) for name, func in sorted(parsers.items())},
+    }
+    payload = json.dumps(inputs, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def read_build_fingerprint(db_path: Path) -> str | None:
+    """Fingerprint recorded in an existing DB, or None if absent/unreadable."""
+    if not db_path.exists():
+        return None
+    try:
+        if is_snapshot(db_path):
+            return open_snapshot(db_path).meta.build_fingerprint
+        meta = json.loads(read_db_bytes(db_path)).get("meta") or {}
+        return meta.get("build_fingerprint")
+    except (OSError, ValueError) as exc:
+        logger.warning("Could not read build fingerprint from %s: %s", db_path, exc)
+        return None
+
+
+def is_up_to_date(db_path: Path, fingerprint: str) -> bool:
+    """True when ``db_path`` already reflects inputs with ``fingerprint``.
+
+    Either the DB records it, or the last build with these inputs produced no
+    semantic change and left the DB in place (recorded in the diff sidecar).
+    """
+    if not db_path.exists():
+        return False
+    recorded = read_build_fingerprint(db_path)
+    if recorded == fingerprint:
+        return True
+    sidecar = read_diff_sidecar(db_path)
+    return (
+        sidecar is not None
+        and sidecar.get("fingerprint") == fingerprint
+        and not sidecar.get("published")
+        and sidecar.get("db_fingerprint") == recorded
+    )
@@ -56,6 +56,7 @@ def apply_holiday_overrides(
         logger.info("Holiday override: replaced no_collection_dates")
     if "shift_holidays" in data:
         shifts: list[date] = []
+        shift_days_by_date: dict[date, int] = {}
         raw = data["shift_holidays"] or []
         if not isinstance(raw, list):
             raise ValueError(f"shift_holidays must be a list: {overrides_path}")
@@ -65,12 +66,16 @@ def apply_holiday_overrides(
             elif isinstance(entry, dict):
                 if "date" not in entry:
                     raise ValueError(f"shift_holidays entry missing date: {overrides_path}")
-                shifts.append(date.fromisoformat(str(entry["date"])))
+                holiday = date.fromisoformat(str(entry["date"]))
+                shifts.append(holiday)
+                if "shift_days" in entry:
+                    shift_days_by_date[holiday] = int(entry["shift_days"])
             else:
                 raise ValueError(
                     f"shift_holidays entry must be string or mapping: {overrides_path}"
                 )
         updated.shift_holidays = shifts
+        updated.shift_days_by_date = shift_days_by_date
         logger.info("Holiday override: replaced shift_holidays")
     return updated
 
@@ -172,17 +177,27 @@ def apply_route_overrides(
         raise ValueError(f"Route overrides must be a mapping: {overrides_path}")
 
     updated = list(routes)
+    # Each entry targets one street, so only that street's routes are examined.
+    # Positions stay in list order, which keeps patch order and logging as before.
+    by_street: dict[str, list[int]] = {}
+    for idx, route in enumerate(updated):
+        by_street.setdefault(route.street_normalized, []).append(idx)
+    deleted: set[int] = set()
 
     for delete_entry in data.get("delete", []) or []:
         match = _parse_match(delete_entry)
-        before = len(updated)
-        updated = [r for r in updated if not _match_route(r, match)]
-        removed = before - len(updated)
+        positions = by_street.get(match.street_normalized, [])
+        kept = [idx for idx in positions if not _match_route(updated[idx], match)]
+        removed = len(positions) - len(kept)
+        if removed:
+            deleted.update(set(positions) - set(kept))
+            by_street[match.street_normalized] = kept
         logger.info("Route override delete: %s removed=%s", match.street_normalized, removed)
 
     for patch_entry in data.get("patch", []) or []:
         match = _parse_match(patch_entry)
-        for route in updated:
+        for idx in by_street.get(match.street_normalized, []):
+            route = updated[idx]
             if _match_route(route, match):
                 if "weekday" in patch_entry:
                     route.weekday = patch_entry["weekday"]
@@ -192,6 +207,9 @@ def apply_route_overrides(
                     route.no_collection = bool(patch_entry["no_collection"])
                 logger.info("Route override patch: %s", match.street_normalized)
 
+    if deleted:
+        updated = [route for idx, route in enumerate(updated) if idx not in deleted]
+
     for add_entry in data.get("add", []) or []:
         route = _build_route(add_entry)
         updated.append(route)
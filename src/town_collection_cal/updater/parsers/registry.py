@@ -0,0 +1,101 @@
+"""Parser plugins, discovered through entry points and imported on first use.
+
+A package registers parsers in the ``town_collection_cal.parsers`` entry-point
+group as ``name = "module:function"``. ``town.yaml`` names a parser either by
+that name or directly by its ``module:function`` path. Discovery reads only
+package metadata; a parser module is imported when the parser is first
+loaded, and each parser is loaded once per process.
+"""
+from __future__ import annotations
+
+import argparse
+import functools
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from importlib import import_module
+from importlib.metadata import entry_points
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "town_collection_cal.parsers"
+
+# The bundled parsers. pyproject.toml declares them as entry points too; they
+# are listed here so a source checkout resolves them without installed metadata.
+BUILTIN_PARSERS = {
+    "westford_routes": "town_collection_cal.updater.parsers.westford_routes:parse_routes",
+    "westford_guide": "town_collection_cal.updater.parsers.westford_guide:parse_schedule",
+}
+
+
+@dataclass(frozen=True)
+class ParserSpec:
+    name: str
+    # "module:function"
+    target: str
+    # "builtin" or the distribution providing the entry point
+    source: str
+
+
+@functools.cache
+def available_parsers() -> dict[str, ParserSpec]:
+    specs = {
+        name: ParserSpec(name, target, "builtin") for name, target in BUILTIN_PARSERS.items()
+    }
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        existing = specs.get(ep.name)
+        if existing is not None:
+            if existing.target != ep.value:
+                logger.warning(
+                    "Ignoring parser entry point %s=%s; already registered as %s",
+                    ep.name,
+                    ep.value,
+                    existing.target,
+                )
+            continue
+        source = ep.dist.name if ep.dist is not None else "entry point"
+        specs[ep.name] = ParserSpec(ep.name, ep.value, source)
+    return dict(sorted(specs.items()))
+
+
+def resolve_target(ref: str) -> str:
+    """``module:function`` for a registered name or an explicit path."""
+    if ":" in ref:
+        return ref
+    spec = available_parsers().get(ref)
+    if spec is None:
+        raise ValueError(
+            f"Unknown parser {ref!r}; registered: {', '.join(available_parsers()) or 'none'}"
+        )
+    return spec.target
+
+
+@functools.cache
+def load_parser(ref: str) -> Callable[..., Any]:
+    target = resolve_target(ref)
+    module_name, _, func_name = target.partition(":")
+    if not module_name or not func_name:
+        raise ValueError(f"Parser must be in module:function format: {target}")
+    func = getattr(import_module(module_name), func_name)
+    if not callable(func):
+        raise ValueError(f"Parser target is not callable: {target}")
+    return func
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="List registered parsers")
+    parser.add_argument(
+        "--versions",
+        action="store_true",
+        help="Import each parser and show its PARSER_VERSION",
+    )
+    args = parser.parse_args(argv)
+
+    for spec in available_parsers().values():
+        line = f"{spec.name:<20} {spec.target}  [{spec.source}]"
+        if args.versions:
+            module = import_module(spec.target.partition(":")[0])
+            line += f"  version={getattr(module, 'PARSER_VERSION', '0')}"
+        print(line)
+    return 0
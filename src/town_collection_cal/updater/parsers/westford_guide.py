@@ -5,11 +5,13 @@ import re
 from datetime import date, datetime
 from pathlib import Path
 
-import pdfplumber
-
 from town_collection_cal.common.db_model import CalendarPolicy, HolidayPolicy
+from town_collection_cal.common.pdf_text import extract_text
 from town_collection_cal.updater.parsers.types import ScheduleParseResult
 
+# Bump when parse output can change for the same input text.
+PARSER_VERSION = "1"
+
 ANCHOR_PATTERN = re.compile(
     r"week of\s+([A-Za-z]+)\s+(\d{1,2})\s*-\s*(\d{1,2}).*?\b(BLUE|GREEN)\b",
     re.IGNORECASE,
@@ -19,17 +21,6 @@ YEAR_PATTERN = re.compile(r"\b(20\d{2})\b")
 logger = logging.getLogger(__name__)
 
 
-def _extract_text(path: Path) -> str:
-    if path.suffix.lower() == ".txt":
-        return path.read_text(encoding="utf-8")
-    text_parts: list[str] = []
-    with pdfplumber.open(path) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text() or ""
-            text_parts.append(page_text)
-    return "\n".join(text_parts)
-
-
 def _infer_year(text: str) -> int:
     years = [int(y) for y in YEAR_PATTERN.findall(text)]
     if years:
@@ -44,7 +35,7 @@ def _anchor_sunday(some_day: date) -> date:
 
 def parse_schedule(path: str | Path, url: str) -> ScheduleParseResult:
     path = Path(path)
-    text = _extract_text(path)
+    text = extract_text(path)
     errors: list[str] = []
 
     match = ANCHOR_PATTERN.search(text)
@@ -2,71 +2,132 @@ from __future__ import annotations
 
 import logging
 import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
 from pathlib import Path
 
-import pdfplumber
-
 from town_collection_cal.common.db_model import RouteConstraint, RouteEntry
 from town_collection_cal.common.normalize import normalize_street_name
+from town_collection_cal.common.pdf_text import iter_lines
 from town_collection_cal.updater.parsers.types import RoutesParseResult
 
-DAY_PATTERN = re.compile(r"\b(Monday|Tuesday|Wednesday|Thursday|Friday)\b", re.IGNORECASE)
-COLOR_PATTERN = re.compile(r"\b(BLUE|GREEN|TBA)\b", re.IGNORECASE)
-PARITY_PATTERN = re.compile(r"\b(ODD|EVEN)\b", re.IGNORECASE)
+# Bump when parse output can change for the same input text.
+PARSER_VERSION = "1"
+
 _DASH = r"[-\u2010\u2011\u2012\u2013\u2014\u2015]"
-RANGE_PATTERN = re.compile(rf"\b#?\s*(\d{{1,5}})\s*{_DASH}\s*(\d{{1,5}})\b")
-OPEN_ENDED_RANGE_PATTERN = re.compile(rf"\b#?\s*(\d{{1,5}})\s*{_DASH}\s*end\b", re.IGNORECASE)
-PAREN_NOTE_PATTERN = re.compile(r"\([^)]*\)")
+# Every value token starts at a word boundary, so the scan only tries the
+# alternatives there. A closed range ("1 - 110") wins over an open-ended one
+# ("20 - end") because the digits are tried before "end".
+_VALUE_TOKENS = (
+    rf"\b(?:#?\s*(?P<range_min>\d{{1,5}})\s*{_DASH}\s*(?:(?P<range_max>\d{{1,5}})|(?P<open>end))\b"
+    r"|(?P<day>Monday|Tuesday|Wednesday|Thursday|Friday)\b"
+    r"|(?P<color>BLUE|GREEN|TBA)\b"
+    r"|(?P<parity>ODD|EVEN)\b)"
+)
+VALUE_TOKEN_PATTERN = re.compile(_VALUE_TOKENS, re.IGNORECASE)
+# A parenthesised note is dropped from the street name as a whole, but values
+# inside it still count (e.g. a weekday mentioned only in the note).
+TOKEN_PATTERN = re.compile(rf"(?P<note>\([^)]*\))|{_VALUE_TOKENS}", re.IGNORECASE)
 
 logger = logging.getLogger(__name__)
 
 
-def _extract_text(path: Path) -> str:
-    if path.suffix.lower() == ".txt":
-        return path.read_text(encoding="utf-8")
-    text_parts: list[str] = []
-    with pdfplumber.open(path) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text() or ""
-            text_parts.append(page_text)
-    return "\n".join(text_parts)
-
-
 def parse_routes(path: str | Path, url: str) -> RoutesParseResult:
-    path = Path(path)
-    text = _extract_text(path)
-    routes: list[RouteEntry] = []
+    routes = list(iter_routes(iter_lines(Path(path))))
     errors: list[str] = []
+    if not routes:
+        errors.append(f"No routes parsed from {url}")
+
+    return RoutesParseResult(routes=routes, errors=errors)
+
+
+@dataclass(slots=True)
+class LineTokens:
+    """Values lexed from one line; each field holds the first occurrence."""
+
+    street: str = ""
+    day: str | None = None
+    color: str | None = None
+    parity: str | None = None
+    range_min: int | None = None
+    range_max: int | None = None
+    has_range: bool = False
+    open_min: int | None = None
+
+    def bounds(self) -> tuple[int | None, int | None]:
+        if self.has_range:
+            return self.range_min, self.range_max
+        return self.open_min, None
+
+
+def tokenize_line(line: str) -> LineTokens:
+    """Classify every token of ``line`` in a single left-to-right scan."""
+    tokens = LineTokens()
+    street_parts: list[str] = []
+    last = 0
+    for match in TOKEN_PATTERN.finditer(line):
+        street_parts.append(line[last : match.start()])
+        last = match.end()
+        if match.lastgroup == "note":
+            for inner in VALUE_TOKEN_PATTERN.finditer(line, match.start() + 1, last - 1):
+                _record(tokens, inner)
+        else:
+            _record(tokens, match)
+    street_parts.append(line[last:])
+    tokens.street = _finish_street(" ".join(street_parts))
+    return tokens
+
+
+def _record(tokens: LineTokens, match: re.Match[str]) -> None:
+    kind = match.lastgroup
+    if kind == "day":
+        if tokens.day is None:
+            tokens.day = match["day"].capitalize()
+    elif kind == "color":
+        if tokens.color is None:
+            tokens.color = match["color"].upper()
+    elif kind == "parity":
+        if tokens.parity is None:
+            tokens.parity = match["parity"].lower()
+    elif kind == "range_max":
+        if not tokens.has_range:
+            tokens.has_range = True
+            tokens.range_min = int(match["range_min"])
+            tokens.range_max = int(match["range_max"])
+    elif kind == "open" and tokens.open_min is None:
+        tokens.open_min = int(match["range_min"])
+
+
+def iter_routes(lines: Iterable[str]) -> Iterator[RouteEntry]:
+    """Parse route entries from a stream of text lines.
+
+    Street-only continuation lines set pending state that carries over to the
+    next line, including across page boundaries.
+    """
     pending_street: str | None = None
     pending_range: tuple[int | None, int | None] | None = None
     pending_parity: str | None = None
 
-    for raw_line in text.splitlines():
+    for raw_line in lines:
         line = " ".join(raw_line.split())
         if not line:
             continue
 
         no_collection = "no municipal collection" in line.lower()
-        day_match = DAY_PATTERN.search(line)
-        if not day_match and not no_collection:
+        tokens = tokenize_line(line)
+        if tokens.day is None and not no_collection:
             # Possible continuation (street-only line)
-            if not COLOR_PATTERN.search(line):
-                street_only = _clean_street(line)
-                if street_only:
-                    pending_street = street_only
-                    pending_range = _extract_range(line)
-                    pending_parity = _extract_parity(line)
+            if tokens.color is None and tokens.street:
+                pending_street = tokens.street
+                pending_range = tokens.bounds()
+                pending_parity = tokens.parity
             continue
-        day = day_match.group(1).capitalize() if day_match else None
-
-        color_match = COLOR_PATTERN.search(line)
-        color = color_match.group(1).upper() if color_match else None
-
-        parity = _extract_parity(line)
+        day = tokens.day
+        color = tokens.color
+        parity = tokens.parity
+        range_min, range_max = tokens.bounds()
 
-        range_min, range_max = _extract_range(line)
-
-        street = _clean_street(line)
+        street = tokens.street
         if not street and pending_street:
             street = pending_street
             if pending_range and (range_min is None and range_max is None):
@@ -102,7 +163,6 @@ def parse_routes(path: str | Path, url: str) -> RoutesParseResult:
             constraints=constraints,
             notes=None,
         )
-        routes.append(route)
         logger.debug(
             "Parsed route line=%r street=%s weekday=%s color=%s parity=%s range=%s-%s",
             raw_line,
@@ -113,42 +173,11 @@ def parse_routes(path: str | Path, url: str) -> RoutesParseResult:
             range_min,
             range_max,
         )
-
-    if not routes:
-        errors.append(f"No routes parsed from {url}")
-
-    return RoutesParseResult(routes=routes, errors=errors)
-
-
-def _extract_range(line: str) -> tuple[int | None, int | None]:
-    range_match = RANGE_PATTERN.search(line)
-    if range_match:
-        return int(range_match.group(1)), int(range_match.group(2))
-
-    open_ended_match = OPEN_ENDED_RANGE_PATTERN.search(line)
-    if open_ended_match:
-        return int(open_ended_match.group(1)), None
-
-    return None, None
-
-
-def _extract_parity(line: str) -> str | None:
-    parity_match = PARITY_PATTERN.search(line)
-    return parity_match.group(1).lower() if parity_match else None
+        yield route
 
 
-def _clean_street(line: str) -> str:
-    street = line
-    for pattern in (
-        PAREN_NOTE_PATTERN,
-        DAY_PATTERN,
-        COLOR_PATTERN,
-        PARITY_PATTERN,
-        RANGE_PATTERN,
-        OPEN_ENDED_RANGE_PATTERN,
-    ):
-        street = pattern.sub(" ", street)
-    street = re.sub(r"\s+", " ", street).strip(" -")
+def _finish_street(street: str) -> str:
+    street = " ".join(street.split()).strip(" -")
     street = street.replace(".", "")
     if street.strip() in {"#", ""}:
         return ""
@@ -0,0 +1,468 @@
+"""Deterministic synthetic towns for scale testing.
+
+Writes a complete town directory in the Westford formats, sized by route
+count and fully determined by the seed::
+
+    town.yaml                sources point at <base-url>/sources/...
+    sources/routes.{txt,pdf} route book: single lines, street/value splits,
+                             house-number ranges, odd/even splits, notes,
+                             abbreviated directionals, no-collection streets
+    sources/guide.{txt,pdf}  recycling guide with the anchor week
+    street_aliases.yaml      alternate suffixes for existing streets
+    route_overrides.yaml     deletes, patches and adds
+    holiday_rules.yaml       shifted holidays and no-collection dates
+
+Sources are fetched like any other town's, so serve the directory first
+(``python -m http.server 8000 --directory OUT``) and then run
+``updater build-db --town OUT/town.yaml``. Ranges on a street are contiguous,
+so the built DB has no coverage overlaps, gaps or unreachable routes.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from town_collection_cal.common.db_model import RouteConstraint, RouteEntry
+from town_collection_cal.common.normalize import normalize_street_name
+from town_collection_cal.common.pdf_writer import paginate, render_pdf
+
+DEFAULT_BASE_URL = "http://127.0.0.1:8000"
+SOURCE_FORMATS = ("txt", "pdf")
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+COLORS = ["Blue", "Green", "BLUE", "GREEN"]
+# Street words are built from these; none can lex as a weekday, color or parity.
+SYLLABLES = [
+    "ash", "bel", "brook", "car", "cot", "dal", "dun", "el", "fair", "ford",
+    "glen", "gran", "ham", "hil", "kel", "lan", "ley", "mer", "nab", "nor",
+    "pem", "quin", "ros", "shel", "stow", "tad", "ton", "vose", "wil", "wood",
+]  # fmt: skip
+MIDDLE_WORDS = ["Hill", "Pond", "Brook", "Farm", "Village", "Meadow", "Ridge"]
+SUFFIXES = ["Rd", "Road", "St", "Street", "La", "Ln", "Dr", "Ave", "Way", "Ct", "Cir"]
+# Alias spellings, keyed by the normalized suffix of the street they point at.
+ALIAS_SUFFIXES = {"road": "Lane", "street": "Avenue", "lane": "Road", "drive": "Street"}
+NOTES = ["(Rt 40 - Town line)", "(Main St - Depot St)", "(Oak Hill Rd - Rt. 40)"]
+MONTHS = [
+    "January", "February", "March", "April", "May", "June", "July",
+    "August", "September", "October", "November", "December",
+]  # fmt: skip
+# Street layouts in the route book and their relative frequency.
+SHAPES = {
+    "single": 55,
+    "split_line": 5,
+    "directional": 5,
+    "ranges": 14,
+    "parity": 18,
+    "no_collection": 3,
+}
+_SINGLE_ROUTE_SHAPES = ("single", "split_line")
+
+
+@dataclass
+class SynthRoute:
+    """One route as the routes parser reads it back (before overrides)."""
+
+    street: str
+    weekday: str | None
+    recycling_color: str | None
+    parity: str | None = None
+    range_min: int | None = None
+    range_max: int | None = None
+
+    def to_entry(self) -> RouteEntry:
+        constraints = []
+        if self.parity is not None or self.range_min is not None:
+            constraints.append(
+                RouteConstraint(
+                    parity=self.parity, range_min=self.range_min, range_max=self.range_max
+                )
+            )
+        return RouteEntry(
+            street=self.street,
+            street_normalized=normalize_street_name(self.street),
+            weekday=self.weekday,
+            recycling_color=self.recycling_color,
+            no_collection=self.weekday is None,
+            constraints=constraints,
+        )
+
+
+@dataclass
+class SynthStreet:
+    name: str
+    shape: str
+    routes: list[SynthRoute]
+
+
+@dataclass
+class SynthTown:
+    town_yaml: Path
+    routes_source: Path
+    schedule_source: Path
+    streets: list[SynthStreet]
+    aliases: dict[str, str]
+    overrides: dict[str, int]
+    # Routes in the route book, and in the DB once overrides are applied.
+    route_count: int
+    expected_routes: int
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "town_yaml": str(self.town_yaml),
+            "routes_source": str(self.routes_source),
+            "schedule_source": str(self.schedule_source),
+            "streets": len(self.streets),
+            "aliases": len(self.aliases),
+            "overrides": self.overrides,
+            "route_count": self.route_count,
+            "expected_routes": self.expected_routes,
+        }
+
+
+@lru_cache(maxsize=8)
+def _syllable_order(seed: int) -> tuple[str, ...]:
+    order = SYLLABLES[:]
+    random.Random(seed).shuffle(order)
+    return tuple(order)
+
+
+def street_word(idx: int, seed: int) -> str:
+    """A distinct pronounceable word of two or more syllables for each ``idx``."""
+    order = _syllable_order(seed)
+    # Offset past the single-syllable numbers; the digits of a base-N number
+    # are unique per value, so every index gets its own word. Lowest digit
+    # first, so neighbouring indices differ in their first syllable.
+    number = idx + len(order)
+    parts: list[str] = []
+    while number:
+        number, digit = divmod(number, len(order))
+        parts.append(order[digit])
+    return "".join(parts).capitalize()
+
+
+def street_name(rng: random.Random, idx: int, seed: int) -> str:
+    """Street ``idx`` as printed in the book, e.g. "Belford Hill Rd"."""
+    middle = f" {rng.choice(MIDDLE_WORDS)}" if rng.random() < 0.15 else ""
+    return f"{street_word(idx, seed)}{middle} {rng.choice(SUFFIXES)}"
+
+
+def route_entries(streets: list[SynthStreet]) -> list[RouteEntry]:
+    """The routes the routes parser reads back from the book, in book order."""
+    return [route.to_entry() for street in streets for route in street.routes]
+
+
+def _contiguous(
+    rng: random.Random, start: int, count: int, step: int
+) -> list[tuple[int, int | None]]:
+    """``count`` back-to-back ranges from ``start``; the last one is open-ended."""
+    bounds: list[tuple[int, int | None]] = []
+    low = start
+    for _ in range(count - 1):
+        high = low + step * rng.randint(5, 120)
+        bounds.append((low, high))
+        low = high + step
+    bounds.append((low, None))
+    return bounds
+
+
+def _range_text(low: int, high: int | None) -> str:
+    return f"#{low} - {'end' if high is None else high}"
+
+
+def route_book(route_count: int, seed: int) -> tuple[list[str], list[SynthStreet]]:
+    """Route-book lines holding exactly ``route_count`` routes, and their streets.
+
+    Streets are listed alphabetically by their printed name, as in town books.
+    """
+    rng = random.Random(seed)
+    shapes, weights = list(SHAPES), list(SHAPES.values())
+    blocks: list[tuple[list[str], SynthStreet]] = []
+    streets: list[SynthStreet] = []
+    total = 0
+    while total < route_count:
+        lines: list[str] = []
+        remaining = route_count - total
+        name = street_name(rng, len(streets), seed)
+        shape = rng.choices(shapes, weights)[0]
+        if shape in ("ranges", "parity") and remaining < 2:
+            shape = "single"
+        day, color = rng.choice(WEEKDAYS), rng.choice(COLORS)
+        routes: list[SynthRoute] = []
+        if shape == "single":
+            lines.append(f"{name} {day} {color}")
+            routes.append(SynthRoute(name, day, color.upper()))
+        elif shape == "split_line":
+            lines.extend([name, f"{day} {color}"])
+            routes.append(SynthRoute(name, day, color.upper()))
+        elif shape == "directional":
+            # Books abbreviate directionals; the parser spells them out.
+            short, full = rng.choice([("No", "North"), ("So", "South"), ("E", "East")])
+            lines.append(f"{short} {name} {day} {color}")
+            name = f"{full} {name}"
+            routes.append(SynthRoute(name, day, color.upper()))
+        elif shape == "no_collection":
+            lines.append(f"No Municipal Collection {name}")
+            name = f"North Municipal Collection {name}"
+            routes.append(SynthRoute(name, None, None))
+        elif shape == "ranges":
+            lines.append(name)
+            for low, high in _contiguous(rng, 1, min(remaining, rng.randint(2, 4)), step=1):
+                day, color = rng.choice(WEEKDAYS), rng.choice(COLORS)
+                note = f" {rng.choice(NOTES)}" if rng.random() < 0.2 else ""
+                lines.append(f"{_range_text(low, high)}{note} {day} {color}")
+                routes.append(SynthRoute(name, day, color.upper(), None, low, high))
+        else:
+            lines.append(name)
+            budget = min(remaining, rng.randint(2, 4))
+            odd = rng.randint(1, budget - 1)
+            for parity, start, count in (("odd", 1, odd), ("even", 2, budget - odd)):
+                for low, high in _contiguous(rng, start, count, step=2):
+                    day, color = rng.choice(WEEKDAYS), rng.choice(COLORS)
+                    if count == 1:
+                        # A side served by one route has no ranges.
+                        lines.append(f"{parity.upper()} {day} {color}")
+                        routes.append(SynthRoute(name, day, color.upper(), parity))
+                    else:
+                        lines.append(f"{parity.upper()} {_range_text(low, high)} {day} {color}")
+                        routes.append(SynthRoute(name, day, color.upper(), parity, low, high))
+        streets.append(SynthStreet(name=name, shape=shape, routes=routes))
+        blocks.append((lines, streets[-1]))
+        total += len(routes)
+    blocks.sort(key=lambda block: block[0][0])
+    return [line for block, _ in blocks for line in block], [street for _, street in blocks]
+
+
+def guide_lines(seed: int, year: int) -> list[str]:
+    """A recycling guide whose anchor week is a seeded Monday-to-Sunday week of ``year``."""
+    rng = random.Random(seed)
+    month = rng.randint(1, 12)
+    first = date(year, month, 1)
+    monday = first + timedelta(days=(7 - first.weekday()) % 7 + 7 * rng.randint(0, 2))
+    return [
+        f"Recycling Guide {year}-{year + 1}",
+        "Recycling is collected every other week on your trash day.",
+        f"The week of {MONTHS[month - 1]} {monday.day}-{monday.day + 6} is "
+        f"{rng.choice(['BLUE', 'GREEN'])}.",
+    ]
+
+
+def _nth_weekday(year: int, month: int, weekday: int, nth: int) -> date:
+    """The ``nth`` ``weekday`` of the month; a negative ``nth`` counts from the end."""
+    if nth > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (nth - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7 + 7 * (-nth - 1))
+
+
+def holiday_rules(seed: int, year: int) -> dict[str, Any]:
+    """Shifted holidays for the guide's season plus a few seeded no-collection dates."""
+    rng = random.Random(seed)
+    shifts: list[Any] = []
+    for season_year in (year, year + 1):
+        holidays = [
+            date(season_year, 1, 1),
+            _nth_weekday(season_year, 5, 0, -1),  # Memorial Day
+            date(season_year, 7, 4),
+            _nth_weekday(season_year, 9, 0, 1),  # Labor Day
+            _nth_weekday(season_year, 11, 3, 4),  # Thanksgiving
+            date(season_year, 12, 25),
+        ]
+        for holiday in holidays:
+            if rng.random() < 0.25:
+                shifts.append({"date": holiday.isoformat(), "shift_days": 2})
+            else:
+                shifts.append(holiday.isoformat())
+    start = date(year, 1, 1)
+    storm_days = sorted(
+        {start + timedelta(days=rng.randrange(730)) for _ in range(rng.randint(1, 4))}
+    )
+    return {
+        "no_collection_dates": [day.isoformat() for day in storm_days],
+        "shift_holidays": shifts,
+    }
+
+
+def _sample(rng: random.Random, items: list[SynthStreet], share: float) -> list[SynthStreet]:
+    return rng.sample(items, min(len(items), max(1, int(len(items) * share))))
+
+
+def route_overrides(
+    streets: list[SynthStreet], seed: int, rate: float
+) -> tuple[dict[str, str], dict[str, list[dict[str, Any]]]]:
+    """Street aliases and add/delete/patch route overrides touching ``rate`` of streets."""
+    rng = random.Random(seed)
+    singles = [street for street in streets if street.shape in _SINGLE_ROUTE_SHAPES]
+    deleted = _sample(rng, singles, rate)
+    delete = [{"street": street.name, "weekday": street.routes[0].weekday} for street in deleted]
+
+    # Patch entries select one route by street and constraint; their values
+    # also act as match criteria, so they name the route's current ones.
+    patch: list[dict[str, Any]] = []
+    split = [street for street in streets if street.shape in ("ranges", "parity")]
+    for street in _sample(rng, split, rate):
+        route = rng.choice(street.routes)
+        entry: dict[str, Any] = {
+            "street": street.name,
+            "weekday": route.weekday,
+            "recycling_color": route.recycling_color,
+        }
+        if route.parity:
+            entry["parity"] = route.parity
+        if route.range_min is not None:
+            entry["range"] = [route.range_min, route.range_max]
+        patch.append(entry)
+
+    add: list[dict[str, Any]] = []
+    for offset in range(max(1, int(len(streets) * rate))):
+        name = f"{street_word(len(streets) + offset, seed)} {rng.choice(SUFFIXES)}"
+        sides = [{}] if rng.random() < 0.6 else [{"parity": "odd"}, {"parity": "even"}]
+        for side in sides:
+            add.append(
+                {
+                    "street": name,
+                    "weekday": rng.choice(WEEKDAYS),
+                    "recycling_color": rng.choice(["BLUE", "GREEN"]),
+                    **side,
+                }
+            )
+
+    aliases: dict[str, str] = {}
+    gone = {street.name for street in deleted}
+    candidates = [
+        street
+        for street in streets
+        if street.shape != "no_collection"
+        and street.name not in gone
+        and normalize_street_name(street.name).rsplit(" ", 1)[-1] in ALIAS_SUFFIXES
+    ]
+    for street in _sample(rng, candidates, rate):
+        stem, suffix = street.name.rsplit(" ", 1)
+        aliases[f"{stem} {ALIAS_SUFFIXES[normalize_street_name(suffix)]}"] = street.name
+    return aliases, {"add": add, "delete": delete, "patch": patch}
+
+
+def _write_source(path: Path, lines: list[str]) -> Path:
+    if path.suffix == ".pdf":
+        path.write_bytes(render_pdf(paginate(lines)))
+    else:
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def _dump_yaml(path: Path, data: Any) -> None:
+    path.write_text(yaml.safe_dump(data, sort_keys=False), encoding="utf-8")
+
+
+def write_town(
+    out_dir: Path,
+    *,
+    routes: int,
+    seed: int = 0,
+    source_format: str = "txt",
+    base_url: str = DEFAULT_BASE_URL,
+    town_id: str = "synth_town",
+    override_rate: float = 0.01,
+    year: int = 2025,
+) -> SynthTown:
+    """Write a synthetic town of ``routes`` routes into ``out_dir``.
+
+    The same arguments always produce byte-identical files.
+    """
+    if routes < 1:
+        raise ValueError(f"routes must be positive: {routes}")
+    if source_format not in SOURCE_FORMATS:
+        raise ValueError(f"Unknown source format: {source_format}")
+    out_dir = Path(out_dir)
+    sources_dir = out_dir / "sources"
+    sources_dir.mkdir(parents=True, exist_ok=True)
+
+    lines, streets = route_book(routes, seed)
+    routes_source = _write_source(sources_dir / f"routes.{source_format}", lines)
+    schedule_source = _write_source(
+        sources_dir / f"guide.{source_format}", guide_lines(seed, year)
+    )
+    aliases, overrides = route_overrides(streets, seed, override_rate)
+    _dump_yaml(out_dir / "street_aliases.yaml", aliases)
+    _dump_yaml(out_dir / "route_overrides.yaml", overrides)
+    _dump_yaml(out_dir / "holiday_rules.yaml", holiday_rules(seed, year))
+
+    base_url = base_url.rstrip("/")
+    town_yaml = out_dir / "town.yaml"
+    _dump_yaml(
+        town_yaml,
+        {
+            "town_id": town_id,
+            "town_name": f"Synth {routes} ({seed})",
+            "timezone": "America/New_York",
+            "sources": {
+                "routes_pdf_url": f"{base_url}/sources/{routes_source.name}",
+                "schedule_pdf_url": f"{base_url}/sources/{schedule_source.name}",
+            },
+            "parsers": {"routes_parser": "westford_routes", "schedule_parser": "westford_guide"},
+            "rules": {
+                "recycling": {"mode": "alternating_week"},
+                "holidays": {"policy_mode": "yaml_overrides", "shift_by_one_day": True},
+            },
+            "overrides_paths": {
+                "holiday_rules_yaml": "holiday_rules.yaml",
+                "street_aliases_yaml": "street_aliases.yaml",
+                "route_overrides_yaml": "route_overrides.yaml",
+            },
+        },
+    )
+    return SynthTown(
+        town_yaml=town_yaml,
+        routes_source=routes_source,
+        schedule_source=schedule_source,
+        streets=streets,
+        aliases=aliases,
+        overrides={kind: len(entries) for kind, entries in overrides.items()},
+        route_count=routes,
+        expected_routes=routes - len(overrides["delete"]) + len(overrides["add"]),
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Write a synthetic town for scale testing")
+    parser.add_argument("--out-dir", required=True, help="Town directory to write")
+    parser.add_argument("--routes", type=int, default=10_000, help="Routes in the route book")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--format",
+        choices=SOURCE_FORMATS,
+        default="txt",
+        help="Source format (pdf also exercises text extraction)",
+    )
+    parser.add_argument(
+        "--base-url", default=DEFAULT_BASE_URL, help="URL the town directory is served at"
+    )
+    parser.add_argument("--town-id", default="synth_town")
+    parser.add_argument(
+        "--override-rate",
+        type=float,
+        default=0.01,
+        help="Share of streets given an alias, delete, patch or add",
+    )
+    parser.add_argument("--year", type=int, default=2025, help="First year of the season")
+    args = parser.parse_args(argv)
+
+    town = write_town(
+        Path(args.out_dir),
+        routes=args.routes,
+        seed=args.seed,
+        source_format=args.format,
+        base_url=args.base_url,
+        town_id=args.town_id,
+        override_rate=args.override_rate,
+        year=args.year,
+    )
+    print(json.dumps(town.to_dict(), indent=2))
+    return 0
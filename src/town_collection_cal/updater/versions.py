@@ -0,0 +1,285 @@
+"""Content-addressed DB versions behind an atomically swapped pointer.
+
+With versioning on, ``--out`` is a relative symlink into ``versions/`` next to
+it. Each published DB is stored there as ``<name>.<sha256[:16]><suffixes>``
+and recorded in a history manifest, newest first. Publishing and rolling back
+are both a single rename of the symlink, so readers (and the service's inotify
+watch) see either the old or the new DB and nothing is re-parsed.
+
+A rollback pins the pointer: later builds still store their output as new
+versions but leave the pointer alone until ``rollback --latest`` or
+``rollback --unpin``.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+
+from town_collection_cal.updater.fingerprint import read_build_fingerprint
+
+logger = logging.getLogger(__name__)
+
+VERSIONS_DIRNAME = "versions"
+HISTORY_SUFFIX = ".history.json"
+
+
+@dataclass
+class DbVersion:
+    # File name inside the versions directory.
+    file: str
+    sha256: str
+    fingerprint: str | None
+    created_at: str
+    route_count: int | None = None
+
+
+@dataclass
+class History:
+    pinned: bool = False
+    versions: list[DbVersion] = field(default_factory=list)
+
+    def find(self, ref: str) -> DbVersion:
+        """The version whose file name or sha256 starts with ``ref``."""
+        matches = [v for v in self.versions if v.file.startswith(ref) or v.sha256.startswith(ref)]
+        if len(matches) != 1:
+            found = "no" if not matches else "several"
+            raise ValueError(f"{found} DB versions match {ref!r}")
+        return matches[0]
+
+
+def versions_dir(out_path: Path) -> Path:
+    return out_path.parent / VERSIONS_DIRNAME
+
+
+def history_path(out_path: Path) -> Path:
+    return versions_dir(out_path) / (out_path.name + HISTORY_SUFFIX)
+
+
+def read_history(out_path: Path) -> History:
+    path = history_path(out_path)
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return History()
+    return History(
+        pinned=bool(data.get("pinned")),
+        versions=[DbVersion(**entry) for entry in data.get("versions", [])],
+    )
+
+
+def _write_history(out_path: Path, history: History) -> None:
+    path = history_path(out_path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(asdict(history), indent=2) + "\n", encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def current_version(out_path: Path) -> str | None:
+    """File name the pointer refers to, or None if ``out_path`` isn't a pointer."""
+    if not out_path.is_symlink():
+        return None
+    return Path(os.readlink(out_path)).name
+
+
+def swap_pointer(out_path: Path, version_file: str) -> None:
+    """Atomically point ``out_path`` at ``versions/<version_file>``."""
+    tmp_path = out_path.with_name(f".{out_path.name}.{os.getpid()}.link")
+    tmp_path.unlink(missing_ok=True)
+    # Relative, so the pointer survives the data dir being mounted elsewhere.
+    tmp_path.symlink_to(Path(VERSIONS_DIRNAME) / version_file)
+    tmp_path.replace(out_path)
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _version_name(out_path: Path, sha256: str) -> str:
+    stem, dot, suffixes = out_path.name.partition(".")
+    return f"{stem}.{sha256[:16]}{dot}{suffixes}"
+
+
+def _store(
+    out_path: Path, src: Path, *, fingerprint: str | None, route_count: int | None, move: bool
+) -> DbVersion:
+    sha256 = _sha256_file(src)
+    name = _version_name(out_path, sha256)
+    target = versions_dir(out_path) / name
+    if target.exists():
+        if move:
+            src.unlink()
+    elif move:
+        src.replace(target)
+    else:
+        try:
+            os.link(src, target)
+        except OSError:
+            shutil.copy2(src, target)
+    return DbVersion(
+        file=name,
+        sha256=sha256,
+        fingerprint=fingerprint,
+        created_at=datetime.now(UTC).isoformat(),
+        route_count=route_count,
+    )
+
+
+def _adopt_existing(out_path: Path, history: History) -> None:
+    # A plain DB from before versioning was enabled becomes the first version,
+    # so it stays available for rollback.
+    if out_path.is_symlink() or not out_path.is_file():
+        return
+    version = _store(
+        out_path,
+        out_path,
+        fingerprint=read_build_fingerprint(out_path),
+        route_count=None,
+        move=False,
+    )
+    history.versions.append(version)
+    swap_pointer(out_path, version.file)
+    logger.info("Adopted existing DB %s as version %s", out_path, version.file)
+
+
+def _prune(out_path: Path, history: History, keep: int) -> None:
+    current = current_version(out_path)
+    kept: list[DbVersion] = []
+    for index, version in enumerate(history.versions):
+        if index < keep or version.file == current:
+            kept.append(version)
+            continue
+        (versions_dir(out_path) / version.file).unlink(missing_ok=True)
+        logger.info("Pruned DB version %s", version.file)
+    history.versions = kept
+
+
+def publish_version(
+    out_path: Path,
+    write: Callable[[Path], None],
+    *,
+    fingerprint: str | None,
+    route_count: int | None,
+    keep: int,
+) -> bool:
+    """Store a new DB version and swap ``out_path`` to it.
+
+    ``write(path)`` writes the DB to ``path``. Returns False when the pointer
+    is pinned by a rollback: the version is stored but not published.
+    """
+    if keep < 1:
+        raise ValueError("keep must be >= 1")
+    vdir = versions_dir(out_path)
+    vdir.mkdir(parents=True, exist_ok=True)
+    history = read_history(out_path)
+    _adopt_existing(out_path, history)
+
+    # Same inputs build the same DB (up to generated_at): reuse the stored one.
+    version = next(
+        (v for v in history.versions if fingerprint and v.fingerprint == fingerprint), None
+    )
+    if version is None:
+        stem, dot, suffixes = out_path.name.partition(".")
+        tmp_path = vdir / f".tmp-{os.getpid()}-{stem}{dot}{suffixes}"
+        write(tmp_path)
+        version = _store(
+            out_path, tmp_path, fingerprint=fingerprint, route_count=route_count, move=True
+        )
+        history.versions = [version] + [v for v in history.versions if v.file != version.file]
+
+    published = not history.pinned
+    if published:
+        swap_pointer(out_path, version.file)
+        logger.info("DB %s now points at %s", out_path, version.file)
+    else:
+        logger.warning(
+            "DB %s is pinned to %s by a rollback; not publishing %s",
+            out_path,
+            current_version(out_path),
+            version.file,
+        )
+    _prune(out_path, history, keep)
+    _write_history(out_path, history)
+    return published
+
+
+def rollback(out_path: Path, ref: str | None = None) -> DbVersion:
+    """Point ``out_path`` at an older version and pin it there.
+
+    With no ``ref`` this is the version just before the current one.
+    """
+    history = read_history(out_path)
+    if ref is not None:
+        target = history.find(ref)
+    else:
+        files = [v.file for v in history.versions]
+        current = current_version(out_path)
+        index = files.index(current) if current in files else -1
+        if index < 0 or index + 1 >= len(files):
+            raise ValueError(f"No older DB version to roll back to for {out_path}")
+        target = history.versions[index + 1]
+    swap_pointer(out_path, target.file)
+    history.pinned = target is not history.versions[0]
+    _write_history(out_path, history)
+    return target
+
+
+def _print_history(out_path: Path) -> None:
+    history = read_history(out_path)
+    current = current_version(out_path)
+    for version in history.versions:
+        marker = "*" if version.file == current else " "
+        routes = "?" if version.route_count is None else version.route_count
+        fingerprint = (version.fingerprint or "-")[:12]
+        print(f"{marker} {version.file}  {version.created_at}  fp={fingerprint}  routes={routes}")
+    if history.pinned:
+        print("pinned: builds store new versions without publishing them")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="List or roll back published DB versions")
+    parser.add_argument("--db", required=True, help="DB pointer path (the build --out)")
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument("--list", action="store_true", help="List stored versions")
+    action.add_argument("--to", default=None, help="Version file name or sha256 prefix")
+    action.add_argument(
+        "--latest", action="store_true", help="Point at the newest version and unpin"
+    )
+    action.add_argument(
+        "--unpin", action="store_true", help="Let the next build publish again"
+    )
+    args = parser.parse_args(argv)
+
+    out_path = Path(args.db)
+    if args.list:
+        _print_history(out_path)
+        return 0
+    if args.unpin:
+        history = read_history(out_path)
+        history.pinned = False
+        _write_history(out_path, history)
+        print(f"Unpinned {out_path}")
+        return 0
+    try:
+        if args.latest:
+            history = read_history(out_path)
+            if not history.versions:
+                raise ValueError(f"No DB versions recorded for {out_path}")
+            target = rollback(out_path, history.versions[0].file)
+        else:
+            target = rollback(out_path, args.to)
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+    print(f"{out_path} -> {VERSIONS_DIRNAME}/{target.file}")
+    return 0
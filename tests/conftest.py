@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import signal
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from town_collection_cal.common.pdf_writer import paginate, render_pdf
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@dataclass
+class StubResource:
+    body: bytes
+    etag: str | None = None
+    last_modified: str | None = None
+    delay: float = 0.0
+    accept_ranges: bool = False
+    # Answer Range requests from this byte instead of the one asked for.
+    range_start: int | None = None
+
+
+@dataclass
+class StubServer:
+    """Local HTTP server serving ``resources`` by path, recording requests."""
+
+    base_url: str
+    resources: dict[str, StubResource] = field(default_factory=dict)
+    requests: list[tuple[str, dict[str, str]]] = field(default_factory=list)
+    max_in_flight: int = 0
+    _in_flight: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}{path}"
+
+    def add(self, path: str, body: bytes, **kwargs: object) -> str:
+        self.resources[path] = StubResource(body=body, **kwargs)  # type: ignore[arg-type]
+        return self.url(path)
+
+
+def _handler(server: StubServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            with server._lock:
+                server.requests.append((self.path, dict(self.headers)))
+                server._in_flight += 1
+                server.max_in_flight = max(server.max_in_flight, server._in_flight)
+            try:
+                self._respond()
+            finally:
+                with server._lock:
+                    server._in_flight -= 1
+
+        def _respond(self) -> None:
+            resource = server.resources.get(self.path)
+            if resource is None:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if resource.delay:
+                time.sleep(resource.delay)
+            if resource.etag and self.headers.get("If-None-Match") == resource.etag:
+                self.send_response(304)
+                self.send_header("ETag", resource.etag)
+                self.end_headers()
+                return
+            start = 0
+            range_header = self.headers.get("Range", "")
+            if (
+                resource.accept_ranges
+                and range_header.startswith("bytes=")
+                and self.headers.get("If-Range") in {resource.etag, None}
+            ):
+                start = int(range_header[len("bytes=") :].split("-")[0])
+                if resource.range_start is not None:
+                    start = resource.range_start
+            body = memoryview(resource.body)[start:]
+            self.send_response(206 if start else 200)
+            if start:
+                self.send_header(
+                    "Content-Range", f"bytes {start}-{len(resource.body) - 1}/{len(resource.body)}"
+                )
+            if resource.etag:
+                self.send_header("ETag", resource.etag)
+            if resource.last_modified:
+                self.send_header("Last-Modified", resource.last_modified)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+@pytest.fixture(autouse=True)
+def _restore_sighup() -> Iterator[None]:
+    """create_app and install_reload_signal replace the process's SIGHUP handler."""
+    if not hasattr(signal, "SIGHUP"):
+        yield
+        return
+    previous = signal.getsignal(signal.SIGHUP)
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGHUP, previous)
+
+
+@pytest.fixture()
+def stub_server() -> Iterator[StubServer]:
+    stub = StubServer(base_url="")
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _handler(stub))
+    stub.base_url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield stub
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+@pytest.fixture()
+def town_factory(stub_server: StubServer, tmp_path: Path) -> Callable[..., Path]:
+    """Write ``<tmp>/towns/<town_id>/town.yaml`` whose sources are fixture PDFs.
+
+    Returns a callable ``(town_id, routes_lines=None) -> town.yaml path``.
+    """
+
+    def _make(town_id: str, routes_lines: list[str] | None = None) -> Path:
+        if routes_lines is None:
+            routes_lines = (FIXTURES / "westford_routes.txt").read_text("utf-8").splitlines()
+        guide_lines = (FIXTURES / "westford_guide.txt").read_text("utf-8").splitlines()
+        routes_url = stub_server.add(f"/{town_id}/routes", render_pdf(paginate(routes_lines)))
+        schedule_url = stub_server.add(f"/{town_id}/guide", render_pdf(paginate(guide_lines)))
+        town_dir = tmp_path / "towns" / town_id
+        town_dir.mkdir(parents=True, exist_ok=True)
+        (town_dir / "route_overrides.yaml").write_text("add: []\n", encoding="utf-8")
+        town_yaml = town_dir / "town.yaml"
+        town_yaml.write_text(
+            f"""
+town_id: {town_id}
+town_name: {town_id.title()}
+timezone: America/New_York
+sources:
+  routes_pdf_url: {routes_url}
+  schedule_pdf_url: {schedule_url}
+parsers:
+  routes_parser: town_collection_cal.updater.parsers.westford_routes:parse_routes
+  schedule_parser: town_collection_cal.updater.parsers.westford_guide:parse_schedule
+rules:
+  recycling:
+    mode: alternating_week
+  holidays:
+    policy_mode: yaml_overrides
+overrides_paths:
+  route_overrides_yaml: route_overrides.yaml
+""",
+            encoding="utf-8",
+        )
+        return town_yaml
+
+    return _make
@@ -1,8 +1,12 @@
+import json
 from pathlib import Path
 
 import pytest
 
-from town_collection_cal.updater.parsers.westford_routes import parse_routes
+from town_collection_cal.common.blob_cache import INDEX_FILENAME, BlobCache
+from town_collection_cal.common.pdf_writer import paginate, write_pdf
+from town_collection_cal.config.loader import load_town_config
+from town_collection_cal.updater.parsers.westford_routes import parse_routes, tokenize_line
 
 
 def test_parse_routes_fixture() -> None:
@@ -64,11 +68,46 @@ def test_parse_routes_fixture() -> None:
     assert north_main[0].recycling_color == "BLUE"
 
 
+def test_parse_routes_fixture_snapshot() -> None:
+    result = parse_routes(Path("tests/fixtures/westford_routes.txt"), "fixture://routes")
+    expected = json.loads(
+        Path("tests/fixtures/westford_routes.expected.json").read_text(encoding="utf-8")
+    )
+    assert [route.model_dump() for route in result.routes] == expected
+
+
+def test_tokenize_line_reads_values_inside_notes() -> None:
+    tokens = tokenize_line("Forrest Rd (Thursday only 3-9) 20 - end Blue odd")
+    assert tokens.street == "Forrest Rd"
+    assert (tokens.day, tokens.color, tokens.parity) == ("Thursday", "BLUE", "odd")
+    assert tokens.bounds() == (3, 9)
+
+
+def test_parse_routes_pdf_continuation_across_pages(tmp_path: Path) -> None:
+    fixture = Path("tests/fixtures/westford_routes.txt")
+    lines = fixture.read_text(encoding="utf-8").splitlines()
+    # Four lines per page leaves "Main St" and "Littleton Rd" pending at page ends.
+    pdf_path = tmp_path / "routes.pdf"
+    write_pdf(pdf_path, paginate(lines, 4))
+
+    from_text = parse_routes(fixture, "fixture://routes").routes
+    from_pdf = parse_routes(pdf_path, "fixture://routes.pdf").routes
+    assert from_pdf == from_text
+    from_cache = parse_routes(pdf_path, "fixture://routes.pdf").routes
+    assert from_cache == from_text
+
+
 def test_parse_routes_pdf_if_available() -> None:
-    pdf_path = Path("data/cache/routes.pdf")
-    if not pdf_path.exists():
-        pytest.skip("routes.pdf not cached")
-    result = parse_routes(pdf_path, "local://routes.pdf")
+    cache_dir = Path("data/cache")
+    if not (cache_dir / INDEX_FILENAME).exists():
+        pytest.skip("no source cache")
+    config, _ = load_town_config(Path("towns/westford_ma/town.yaml"))
+    url = str(config.sources.routes_pdf_url)
+    cache = BlobCache(cache_dir, max_bytes=None)
+    entry = cache.lookup(url)
+    if entry is None:
+        pytest.skip("routes PDF not cached")
+    result = parse_routes(cache.blob_path(entry.blob), url)
     assert result.routes
 
 
@@ -0,0 +1,83 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from town_collection_cal.common import pdf_text
+from town_collection_cal.common.blob_cache import BlobCache, blob_sha256
+from town_collection_cal.common.http_cache import fetch_with_cache
+
+
+def test_identical_documents_are_stored_once(stub_server: Any, tmp_path: Path) -> None:
+    cache = BlobCache(tmp_path)
+    first = fetch_with_cache(stub_server.add("/a/routes.pdf", b"same"), cache)
+    second = fetch_with_cache(stub_server.add("/b/routes.pdf", b"same"), cache)
+
+    assert first.path == second.path
+    assert blob_sha256(first.path) == first.sha256 == hashlib.sha256(b"same").hexdigest()
+    assert [entry["urls"] for entry in cache.entries()] == [[first.url, second.url]]
+
+
+def test_concurrent_fetches_of_one_url_take_turns(stub_server: Any, tmp_path: Path) -> None:
+    body = b"shared source" * 1000
+    url = stub_server.add("/shared.pdf", body, etag='"v1"', delay=0.2)
+    cache = BlobCache(tmp_path)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(lambda _: fetch_with_cache(url, cache), range(2)))
+
+    # The second waits for the first, then only revalidates what it stored.
+    assert sorted(result.status_code for result in results) == [200, 304]
+    assert results[0].path.read_bytes() == body
+    assert not any((tmp_path / "partial").iterdir())
+
+
+def test_least_recently_used_blobs_are_evicted(stub_server: Any, tmp_path: Path) -> None:
+    urls = {
+        name: stub_server.add(f"/{name}.pdf", name.encode() * 10, etag=f'"{name}"')
+        for name in "abc"
+    }
+    # A separate instance per fetch, like separate build runs.
+    a = fetch_with_cache(urls["a"], BlobCache(tmp_path, max_bytes=25))
+    b = fetch_with_cache(urls["b"], BlobCache(tmp_path, max_bytes=25))
+    derived = tmp_path / "blobs" / "text" / f"{b.sha256}-pdfplumber-1.jsonl.gz"
+    derived.parent.mkdir()
+    derived.write_bytes(b"")
+    assert fetch_with_cache(urls["a"], BlobCache(tmp_path, max_bytes=25)).status_code == 304
+
+    fetch_with_cache(urls["c"], BlobCache(tmp_path, max_bytes=25))
+
+    assert a.path.exists() and not b.path.exists() and not derived.exists()
+    cache = BlobCache(tmp_path)
+    assert cache.lookup(urls["b"]) is None
+    # The evicted URL is fetched in full again, without stale validators.
+    again = fetch_with_cache(urls["b"], cache)
+    assert again.status_code == 200 and again.path.exists()
+    _, headers = stub_server.requests[-1]
+    assert "If-None-Match" not in headers
+
+
+def test_blobs_in_use_are_kept_over_budget(stub_server: Any, tmp_path: Path) -> None:
+    cache = BlobCache(tmp_path, max_bytes=15)
+    results = [
+        fetch_with_cache(stub_server.add(f"/{name}.pdf", name.encode() * 10), cache)
+        for name in "abc"
+    ]
+    assert all(result.path.exists() for result in results)
+    assert len(BlobCache(tmp_path).evict(15)) == 2
+
+
+def test_text_cache_uses_blob_name_not_a_rehash(
+    stub_server: Any, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    result = fetch_with_cache(stub_server.add("/doc.pdf", b"pdf bytes"), BlobCache(tmp_path))
+
+    def no_hashing(path: Path) -> str:
+        raise AssertionError(f"re-hashed {path}")
+
+    monkeypatch.setattr(pdf_text, "_sha256_file", no_hashing)
+    monkeypatch.setattr(pdf_text, "_iter_pages_uncached", lambda *args: ["page"])
+    assert pdf_text.extract_pages(result.path) == ["page"]
+    assert list((tmp_path / "blobs" / "text").glob(f"{result.sha256}-*"))
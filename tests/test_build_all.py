@@ -0,0 +1,43 @@
+import json
+from pathlib import Path
+from typing import Any
+
+from town_collection_cal.updater.build_all import main
+
+
+def test_build_all_isolates_failures_and_writes_summary(
+    tmp_path: Path, town_factory: Any
+) -> None:
+    town_factory("alpha")
+    town_factory("beta")
+    broken = town_factory("broken", routes_lines=["nothing to parse here"])
+    towns_dir = broken.parent.parent
+    out_dir = tmp_path / "generated"
+    args = [
+        "--towns-dir",
+        str(towns_dir),
+        "--out-dir",
+        str(out_dir),
+        "--cache-dir",
+        str(tmp_path / "cache"),
+        "--parse-workers",
+        "2",
+    ]
+
+    assert main(args) == 1
+    summary = json.loads((out_dir / "build_summary.json").read_text(encoding="utf-8"))
+    by_town = {town["town_id"]: town for town in summary["towns"]}
+    assert by_town["alpha"]["status"] == "built"
+    assert by_town["beta"]["status"] == "built"
+    assert by_town["alpha"]["route_count"] > 0
+    assert by_town["broken"]["status"] == "failed"
+    assert "No routes parsed" in by_town["broken"]["error"]
+    assert (out_dir / "alpha.json").exists()
+    assert not (out_dir / "broken.json").exists()
+    # alpha and beta serve identical documents, stored once.
+    assert len(list((tmp_path / "cache" / "blobs").glob("*.pdf"))) == 3
+
+    (broken.parent / "town.yaml").unlink()
+    assert main(args) == 0
+    summary = json.loads((out_dir / "build_summary.json").read_text(encoding="utf-8"))
+    assert [town["status"] for town in summary["towns"]] == ["unchanged", "unchanged"]
@@ -0,0 +1,111 @@
+import json
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from town_collection_cal.updater.build_db import EXIT_UNCHANGED, build_db, main
+
+
+def test_unchanged_inputs_skip_parse_and_write(tmp_path: Path, town_factory: Any) -> None:
+    town_yaml = town_factory("test_town")
+    out = tmp_path / "db.json"
+    cache = tmp_path / "cache"
+
+    first = build_db(town_yaml, out, cache)
+    assert not first.skipped
+    assert first.db is not None
+    assert first.db.meta.build_fingerprint == first.fingerprint
+    mtime = out.stat().st_mtime_ns
+
+    second = build_db(town_yaml, out, cache)
+    assert second.skipped
+    assert second.fingerprint == first.fingerprint
+    assert out.stat().st_mtime_ns == mtime
+
+    args = ["--town", str(town_yaml), "--out", str(out), "--cache-dir", str(cache)]
+    assert main(args) == 0
+    assert main([*args, "--exit-code"]) == EXIT_UNCHANGED
+
+
+def test_override_change_triggers_rebuild(tmp_path: Path, town_factory: Any) -> None:
+    town_yaml = town_factory("test_town")
+    out = tmp_path / "db.snap"
+    cache = tmp_path / "cache"
+    first = build_db(town_yaml, out, cache)
+
+    (town_yaml.parent / "route_overrides.yaml").write_text(
+        'add:\n  - street: "New Street"\n    weekday: "Monday"\n', encoding="utf-8"
+    )
+    second = build_db(town_yaml, out, cache)
+    assert not second.skipped
+    assert second.fingerprint != first.fingerprint
+    assert second.db is not None
+    assert "New Street" in {route.street for route in second.db.routes}
+    assert build_db(town_yaml, out, cache).skipped
+
+
+def test_per_date_shift_days_from_town_yaml(tmp_path: Path, town_factory: Any) -> None:
+    town_yaml = town_factory("test_town")
+    town_yaml.write_text(
+        town_yaml.read_text(encoding="utf-8").replace(
+            "policy_mode: yaml_overrides",
+            'policy_mode: yaml_overrides\n    shift_days_by_date: {"2025-12-25": 2}',
+        ),
+        encoding="utf-8",
+    )
+    result = build_db(town_yaml, tmp_path / "db.json", tmp_path / "cache")
+    assert result.db is not None
+    assert result.db.holiday_policy.shift_days_by_date == {date(2025, 12, 25): 2}
+
+
+def test_stage_stats_in_meta_and_stats_json(tmp_path: Path, town_factory: Any) -> None:
+    town_yaml = town_factory("test_town")
+    out = tmp_path / "db.json"
+    stats_path = tmp_path / "stats.json"
+    args = ["--town", str(town_yaml), "--out", str(out), "--cache-dir", str(tmp_path / "cache")]
+    assert main([*args, "--stats-json", str(stats_path)]) == 0
+
+    meta = json.loads(out.read_text(encoding="utf-8"))["meta"]
+    assert {
+        "fetch.routes",
+        "fetch.schedule",
+        "fingerprint",
+        "parse.routes",
+        "parse.schedule",
+        "extract",
+        "overrides",
+        "normalize",
+        "index",
+        "model",
+    } <= set(meta["build_stats"])
+    assert "write" not in meta["build_stats"]
+
+    stats = json.loads(stats_path.read_text(encoding="utf-8"))
+    assert stats["status"] == "built"
+    write = stats["stages"]["write"]
+    assert write["wall_seconds"] >= 0 and write["cpu_seconds"] >= 0
+    assert write["peak_rss_mb"] > 0
+
+
+def test_content_unchanged_rebuild_is_not_published(tmp_path: Path, town_factory: Any) -> None:
+    town_yaml = town_factory("test_town")
+    out = tmp_path / "db.json"
+    cache = tmp_path / "cache"
+    first = build_db(town_yaml, out, cache)
+    assert first.published
+    mtime = out.stat().st_mtime_ns
+
+    # A comment changes the fingerprint but not the built content.
+    town_yaml.write_text(town_yaml.read_text(encoding="utf-8") + "# note\n", encoding="utf-8")
+    second = build_db(town_yaml, out, cache)
+    assert not second.skipped
+    assert not second.published
+    assert second.diff is not None and second.diff.is_empty
+    assert out.stat().st_mtime_ns == mtime
+    sidecar = json.loads((tmp_path / "db.json.diff.json").read_text(encoding="utf-8"))
+    assert sidecar["published"] is False
+    assert sidecar["fingerprint"] == second.fingerprint
+    assert sidecar["db_fingerprint"] == first.fingerprint
+
+    third = build_db(town_yaml, out, cache)
+    assert third.skipped
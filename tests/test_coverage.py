@@ -0,0 +1,147 @@
+import json
+import random
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from town_collection_cal.common.db_file import write_db_file
+from town_collection_cal.common.db_model import (
+    CalendarPolicy,
+    Database,
+    HolidayPolicy,
+    MetaInfo,
+    RouteConstraint,
+    RouteEntry,
+)
+from town_collection_cal.common.runtime import RuntimeRoute
+from town_collection_cal.service.resolver import _matches_constraints
+from town_collection_cal.updater.build_db import build_db
+from town_collection_cal.updater.coverage import analyze_coverage, main
+
+
+def _db(routes: list[RouteEntry]) -> Database:
+    return Database(
+        meta=MetaInfo(generated_at=datetime.now(UTC), town_id="t", sources={}),
+        calendar_policy=CalendarPolicy(recycling_mode="none"),
+        holiday_policy=HolidayPolicy(),
+        routes=routes,
+    )
+
+
+def _route(
+    street: str, weekday: str, *constraints: tuple[str | None, int | None, int | None]
+) -> RouteEntry:
+    return RouteEntry(
+        street=street,
+        street_normalized=street.lower(),
+        weekday=weekday,
+        constraints=[
+            RouteConstraint(parity=parity, range_min=low, range_max=high)  # type: ignore[arg-type]
+            for parity, low, high in constraints
+        ],
+    )
+
+
+def test_overlaps_gaps_and_unreachable_routes(tmp_path: Path) -> None:
+    db = _db(
+        [
+            _route("Main St", "Monday", ("odd", 1, 99), ("even", 2, 50)),
+            _route("Main St", "Tuesday", ("odd", 101, None), ("even", 40, 100)),
+            _route("Main St", "Monday", ("even", 200, None)),
+            _route("Oak Rd", "Monday", ("odd", None, None)),
+            _route("Oak Rd", "Friday", ("odd", 1, 9)),
+            _route("Elm St", "Monday"),
+            _route("Elm St", "Friday", ("even", None, None)),
+            _route("Pine Rd", "Monday", (None, 10, 5)),
+        ]
+    )
+    report = analyze_coverage(db)
+
+    assert [(o.street_normalized, o.parity, o.range_min, o.range_max) for o in report.overlaps] == [
+        ("main st", "even", 40, 50),
+        ("oak rd", "odd", 1, 9),
+    ]
+    assert report.overlaps[0].routes == [0, 1] and report.overlaps[0].conflicting
+    assert [(g.street_normalized, g.parity, g.range_min, g.range_max) for g in report.gaps] == [
+        ("main st", "even", 102, 198),
+        ("oak rd", "even", None, None),
+    ]
+    assert report.gaps[1].reason == "no route covers even numbers"
+    assert {(u.street_normalized, u.routes[-1], u.reason) for u in report.unreachable} == {
+        ("oak rd", 4, "shadowed by earlier routes"),
+        ("elm st", 6, "after unconstrained route"),
+        ("pine rd", 7, "constraints match nothing"),
+    }
+    assert report.has_problems
+
+    path = tmp_path / "db.json.gz"
+    write_db_file(db, path)
+    assert main(["--db", str(path)]) == 1
+
+
+def _first_matches(routes: list[RouteEntry], numbers: range) -> dict[int | None, int]:
+    runtime = [RuntimeRoute.from_model(route) for route in routes]
+    first: dict[int | None, int] = {}
+    for number in [None, *numbers]:
+        for idx, route in enumerate(runtime):
+            if _matches_constraints(route, number):
+                first[number] = idx
+                break
+    return first
+
+
+def _covered(issues: list[Any], parity: str, limit: int) -> set[int]:
+    numbers: set[int] = set()
+    for issue in issues:
+        if issue.parity == parity and issue.range_min is not None:
+            high = limit if issue.range_max is None else issue.range_max
+            numbers.update(range(issue.range_min, high + 1, 2))
+    return numbers
+
+
+def _check_random_street(seed: int) -> None:
+    rng = random.Random(seed)
+    limit = 70
+
+    def constraint() -> tuple[str | None, int | None, int | None]:
+        low = rng.choice([None, rng.randint(0, 50)])
+        high = rng.choice([None, rng.randint(0, 50)])
+        return rng.choice([None, "odd", "even"]), low, high
+
+    routes = [
+        _route("Main St", rng.choice(["Monday", "Tuesday"]), *(constraint() for _ in range(n)))
+        for n in (rng.randint(1, 2) for _ in range(rng.randint(1, 6)))
+    ]
+    report = analyze_coverage(_db(routes))
+    first = _first_matches(routes, range(limit + 1))
+
+    assert {issue.routes[-1] for issue in report.unreachable} == set(range(len(routes))) - set(
+        first.values()
+    )
+    runtime = [RuntimeRoute.from_model(route) for route in routes]
+    for issue in report.unreachable:
+        if issue.reason == "shadowed by earlier routes":
+            route = runtime[issue.routes[-1]]
+            owners = {first[n] for n in range(limit + 1) if _matches_constraints(route, n)}
+            assert issue.routes[:-1] == sorted(owners)
+    for parity, remainder in (("odd", 1), ("even", 0)):
+        side = range(remainder, limit + 1, 2)
+        shared = {n for n in side if sum(_matches_constraints(r, n) for r in runtime) > 1}
+        assert _covered(report.overlaps, parity, limit) == shared
+        matched = [n for n in side if n in first]
+        holes = {n for n in side if matched and matched[0] < n < matched[-1] and n not in first}
+        assert _covered(report.gaps, parity, limit) & set(side) == holes
+
+
+def test_sweep_agrees_with_first_match_resolution() -> None:
+    for seed in range(200):
+        _check_random_street(seed)
+
+
+def test_validate_only_build_reports_coverage(tmp_path: Path, town_factory: Any) -> None:
+    town_yaml = town_factory("test_town")
+    result = build_db(town_yaml, tmp_path / "db.json", tmp_path / "cache", validate_only=True)
+    assert result.coverage is not None
+    assert result.coverage.routes_checked == len(result.db.routes)  # type: ignore[union-attr]
+    assert "coverage" in result.stats
+    assert json.loads(json.dumps(result.coverage.to_dict()))["streets_checked"] > 0
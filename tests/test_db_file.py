@@ -0,0 +1,63 @@
+import gzip
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from town_collection_cal.common.db_file import load_db, write_db_file
+from town_collection_cal.common.db_model import (
+    CalendarPolicy,
+    Database,
+    HolidayPolicy,
+    MetaInfo,
+    RouteEntry,
+)
+from town_collection_cal.updater.build_db import build_db
+
+
+def _db() -> Database:
+    return Database(
+        meta=MetaInfo(generated_at=datetime.now(UTC), town_id="test", sources={}),
+        calendar_policy=CalendarPolicy(recycling_mode="none"),
+        holiday_policy=HolidayPolicy(),
+        aliases={"boston rd": "boston road"},
+        routes=[
+            RouteEntry(street="Boston Road", street_normalized="boston road", weekday="Monday")
+        ],
+        street_index={"boston road": [0]},
+    )
+
+
+def test_gzip_db_round_trip_is_compact_and_deterministic(tmp_path: Path) -> None:
+    db = _db()
+    path = tmp_path / "db.json.gz"
+    write_db_file(db, path)
+    first = path.read_bytes()
+
+    assert gzip.decompress(first) == db.model_dump_json().encode("utf-8")
+    assert load_db(path) == db
+    write_db_file(db, path)
+    assert path.read_bytes() == first
+    assert not (tmp_path / "db.json.gz.tmp").exists()
+
+
+def test_zstd_db_round_trip(tmp_path: Path) -> None:
+    pytest.importorskip("zstandard")
+    db = _db()
+    path = tmp_path / "db.json.zst"
+    write_db_file(db, path)
+    assert load_db(path) == db
+
+
+def test_build_db_compressed_output_skips_rebuild(tmp_path: Path, town_factory: Any) -> None:
+    town_yaml = town_factory("test_town")
+    out = tmp_path / "db.json.gz"
+    cache = tmp_path / "cache"
+
+    first = build_db(town_yaml, out, cache)
+    assert first.published
+    loaded = load_db(out)
+    assert isinstance(loaded, Database)
+    assert loaded.meta.build_fingerprint == first.fingerprint
+    assert build_db(town_yaml, out, cache).skipped
@@ -0,0 +1,109 @@
+import os
+import signal
+import threading
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from town_collection_cal.common.db_file import write_db_file
+from town_collection_cal.common.db_model import (
+    CalendarPolicy,
+    Database,
+    HolidayPolicy,
+    MetaInfo,
+    RouteEntry,
+)
+from town_collection_cal.service import db as service_db
+from town_collection_cal.service.db import DbLoader, install_reload_signal
+
+
+def _write(path: Path, weekday: str) -> None:
+    db = Database(
+        meta=MetaInfo(generated_at=datetime.now(UTC), town_id="test", sources={}),
+        calendar_policy=CalendarPolicy(recycling_mode="none"),
+        holiday_policy=HolidayPolicy(),
+        routes=[RouteEntry(street="Main St", street_normalized="main street", weekday=weekday)],
+    )
+    write_db_file(db, path)
+
+
+def _weekday(loader: DbLoader) -> str | None:
+    return loader.get_db().candidates("main street")[0].weekday
+
+
+def test_poll_reloads_same_mtime_replacement(tmp_path: Path) -> None:
+    path = tmp_path / "db.json"
+    _write(path, "Monday")
+    loader = DbLoader(path, reload_interval_seconds=0)
+    assert _weekday(loader) == "Monday"
+    mtime_ns = path.stat().st_mtime_ns
+
+    _write(path, "Friday")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    assert _weekday(loader) == "Friday"
+    assert loader.status()["generation"] == 2
+    assert loader.status()["last_reload_reason"] == "poll"
+
+
+def test_inotify_reload_on_atomic_replace(tmp_path: Path) -> None:
+    path = tmp_path / "db.json"
+    _write(path, "Monday")
+    loader = DbLoader(path, reload_interval_seconds=3600, reload_mode="auto")
+    try:
+        assert _weekday(loader) == "Monday"
+        if not loader.watching:
+            pytest.skip("inotify not available")
+        assert loader.status()["mode"] == "inotify"
+
+        _write(path, "Friday")
+        deadline = time.monotonic() + 5
+        while _weekday(loader) != "Friday" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert _weekday(loader) == "Friday"
+        assert loader.status()["last_reload_reason"] == "inotify"
+        assert loader.status()["generation"] == 2
+    finally:
+        loader.close()
+
+
+def test_stat_backstop_catches_changes_the_watch_misses(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(service_db, "WATCH_BACKSTOP_SECONDS", 0.0)
+    for name, weekday in (("a", "Monday"), ("b", "Friday")):
+        (tmp_path / name).mkdir()
+        _write(tmp_path / name / "db.json", weekday)
+    link = tmp_path / "current"
+    link.symlink_to("a")
+    loader = DbLoader(link / "db.json", reload_interval_seconds=0, reload_mode="auto")
+    try:
+        assert _weekday(loader) == "Monday"
+        if not loader.watching:
+            pytest.skip("inotify not available")
+
+        # Repointing the directory symlink raises no event in the watched directory.
+        (tmp_path / "next").symlink_to("b")
+        (tmp_path / "next").replace(link)
+        assert _weekday(loader) == "Friday"
+        assert loader.watching
+        assert loader.status()["last_reload_reason"] == "poll"
+    finally:
+        loader.close()
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="no SIGHUP")
+def test_sighup_forces_reload(tmp_path: Path) -> None:
+    assert threading.current_thread() is threading.main_thread()
+    path = tmp_path / "db.json"
+    _write(path, "Monday")
+    loader = DbLoader(path, reload_interval_seconds=3600)
+    loader.get_db()
+    assert install_reload_signal(loader)
+    os.kill(os.getpid(), signal.SIGHUP)
+    loader.get_db()
+    status = loader.status()
+    assert status["generation"] == 2
+    assert status["last_reload_reason"] == "sighup"
+    assert status["last_reload_at"] is not None
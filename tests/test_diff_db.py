@@ -0,0 +1,95 @@
+from datetime import UTC, date, datetime
+from pathlib import Path
+
+from town_collection_cal.common.db_model import (
+    CalendarPolicy,
+    Database,
+    HolidayPolicy,
+    MetaInfo,
+    RouteConstraint,
+    RouteEntry,
+)
+from town_collection_cal.common.snapshot import write_snapshot
+from town_collection_cal.updater.__main__ import main as updater_main
+from town_collection_cal.updater.diff_db import diff_databases, main
+
+
+def _db(routes: list[RouteEntry], **kwargs: object) -> Database:
+    return Database(
+        meta=MetaInfo(generated_at=datetime.now(UTC), town_id="t", sources={}),
+        calendar_policy=CalendarPolicy(recycling_mode="none"),
+        holiday_policy=kwargs.get("holiday_policy", HolidayPolicy()),  # type: ignore[arg-type]
+        aliases=kwargs.get("aliases", {}),  # type: ignore[arg-type]
+        routes=routes,
+    )
+
+
+def _route(street: str, weekday: str, parity: str | None = None) -> RouteEntry:
+    return RouteEntry(
+        street=street,
+        street_normalized=street.lower(),
+        weekday=weekday,
+        constraints=[RouteConstraint(parity=parity)] if parity else [],
+    )
+
+
+def test_timestamp_only_rebuild_is_empty() -> None:
+    routes = [_route("Main St", "Monday", "odd"), _route("Oak Rd", "Tuesday")]
+    old = _db(routes)
+    # Order across streets does not matter, only within one.
+    new = _db(list(reversed(routes)))
+    assert diff_databases(old, new).is_empty
+
+
+def test_reordering_a_streets_routes_is_a_change() -> None:
+    # The resolver takes the first match, so these reorders change resolution.
+    routes = [_route("Main St", "Monday", "odd"), _route("Main St", "Tuesday")]
+    diff = diff_databases(_db(routes), _db(list(reversed(routes))))
+    assert [r["street_normalized"] for r in diff.routes_reordered] == ["main st"]
+    assert [r["weekday"] for r in diff.routes_reordered[0]["after"]] == ["Tuesday", "Monday"]
+    assert "1 streets reordered" in diff.summary()
+
+    same = [_route("Elm St", "Monday"), _route("Elm St", "Friday")]
+    diff = diff_databases(_db(same), _db(list(reversed(same))))
+    assert [c["before"][0]["weekday"] for c in diff.routes_changed] == ["Monday"]
+    assert not diff.is_empty
+
+
+def test_routes_aliases_and_policies() -> None:
+    old = _db(
+        [_route("Main St", "Monday", "odd"), _route("Oak Rd", "Friday")],
+        aliases={"main": "main st", "elm": "elm st"},
+    )
+    new = _db(
+        [_route("Main St", "Tuesday", "odd"), _route("Pine Rd", "Friday")],
+        aliases={"main": "main street", "birch": "birch rd"},
+        holiday_policy=HolidayPolicy(shift_holidays=[date(2025, 7, 4)]),
+    )
+    diff = diff_databases(old, new)
+    assert [r["street"] for r in diff.routes_added] == ["Pine Rd"]
+    assert [r["street"] for r in diff.routes_removed] == ["Oak Rd"]
+    assert len(diff.routes_changed) == 1
+    change = diff.routes_changed[0]
+    assert change["constraints"][0]["parity"] == "odd"
+    assert change["before"][0]["weekday"] == "Monday"
+    assert change["after"][0]["weekday"] == "Tuesday"
+    assert diff.aliases_added == {"birch": "birch rd"}
+    assert diff.aliases_removed == {"elm": "elm st"}
+    assert diff.aliases_changed == {"main": {"before": "main st", "after": "main street"}}
+    assert diff.holiday_policy is not None
+    assert diff.calendar_policy is None
+    assert diff.summary().startswith("routes +1 -1 ~1")
+
+
+def test_cli_compares_json_and_snapshot(tmp_path: Path) -> None:
+    db = _db([_route("Main St", "Monday")])
+    json_path = tmp_path / "db.json"
+    json_path.write_text(db.model_dump_json(), encoding="utf-8")
+    snap_path = tmp_path / "db.snap"
+    write_snapshot(db, snap_path)
+    assert main([str(json_path), str(snap_path)]) == 0
+
+    changed = tmp_path / "changed.json"
+    changed.write_text(_db([_route("Main St", "Friday")]).model_dump_json(), encoding="utf-8")
+    assert main([str(json_path), str(changed), "--json"]) == 1
+    assert updater_main(["diff-db", str(json_path), "--json", str(changed)]) == 1
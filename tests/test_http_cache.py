@@ -0,0 +1,96 @@
+import hashlib
+import json
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+from town_collection_cal.common.blob_cache import BlobCache
+from town_collection_cal.common.http_cache import FetchRequest, fetch_all, fetch_with_cache
+
+
+def test_fetch_sends_conditional_headers(stub_server: Any, tmp_path: Path) -> None:
+    url = stub_server.add(
+        "/routes.pdf", b"routes", etag='"v1"', last_modified="Mon, 06 Apr 2025 00:00:00 GMT"
+    )
+    cache = BlobCache(tmp_path)
+    first = fetch_with_cache(url, cache)
+    assert first.updated and first.status_code == 200
+
+    second = fetch_with_cache(url, cache)
+    assert not second.updated and second.status_code == 304
+    assert second.sha256 == first.sha256
+    _, headers = stub_server.requests[-1]
+    assert headers["If-None-Match"] == '"v1"'
+    assert headers["If-Modified-Since"] == "Mon, 06 Apr 2025 00:00:00 GMT"
+
+
+def test_fetch_all_runs_concurrently_with_host_cap(stub_server: Any, tmp_path: Path) -> None:
+    fetches = []
+    for idx in range(4):
+        url = stub_server.add(f"/doc{idx}.pdf", b"x" * idx, delay=0.3)
+        fetches.append(FetchRequest(f"doc{idx}", url))
+
+    results = fetch_all(fetches, BlobCache(tmp_path), max_workers=4, per_host_limit=2)
+
+    assert set(results) == {"doc0", "doc1", "doc2", "doc3"}
+    assert stub_server.max_in_flight == 2
+    assert all(r.elapsed_seconds >= 0.3 for r in results.values())
+
+
+def test_fetch_streams_large_body_with_bounded_memory(stub_server: Any, tmp_path: Path) -> None:
+    body = bytes(range(256)) * (128 * 1024)  # 32 MiB
+    url = stub_server.add("/big.pdf", body, etag='"big"')
+
+    tracemalloc.start()
+    result = fetch_with_cache(url, BlobCache(tmp_path))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert result.sha256 == hashlib.sha256(body).hexdigest()
+    assert result.path.stat().st_size == len(body)
+    assert peak < len(body) // 4
+    assert not any((tmp_path / "partial").iterdir())
+
+
+def test_fetch_resumes_partial_download(stub_server: Any, tmp_path: Path) -> None:
+    body = b"0123456789" * 1000
+    url = stub_server.add("/doc.pdf", body, etag='"v2"', accept_ranges=True)
+    cache = BlobCache(tmp_path)
+    partial, partial_meta = cache.partial_paths(url)
+    partial.parent.mkdir(parents=True)
+    partial.write_bytes(body[:4000])
+    partial_meta.write_text(
+        json.dumps({"etag": '"v2"', "last_modified": None, "url": url}), encoding="utf-8"
+    )
+
+    result = fetch_with_cache(url, cache)
+
+    _, headers = stub_server.requests[-1]
+    assert headers["Range"] == "bytes=4000-"
+    assert result.status_code == 206
+    assert result.sha256 == hashlib.sha256(body).hexdigest()
+    assert result.path.read_bytes() == body
+    assert not partial_meta.exists()
+    entry = cache.lookup(url)
+    assert entry is not None and entry.etag == '"v2"'
+
+
+def test_partial_response_from_the_wrong_offset_is_refetched(
+    stub_server: Any, tmp_path: Path
+) -> None:
+    body = b"0123456789" * 1000
+    url = stub_server.add("/doc.pdf", body, etag='"v2"', accept_ranges=True, range_start=2000)
+    cache = BlobCache(tmp_path)
+    partial, partial_meta = cache.partial_paths(url)
+    partial.parent.mkdir(parents=True)
+    partial.write_bytes(body[:4000])
+    partial_meta.write_text(
+        json.dumps({"etag": '"v2"', "last_modified": None, "url": url}), encoding="utf-8"
+    )
+
+    result = fetch_with_cache(url, cache)
+
+    assert [headers.get("Range") for _, headers in stub_server.requests] == ["bytes=4000-", None]
+    assert result.status_code == 200
+    assert result.path.read_bytes() == body
+    assert result.sha256 == hashlib.sha256(body).hexdigest()
@@ -0,0 +1,27 @@
+import json
+import subprocess
+import sys
+
+# Modules the service must not load at import time (see service/app.py).
+HEAVY_MODULES = {
+    "pdfplumber",
+    "rapidfuzz",
+    "requests",
+    "usaddress",
+    "town_collection_cal.common.http_cache",
+    "town_collection_cal.updater.build_db",
+    "town_collection_cal.updater.overrides",
+}
+
+
+def test_service_import_skips_heavy_dependencies() -> None:
+    code = (
+        "import json, sys\n"
+        "import town_collection_cal.service.app\n"
+        "print(json.dumps(sorted(sys.modules)))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    loaded = set(json.loads(output))
+    assert not HEAVY_MODULES & loaded
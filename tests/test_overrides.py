@@ -0,0 +1,108 @@
+import logging
+import random
+from pathlib import Path
+
+import pytest
+import yaml
+
+from town_collection_cal.common.db_model import RouteConstraint, RouteEntry
+from town_collection_cal.common.normalize import normalize_street_name
+from town_collection_cal.updater import overrides
+from town_collection_cal.updater.overrides import apply_route_overrides
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday"]
+
+
+def _route(street: str, weekday: str, color: str, parity: str | None) -> RouteEntry:
+    return RouteEntry(
+        street=street,
+        street_normalized=normalize_street_name(street),
+        weekday=weekday,
+        recycling_color=color,
+        constraints=[RouteConstraint(parity=parity)] if parity else [],
+    )
+
+
+def _scan_reference(routes: list[RouteEntry], data: dict) -> list[RouteEntry]:
+    """Straightforward full-scan application, for equivalence checks."""
+    updated = list(routes)
+    for entry in data.get("delete", []):
+        match = overrides._parse_match(entry)
+        updated = [r for r in updated if not overrides._match_route(r, match)]
+    for entry in data.get("patch", []):
+        match = overrides._parse_match(entry)
+        for route in updated:
+            if overrides._match_route(route, match):
+                for field in ("weekday", "recycling_color"):
+                    if field in entry:
+                        setattr(route, field, entry[field])
+    for entry in data.get("add", []):
+        updated.append(overrides._build_route(entry))
+    return updated
+
+
+def test_indexed_overrides_match_full_scan(tmp_path: Path) -> None:
+    rng = random.Random(3)
+    streets = [f"Street {i} Rd" for i in range(40)]
+
+    def make_routes() -> list[RouteEntry]:
+        rng_routes = random.Random(5)
+        return [
+            _route(
+                rng_routes.choice(streets),
+                rng_routes.choice(WEEKDAYS),
+                rng_routes.choice(["BLUE", "GREEN"]),
+                rng_routes.choice([None, "odd", "even"]),
+            )
+            for _ in range(400)
+        ]
+
+    def entry() -> dict:
+        item = {"street": rng.choice(streets + ["Unknown Way"]).upper()}
+        if rng.random() < 0.5:
+            item["weekday"] = rng.choice(WEEKDAYS).lower()
+        if rng.random() < 0.3:
+            item["parity"] = rng.choice(["odd", "even"])
+        return item
+
+    data = {
+        "delete": [entry() for _ in range(30)],
+        "patch": [{**entry(), "recycling_color": rng.choice(["BLUE", "GREEN"])} for _ in range(30)],
+        "add": [{"street": "New Rd", "weekday": "Friday"}],
+    }
+    path = tmp_path / "route_overrides.yaml"
+    path.write_text(yaml.safe_dump(data), encoding="utf-8")
+
+    expected = _scan_reference(make_routes(), data)
+    actual = apply_route_overrides(make_routes(), path)
+    assert [r.model_dump() for r in actual] == [r.model_dump() for r in expected]
+
+
+def test_override_logging(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    routes = [
+        _route("Main St", "Monday", "BLUE", "odd"),
+        _route("Main St", "Monday", "GREEN", "even"),
+        _route("Oak Rd", "Tuesday", "BLUE", None),
+    ]
+    path = tmp_path / "route_overrides.yaml"
+    path.write_text(
+        yaml.safe_dump(
+            {
+                "delete": [{"street": "Main St", "parity": "odd"}, {"street": "Elm St"}],
+                "patch": [{"street": "Oak Rd", "weekday": "tuesday"}],
+            }
+        ),
+        encoding="utf-8",
+    )
+    with caplog.at_level(logging.INFO, logger=overrides.__name__):
+        result = apply_route_overrides(routes, path)
+
+    assert [(r.street, r.weekday, r.recycling_color) for r in result] == [
+        ("Main St", "Monday", "GREEN"),
+        ("Oak Rd", "tuesday", "BLUE"),
+    ]
+    assert caplog.messages == [
+        "Route override delete: main street removed=1",
+        "Route override delete: elm street removed=0",
+        "Route override patch: oak road",
+    ]
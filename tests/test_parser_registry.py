@@ -0,0 +1,92 @@
+import json
+import subprocess
+import sys
+from collections.abc import Iterator
+from importlib.metadata import EntryPoint
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from town_collection_cal.updater.parsers import registry
+from town_collection_cal.updater.parsers.westford_routes import parse_routes
+
+FIXTURES = Path(__file__).parent / "fixtures"
+PDF_MODULES = {"pdfplumber", "pdfminer", "pypdfium2"}
+
+
+@pytest.fixture()
+def fresh_registry() -> Iterator[None]:
+    registry.available_parsers.cache_clear()
+    registry.load_parser.cache_clear()
+    yield
+    registry.available_parsers.cache_clear()
+    registry.load_parser.cache_clear()
+
+
+def test_load_parser_by_name_or_path_is_cached(fresh_registry: None) -> None:
+    by_name = registry.load_parser("westford_routes")
+    assert by_name is parse_routes
+    assert registry.load_parser("westford_routes") is by_name
+    assert registry.load_parser(registry.BUILTIN_PARSERS["westford_routes"]) is by_name
+    assert registry.load_parser.cache_info().hits == 1
+
+    with pytest.raises(ValueError, match="Unknown parser 'nope'"):
+        registry.load_parser("nope")
+
+
+def test_entry_point_parsers_are_discovered(
+    fresh_registry: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    plugin = EntryPoint("other_town", "json:dumps", registry.ENTRY_POINT_GROUP)
+    conflict = EntryPoint("westford_routes", "json:loads", registry.ENTRY_POINT_GROUP)
+    monkeypatch.setattr(registry, "entry_points", lambda group: [plugin, conflict])
+
+    parsers = registry.available_parsers()
+    assert parsers["other_town"].target == "json:dumps"
+    assert parsers["westford_routes"].source == "builtin"
+    assert registry.load_parser("other_town") is json.dumps
+
+
+def test_text_sources_never_import_pdf_libraries(
+    tmp_path: Path, stub_server: Any
+) -> None:
+    routes_url = stub_server.add(
+        "/txt/routes.txt", (FIXTURES / "westford_routes.txt").read_bytes()
+    )
+    guide_url = stub_server.add("/txt/guide.txt", (FIXTURES / "westford_guide.txt").read_bytes())
+    town_yaml = tmp_path / "town.yaml"
+    town_yaml.write_text(
+        f"""
+town_id: txt_town
+town_name: Txt Town
+timezone: America/New_York
+sources:
+  routes_pdf_url: {routes_url}
+  schedule_pdf_url: {guide_url}
+parsers:
+  routes_parser: westford_routes
+  schedule_parser: westford_guide
+rules:
+  recycling:
+    mode: alternating_week
+  holidays:
+    policy_mode: yaml_overrides
+""",
+        encoding="utf-8",
+    )
+    code = (
+        "import json, sys\n"
+        "from pathlib import Path\n"
+        "from town_collection_cal.updater.build_db import build_db\n"
+        f"result = build_db(Path({str(town_yaml)!r}), Path({str(tmp_path / 'db.json')!r}),"
+        f" Path({str(tmp_path / 'cache')!r}))\n"
+        "print(json.dumps({'routes': len(result.db.routes), 'modules': sorted(sys.modules)}))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    report = json.loads(output.splitlines()[-1])
+    assert report["routes"] > 0
+    assert not {name.split(".")[0] for name in report["modules"]} & PDF_MODULES
+    assert len(list((tmp_path / "cache" / "blobs").glob("*.txt"))) == 2
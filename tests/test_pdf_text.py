@@ -0,0 +1,107 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from town_collection_cal.common import pdf_text
+from town_collection_cal.common.pdf_writer import paginate, write_pdf
+
+
+def test_extracted_text_cached_by_content_hash(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls: list[Path] = []
+
+    def fake_extract(
+        path: Path, workers: int | None = None, backend: pdf_text.TextBackend | None = None
+    ) -> list[str]:
+        calls.append(path)
+        return [f"page one {path.read_bytes()!r}", "page two"]
+
+    monkeypatch.setattr(pdf_text, "_iter_pages_uncached", fake_extract)
+    source = tmp_path / "routes.pdf"
+    source.write_bytes(b"v1")
+
+    first = pdf_text.extract_pages(source)
+    second = pdf_text.extract_pages(source)
+    assert first == second == ["page one b'v1'", "page two"]
+    assert len(calls) == 1
+    assert list((tmp_path / "text").glob("*.jsonl.gz"))
+
+    source.write_bytes(b"v2")
+    assert pdf_text.extract_text(source) == "page one b'v2'\npage two"
+    assert len(calls) == 2
+
+
+def test_text_sources_bypass_cache(tmp_path: Path) -> None:
+    source = tmp_path / "routes.txt"
+    source.write_text("Boston Road Thursday BLUE\n", encoding="utf-8")
+    assert pdf_text.extract_text(source) == "Boston Road Thursday BLUE\n"
+    assert not (tmp_path / "text").exists()
+
+
+def test_parallel_extraction_preserves_page_order(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(pdf_text, "MIN_PAGES_FOR_POOL", 2)
+    pages = [[f"Street {page}-{line} Rd Monday Blue" for line in range(3)] for page in range(6)]
+    source = tmp_path / "routes.pdf"
+    write_pdf(source, pages)
+
+    serial = pdf_text.extract_pages(source, cache_dir=tmp_path / "serial", workers=1)
+    parallel = pdf_text.extract_pages(source, cache_dir=tmp_path / "parallel", workers=3)
+    assert parallel == serial == ["\n".join(lines) for lines in pages]
+
+
+def test_parallel_extraction_keeps_a_bounded_window_in_flight(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    submitted: list[tuple[object, ...]] = []
+
+    class RecordingPool(ThreadPoolExecutor):
+        def __init__(self, max_workers: int, mp_context: Any) -> None:
+            super().__init__(max_workers=max_workers)
+
+        def submit(self, fn: Any, /, *args: Any, **kwargs: Any) -> Future[Any]:
+            submitted.append(args)
+            return super().submit(fn, *args, **kwargs)
+
+    monkeypatch.setattr(pdf_text, "ProcessPoolExecutor", RecordingPool)
+    monkeypatch.setattr(pdf_text, "MIN_PAGES_FOR_POOL", 2)
+    pages = [[f"Street {page} Rd Monday Blue"] for page in range(40)]
+    source = tmp_path / "routes.pdf"
+    write_pdf(source, pages)
+
+    extracted = pdf_text.iter_pages(source, workers=2)
+    assert next(extracted) == pages[0][0]
+    assert len(submitted) == 2 * pdf_text.CHUNKS_IN_FLIGHT_PER_WORKER + 1
+    assert list(extracted) == [lines[0] for lines in pages[1:]]
+    assert len(submitted) == 2 * 4
+
+
+def test_truncated_cache_is_re_extracted(tmp_path: Path) -> None:
+    pages = [[f"Street {page} Rd Monday Blue"] for page in range(4)]
+    source = tmp_path / "routes.pdf"
+    write_pdf(source, pages)
+    expected = pdf_text.extract_pages(source, workers=1)
+
+    cache_file = next((tmp_path / "text").glob("*.jsonl.gz"))
+    cache_file.write_bytes(cache_file.read_bytes()[:-12])
+    assert list(pdf_text.iter_pages(source, workers=1)) == expected
+    assert pdf_text.extract_pages(source, workers=1) == expected
+
+
+def test_backends_agree_and_cache_separately(tmp_path: Path) -> None:
+    lines = Path("tests/fixtures/westford_routes.txt").read_text(encoding="utf-8").splitlines()
+    source = tmp_path / "routes.pdf"
+    write_pdf(source, paginate(lines))
+
+    plumber = pdf_text.extract_pages(source, workers=1, backend="pdfplumber")
+    with pdf_text.use_text_backend("pypdfium2"):
+        pages = pdf_text.iter_pages(source, workers=1)
+    assert list(pages) == plumber
+    assert len(list((tmp_path / "text").glob("*.jsonl.gz"))) == 2
+
+    with pytest.raises(ValueError, match="Unknown text backend"):
+        pdf_text.extract_pages(source, backend="nope")
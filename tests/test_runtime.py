@@ -0,0 +1,56 @@
+from datetime import UTC, datetime
+
+from town_collection_cal.common.db_model import (
+    CalendarPolicy,
+    Database,
+    HolidayPolicy,
+    MetaInfo,
+    RouteConstraint,
+    RouteEntry,
+)
+from town_collection_cal.common.runtime import RuntimeDb
+
+
+def _db() -> Database:
+    return Database(
+        meta=MetaInfo(generated_at=datetime.now(UTC), town_id="test", sources={}),
+        calendar_policy=CalendarPolicy(recycling_mode="none"),
+        holiday_policy=HolidayPolicy(),
+        routes=[
+            RouteEntry(
+                street="Main St",
+                street_normalized="main street",
+                weekday="Wednesday",
+                recycling_color="GREEN",
+                constraints=[RouteConstraint(range_min=1, range_max=110)],
+            ),
+            RouteEntry(street="Acton Rd", street_normalized="acton road", weekday="Monday"),
+            RouteEntry(
+                street="Main Street",
+                street_normalized="main street",
+                weekday="Wednesday",
+                recycling_color="BLUE",
+                constraints=[RouteConstraint(parity="even", range_min=112)],
+            ),
+        ],
+    )
+
+
+def test_runtime_db_matches_pydantic_routes() -> None:
+    db = _db()
+    runtime = RuntimeDb.from_database(db)
+
+    assert runtime.route_count == 3
+    assert runtime.street_count() == 2
+    assert runtime.street_names() == ("Acton Rd", "Main St", "Main Street")
+    assert runtime.recycling_colors() == ("BLUE", "GREEN")
+    main = runtime.candidates("main street")
+    assert [r.to_dict() for r in main] == [db.routes[0].model_dump(), db.routes[2].model_dump()]
+    assert runtime.candidates("missing") == ()
+
+
+def test_runtime_routes_share_interned_codes() -> None:
+    db = Database.model_validate_json(_db().model_dump_json())
+    runtime = RuntimeDb.from_database(db)
+    first, second = runtime.candidates("main street")
+    assert first.weekday is second.weekday
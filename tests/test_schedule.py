@@ -1,6 +1,7 @@
 from datetime import date
 
 from town_collection_cal.common.db_model import CalendarPolicy, HolidayPolicy
+from town_collection_cal.common.holidays import compile_holiday_policy
 from town_collection_cal.service.schedule import generate_schedule
 
 
@@ -92,3 +93,62 @@ def test_schedule_holiday_shift_after_date() -> None:
     dates = [e.date for e in events]
     assert date(2025, 4, 10) not in dates
     assert date(2025, 4, 11) in dates
+
+
+def test_schedule_holiday_shift_multiple_days_and_cascade() -> None:
+    calendar_policy = CalendarPolicy(recycling_mode="none")
+
+    # Monday holiday shifting pickups by two days: Wednesday -> Friday.
+    two_day = HolidayPolicy(shift_holidays=[date(2025, 4, 7)], shift_days=2)
+    events = generate_schedule(
+        start_date=date(2025, 4, 6),
+        days=7,
+        trash_weekday="Wednesday",
+        recycling_color=None,
+        calendar_policy=calendar_policy,
+        holiday_policy=two_day,
+    )
+    assert [e.date for e in events] == [date(2025, 4, 11)]
+
+    # Two holidays in one week: earliest wins by default, cascade stacks shifts.
+    holidays = [date(2025, 4, 7), date(2025, 4, 9)]
+    for cascade, expected in ((False, date(2025, 4, 11)), (True, date(2025, 4, 12))):
+        events = generate_schedule(
+            start_date=date(2025, 4, 6),
+            days=7,
+            trash_weekday="Thursday",
+            recycling_color=None,
+            calendar_policy=calendar_policy,
+            holiday_policy=HolidayPolicy(shift_holidays=holidays, cascade_within_week=cascade),
+        )
+        assert [e.date for e in events] == [expected]
+
+
+def test_compiled_holiday_policy_per_date_shift() -> None:
+    policy = compile_holiday_policy(
+        HolidayPolicy(
+            no_collection_dates=[date(2025, 12, 25)],
+            shift_holidays=[date(2025, 12, 25), date(2026, 1, 1)],
+            shift_days_by_date={date(2026, 1, 1): 3},
+        )
+    )
+    assert policy.adjust(date(2025, 12, 25)) is None
+    assert policy.adjust(date(2025, 12, 26)) == date(2025, 12, 27)
+    assert policy.adjust(date(2025, 12, 31)) == date(2025, 12, 31)
+    # Three days from Friday stops at the holiday week's Saturday.
+    assert policy.adjust(date(2026, 1, 2)) == date(2026, 1, 3)
+
+
+def test_shifts_never_reach_the_next_weeks_pickup() -> None:
+    # Cascaded Monday and Wednesday holidays would move Friday pickups to Sunday.
+    events = generate_schedule(
+        start_date=date(2025, 4, 6),
+        days=14,
+        trash_weekday="Friday",
+        recycling_color=None,
+        calendar_policy=CalendarPolicy(recycling_mode="none"),
+        holiday_policy=HolidayPolicy(
+            shift_holidays=[date(2025, 4, 7), date(2025, 4, 9)], cascade_within_week=True
+        ),
+    )
+    assert [e.date for e in events] == [date(2025, 4, 12), date(2025, 4, 18)]
@@ -0,0 +1,82 @@
+from datetime import UTC, date, datetime
+from pathlib import Path
+
+import pytest
+
+from town_collection_cal.common.db_model import (
+    CalendarPolicy,
+    Database,
+    HolidayPolicy,
+    MetaInfo,
+)
+from town_collection_cal.service import app as app_mod
+from town_collection_cal.updater.parsers.westford_routes import parse_routes
+
+
+@pytest.fixture()
+def db_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    routes = parse_routes(Path("tests/fixtures/westford_routes.txt"), "fixture://routes").routes
+    db = Database(
+        meta=MetaInfo(generated_at=datetime.now(UTC), town_id="westford_ma", sources={}),
+        calendar_policy=CalendarPolicy(
+            recycling_mode="alternating_week",
+            anchor_week_sunday=date(2025, 4, 6),
+            anchor_color="BLUE",
+        ),
+        holiday_policy=HolidayPolicy(),
+        routes=routes,
+    )
+    db_path = tmp_path / "westford_ma.json"
+    db_path.write_text(db.model_dump_json(), encoding="utf-8")
+    monkeypatch.setenv("DB_PATH", str(db_path))
+    monkeypatch.setenv("TOWN_CONFIG_PATH", str(Path("towns/westford_ma/town.yaml").resolve()))
+    return db_path
+
+
+def test_readyz_after_warm_up(db_env: Path) -> None:
+    app = app_mod.create_app()
+    assert app.config["READY_EVENT"].wait(timeout=30)
+
+    response = app.test_client().get("/readyz")
+    assert response.status_code == 200
+    assert response.get_json()["feeds_rendered"] == 10
+
+
+def test_warm_up_renders_only_the_towns_colors(db_env: Path) -> None:
+    db_env.write_text(db_env.read_text(encoding="utf-8").replace("GREEN", "BLUE"), "utf-8")
+    app = app_mod.create_app()
+    assert app.config["READY_EVENT"].wait(timeout=30)
+
+    assert app.test_client().get("/readyz").get_json()["feeds_rendered"] == 5
+
+
+def test_readyz_not_ready_until_warm_up_finishes(
+    db_env: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(app_mod, "_warm_up", lambda app: None)
+    app = app_mod.create_app()
+
+    client = app.test_client()
+    assert client.get("/readyz").status_code == 503
+    assert client.get("/healthz").status_code == 200
+
+
+def test_failed_warm_up_is_retried_until_ready(
+    db_env: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls = []
+    warm_up_once = app_mod._warm_up_once
+
+    def flaky(app: object) -> int:
+        calls.append(app)
+        if len(calls) == 1:
+            raise FileNotFoundError("DB not there yet")
+        return warm_up_once(app)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(app_mod, "_warm_up_once", flaky)
+    monkeypatch.setattr(app_mod, "WARM_UP_RETRY_INITIAL_SECONDS", 0.01)
+    app = app_mod.create_app()
+    assert app.config["READY_EVENT"].wait(timeout=30)
+
+    status = app.test_client().get("/readyz").get_json()
+    assert status["attempts"] == 2 and "error" not in status
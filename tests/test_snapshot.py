@@ -0,0 +1,82 @@
+from datetime import UTC, date, datetime
+from pathlib import Path
+
+from town_collection_cal.common.db_file import load_db
+from town_collection_cal.common.db_model import (
+    CalendarPolicy,
+    Database,
+    HolidayPolicy,
+    MetaInfo,
+    RouteConstraint,
+    RouteEntry,
+)
+from town_collection_cal.common.snapshot import write_snapshot
+from town_collection_cal.service.db import DbLoader
+from town_collection_cal.service.resolver import resolve_route
+
+
+def _db() -> Database:
+    routes = [
+        RouteEntry(
+            street="Main St",
+            street_normalized="main street",
+            weekday="Wednesday",
+            recycling_color="GREEN",
+            constraints=[RouteConstraint(range_min=1, range_max=110)],
+        ),
+        RouteEntry(
+            street="Boston Road",
+            street_normalized="boston road",
+            weekday="Thursday",
+            recycling_color="BLUE",
+            constraints=[RouteConstraint(parity="odd")],
+            notes="odd side",
+        ),
+        RouteEntry(
+            street="Main St",
+            street_normalized="main street",
+            weekday="Wednesday",
+            recycling_color="BLUE",
+            constraints=[RouteConstraint(range_min=112, range_max=None)],
+        ),
+        RouteEntry(street="Private Way", street_normalized="private way", no_collection=True),
+    ]
+    return Database(
+        meta=MetaInfo(generated_at=datetime.now(UTC), town_id="test", sources={}),
+        calendar_policy=CalendarPolicy(
+            recycling_mode="alternating_week",
+            anchor_week_sunday=date(2025, 4, 6),
+            anchor_color="BLUE",
+        ),
+        holiday_policy=HolidayPolicy(shift_holidays=[date(2025, 7, 4)]),
+        aliases={"boston rd": "boston road"},
+        routes=routes,
+        street_index={"main street": [0, 2], "boston road": [1], "private way": [3]},
+    )
+
+
+def test_snapshot_round_trip(tmp_path: Path) -> None:
+    db = _db()
+    path = tmp_path / "test.snap"
+    write_snapshot(db, path)
+
+    mapped = load_db(path)
+    assert mapped.to_database().model_dump(exclude={"meta"}) == db.model_dump(exclude={"meta"})
+    assert mapped.meta.town_id == "test"
+    assert mapped.street_index["main street"] == [0, 2]
+    assert mapped.recycling_colors() == ("BLUE", "GREEN")
+    assert "unknown street" not in mapped.street_index
+
+
+def test_resolver_runs_against_snapshot(tmp_path: Path) -> None:
+    path = tmp_path / "test.snap"
+    write_snapshot(_db(), path)
+    mapped = DbLoader(path, reload_interval_seconds=10).get_db()
+
+    result = resolve_route(mapped, "Boston Rd", 3, suggestion_limit=10, fuzzy_threshold=80)
+    assert result.route is not None
+    assert result.route.weekday == "Thursday"
+
+    result = resolve_route(mapped, "Main St", 150, suggestion_limit=10, fuzzy_threshold=80)
+    assert result.route is not None
+    assert result.route.recycling_color == "BLUE"
@@ -0,0 +1,64 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from town_collection_cal.common.normalize import normalize_street_name
+from town_collection_cal.updater.build_db import build_db
+from town_collection_cal.updater.coverage import analyze_coverage
+from town_collection_cal.updater.parsers.westford_routes import parse_routes
+from town_collection_cal.updater.synth_town import SynthTown, route_entries, write_town
+
+
+def _files(root: Path) -> dict[str, bytes]:
+    return {
+        str(path.relative_to(root)): path.read_bytes()
+        for path in sorted(root.rglob("*"))
+        if path.is_file()
+    }
+
+
+@pytest.mark.parametrize("source_format", ["txt", "pdf"])
+def test_route_book_parses_back_to_the_generated_routes(
+    tmp_path: Path, source_format: str
+) -> None:
+    town = write_town(tmp_path, routes=150, seed=11, source_format=source_format)
+    parsed = parse_routes(town.routes_source, "synth://routes").routes
+
+    assert town.route_count == 150
+    assert parsed == route_entries(town.streets)
+
+
+def test_same_seed_writes_identical_towns(tmp_path: Path) -> None:
+    for name, seed in (("a", 3), ("b", 3), ("c", 4)):
+        write_town(tmp_path / name, routes=500, seed=seed, source_format="pdf")
+    assert _files(tmp_path / "a") == _files(tmp_path / "b")
+    assert _files(tmp_path / "a") != _files(tmp_path / "c")
+
+
+def _serve(stub_server: Any, town: SynthTown) -> None:
+    for source in (town.routes_source, town.schedule_source):
+        stub_server.add(f"/sources/{source.name}", source.read_bytes())
+
+
+def test_generated_town_builds_with_overrides_and_clean_coverage(
+    stub_server: Any, tmp_path: Path
+) -> None:
+    town = write_town(
+        tmp_path / "town", routes=2000, seed=5, base_url=stub_server.base_url, override_rate=0.02
+    )
+    _serve(stub_server, town)
+
+    db = build_db(town.town_yaml, tmp_path / "db.json", tmp_path / "cache").db
+
+    assert db is not None
+    assert len(db.routes) == town.expected_routes
+    assert town.overrides["delete"] and town.overrides["patch"] and town.overrides["add"]
+    assert db.aliases == {
+        normalize_street_name(alias): normalize_street_name(target)
+        for alias, target in town.aliases.items()
+    }
+    assert db.calendar_policy.anchor_week_sunday is not None
+    assert db.holiday_policy.shift_holidays and db.holiday_policy.no_collection_dates
+    report = analyze_coverage(db)
+    assert not (report.overlaps or report.gaps or report.unreachable)
@@ -0,0 +1,100 @@
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from town_collection_cal.common.db_file import write_db_file
+from town_collection_cal.common.db_model import (
+    CalendarPolicy,
+    Database,
+    HolidayPolicy,
+    MetaInfo,
+    RouteEntry,
+)
+from town_collection_cal.service.db import DbLoader
+from town_collection_cal.updater.build_db import build_db
+from town_collection_cal.updater.versions import (
+    current_version,
+    main,
+    publish_version,
+    read_history,
+    rollback,
+    versions_dir,
+)
+
+
+def _db(weekday: str) -> Database:
+    return Database(
+        meta=MetaInfo(generated_at=datetime.now(UTC), town_id="test", sources={}),
+        calendar_policy=CalendarPolicy(recycling_mode="none"),
+        holiday_policy=HolidayPolicy(),
+        routes=[RouteEntry(street="Main St", street_normalized="main street", weekday=weekday)],
+    )
+
+
+def _publish(out: Path, weekday: str, keep: int = 3) -> bool:
+    db = _db(weekday)
+    return publish_version(
+        out, lambda path: write_db_file(db, path), fingerprint=weekday, route_count=1, keep=keep
+    )
+
+
+def _weekday(loader: DbLoader) -> str | None:
+    return loader.get_db().candidates("main street")[0].weekday
+
+
+def test_pointer_swap_rollback_and_retention(tmp_path: Path) -> None:
+    out = tmp_path / "db.json.gz"
+    assert _publish(out, "Monday")
+    assert out.is_symlink()
+    loader = DbLoader(out, reload_interval_seconds=0)
+    assert _weekday(loader) == "Monday"
+
+    assert _publish(out, "Tuesday")
+    assert _weekday(loader) == "Tuesday"
+    assert loader.status()["loaded_file"] == current_version(out)
+
+    # Rollback is a pointer swap and pins it: new builds are stored, not published.
+    assert rollback(out).fingerprint == "Monday"
+    assert _weekday(loader) == "Monday"
+    assert not _publish(out, "Wednesday")
+    assert _weekday(loader) == "Monday"
+    history = read_history(out)
+    assert history.pinned
+    assert [v.fingerprint for v in history.versions] == ["Wednesday", "Tuesday", "Monday"]
+
+    assert main(["--db", str(out), "--latest"]) == 0
+    assert _weekday(loader) == "Wednesday"
+    assert not read_history(out).pinned
+
+    assert _publish(out, "Thursday")
+    assert _publish(out, "Friday")
+    history = read_history(out)
+    assert [v.fingerprint for v in history.versions] == ["Friday", "Thursday", "Wednesday"]
+    stored = sorted(p.name for p in versions_dir(out).glob("db.*.json.gz"))
+    assert stored == sorted(v.file for v in history.versions)
+
+
+def test_build_db_adopts_plain_db_and_rolls_back(tmp_path: Path, town_factory: Any) -> None:
+    town_yaml = town_factory("test_town")
+    out = tmp_path / "db.json"
+    cache = tmp_path / "cache"
+    first = build_db(town_yaml, out, cache)
+    assert not out.is_symlink()
+
+    (town_yaml.parent / "route_overrides.yaml").write_text(
+        'add:\n  - street: "New Street"\n    weekday: "Monday"\n', encoding="utf-8"
+    )
+    second = build_db(town_yaml, out, cache, keep_versions=5)
+    assert second.published
+    assert out.is_symlink()
+    history = read_history(out)
+    assert [v.fingerprint for v in history.versions] == [second.fingerprint, first.fingerprint]
+
+    assert main(["--db", str(out), "--to", history.versions[1].sha256[:12]]) == 0
+    assert current_version(out) == history.versions[1].file
+    # Pinned: rebuilding the newer inputs neither republishes nor re-stores them.
+    third = build_db(town_yaml, out, cache, keep_versions=5)
+    assert not third.published
+    assert current_version(out) == history.versions[1].file
+    assert len(read_history(out).versions) == 2
+    assert build_db(town_yaml, out, cache, keep_versions=5).skipped